@@ -0,0 +1,111 @@
+"""
+Compares the rows per second of the fetch pipeline of the data grids before
+and after the output type handler and row factory of oracle.py, on a
+synthetic result of 100 columns mixing numbers, dates and strings
+
+Usage:
+    python benchmarks/fetch_benchmark.py <username> <password> <dsn> [--rows N] [--columns N] [--compact]
+"""
+import argparse
+import os
+import sys
+import time
+import cx_Oracle
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from oracle import output_type_handler, get_record_factory, build_records, get_cursor_types, get_chunk_size
+from oracle import ClientSession, _thread_state
+
+
+def build_query(columns):
+    """Returns a query generating rows of the given number of columns
+
+        Args:
+            columns (int): Number of columns of the result
+    """
+    expressions = []
+    for i in range(0, columns):
+        if i % 3 == 0:
+            expressions.append('level * %d + 0.25 AS c%d' % (i, i))
+        elif i % 3 == 1:
+            expressions.append('SYSDATE - level AS c%d' % i)
+        else:
+            expressions.append("'value ' || level AS c%d" % i)
+    return 'SELECT %s FROM dual CONNECT BY level <= :row_count' % ', '.join(expressions)
+
+
+def fetch_before(connection, query, rows):
+    """Fetches the result the way the handlers did before: str() on every cell
+
+        Args:
+            connection (Connection): Connection to the database
+            query (string): The query to fetch
+            rows (int): Number of rows of the result
+    """
+    cursor = connection.cursor()
+    cursor.arraysize = 500
+    cursor.execute(query, row_count=rows)
+    column_headers = [col[0] for col in cursor.description]
+    result_array = []
+    for result in cursor:
+        row = {}
+        for i in range(0, column_headers.__len__()):
+            row[column_headers[i]] = str(result[i])
+        result_array.append(row)
+    return result_array.__len__()
+
+
+def fetch_after(connection, query, rows):
+    """Fetches the result the way stream_cursor() does, without emitting it: the
+        output type handler, the row factory of get_record_factory() and the
+        records numbered by build_records(), one chunk at a time
+
+        Args:
+            connection (Connection): Connection to the database
+            query (string): The query to fetch
+            rows (int): Number of rows of the result
+    """
+    cursor = connection.cursor()
+    cursor.arraysize = get_chunk_size()
+    cursor.outputtypehandler = output_type_handler
+    cursor.execute(query, row_count=rows)
+    column_headers = [col[0] for col in cursor.description]
+    types = get_cursor_types(cursor)
+    cursor.rowfactory = get_record_factory(column_headers)
+    row_count = 0
+    while True:
+        result = cursor.fetchmany(cursor.arraysize)
+        if result.__len__() == 0:
+            break
+        build_records(result, column_headers, row_count + 1, types)
+        row_count += result.__len__()
+    return row_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the fetch pipeline of the data grids')
+    parser.add_argument('username')
+    parser.add_argument('password')
+    parser.add_argument('dsn')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--columns', type=int, default=100)
+    parser.add_argument('--compact', action='store_true', help='Builds the records in the compact payload format')
+    args = parser.parse_args()
+
+    client = ClientSession('benchmark')
+    client.payload_format = 'compact' if args.compact else None
+    _thread_state.client = client
+
+    connection = cx_Oracle.connect(args.username, args.password, args.dsn)
+    query = build_query(args.columns)
+    for label, fetch in (('before (str per cell)', fetch_before),
+                         ('after (stream_cursor pipeline)', fetch_after)):
+        start = time.time()
+        count = fetch(connection, query, args.rows)
+        elapsed = time.time() - start
+        print('%-36s %8d rows in %6.2fs: %10.0f rows/sec' % (label, count, elapsed, count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Measures the latency of the object finder of oracle.py on synthetic schema
+object names, without a database: the time to index them, to apply an
+incremental update of the schema cache and to answer prefix, substring and
+fuzzy searches. Exits with status 1 when the slowest search percentile is
+over the target
+
+Usage:
+    python benchmarks/trigram_benchmark.py [--names N] [--words N] [--searches N] [--target-ms MS]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from oracle import TrigramIndex
+
+WORDS = ('CUSTOMER', 'ORDER', 'ITEM', 'INVOICE', 'PAYMENT', 'ACCOUNT', 'LEDGER', 'EMPLOYEE', 'DEPARTMENT',
+         'PRODUCT', 'STOCK', 'SHIPMENT', 'ADDRESS', 'CONTRACT', 'AUDIT', 'HISTORY', 'STAGING', 'ARCHIVE',
+         'SUMMARY', 'DETAIL', 'LOG', 'TMP', 'REF', 'MAP')
+SYLLABLES = ('BA', 'CO', 'DE', 'FI', 'GU', 'HA', 'JO', 'KE', 'LI', 'MO', 'NU', 'PA', 'QUI', 'RE', 'SO', 'TA',
+             'VE', 'WI', 'XO', 'ZU', 'BRI', 'CLA', 'DRO', 'FLE', 'GRA', 'PLO', 'STE', 'TRU')
+CATEGORIES = ('tables', 'views', 'indexes', 'procedures', 'packages', 'synonyms')
+
+
+def build_words(count, seed=0):
+    """Returns the vocabulary of the names: the common words of WORDS followed
+        by made-up words of two or three syllables, up to count words
+
+        Args:
+            count (int): Number of words
+            seed (int, optional): Seed of the random generator
+    """
+    generator = random.Random(seed)
+    words = list(WORDS[0:count])
+    known = set(words)
+    while words.__len__() < count:
+        word = ''.join(generator.choice(SYLLABLES) for i in range(0, generator.choice((2, 3))))
+        if word not in known:
+            known.add(word)
+            words.append(word)
+    return words
+
+
+def build_names(count, words, seed=0):
+    """Returns count distinct names made of two or three words and a number,
+        like the names of a large application schema, spread over categories
+
+        Args:
+            count (int): Number of names
+            words (list): Vocabulary of the names
+            seed (int, optional): Seed of the random generator
+    """
+    generator = random.Random(seed)
+    names = {}
+    while names.__len__() < count:
+        parts = generator.sample(words, generator.choice((2, 3)))
+        name = '_'.join(parts) + '_%d' % generator.randint(1, 9999)
+        names[name] = generator.choice(CATEGORIES)
+    by_category = {}
+    for name, category in names.items():
+        by_category.setdefault(category, []).append(name)
+    return by_category
+
+
+def get_percentile(timings, percentile):
+    """Returns a percentile of a list of timings
+
+        Args:
+            timings (list): The timings, in milliseconds
+            percentile (int): The percentile, from 0 to 100
+    """
+    ordered = sorted(timings)
+    return ordered[min(ordered.__len__() - 1, int(ordered.__len__() * percentile / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the object finder')
+    parser.add_argument('--names', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=2000, help='Size of the vocabulary of the names')
+    parser.add_argument('--searches', type=int, default=500)
+    parser.add_argument('--target-ms', type=float, default=10.0)
+    args = parser.parse_args()
+
+    by_category = build_names(args.names, build_words(args.words))
+    index = TrigramIndex()
+    start = time.time()
+    for category, names in by_category.items():
+        index.update_category(category, names)
+    print('indexed %d names in %.2fs, %d trigrams' % (args.names, time.time() - start, index.get_stats()['trigrams']))
+
+    tables = by_category['tables']
+    changed = tables[10:] + ['NEW_TABLE_%d' % i for i in range(0, 10)]
+    start = time.time()
+    index.update_category('tables', changed)
+    print('incremental update of 20 tables among %d in %.2f ms' % (tables.__len__(), (time.time() - start) * 1000))
+
+    generator = random.Random(1)
+    all_names = [name for names in by_category.values() for name in names]
+    texts = {'prefix': [name[0:generator.randint(2, 8)] for name in generator.sample(all_names, args.searches)],
+             'substring': [name[3:10] for name in generator.sample(all_names, args.searches)],
+             'fuzzy': [name[0:4] + name[5:12] for name in generator.sample(all_names, args.searches)]}
+    slowest = 0.0
+    for label, searches in texts.items():
+        timings = []
+        for text in searches:
+            start = time.time()
+            index.search(text)
+            timings.append((time.time() - start) * 1000)
+        p95 = get_percentile(timings, 95)
+        slowest = max(slowest, p95)
+        print('%-10s p50 %6.2f ms  p95 %6.2f ms  max %6.2f ms' % (label, get_percentile(timings, 50), p95,
+                                                                 max(timings)))
+    if slowest > args.target_ms:
+        print('p95 over the target of %.1f ms' % args.target_ms)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
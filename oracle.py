@@ -8,36 +8,3292 @@ Date: 11/04/2020
 """
 import logging
 import json
-from flask_socketio import emit, Namespace
+import os
+import hashlib
+import heapq
+import bisect
+import collections
+import functools
+import inspect
+import difflib
+from concurrent.futures import ThreadPoolExecutor
+from flask_socketio import emit as socketio_emit, Namespace
 import cx_Oracle
 import random
+import re
+import sys
+import threading
+import time
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
 
 
+_thread_state = threading.local()
+
+
+def emit(event, *args, **kwargs):
+    """Emits an event to the client whose event is handled by the current
+        thread, like flask_socketio.emit(), converting lists of rows to the
+        compact payload format when the client asked for it
+
+        Args:
+            event (string): Name of the event to emit
+    """
+    recorded_emits = getattr(_thread_state, 'recorded_emits', None)
+    if recorded_emits is not None:
+        recorded_emits.append((event, args, kwargs))
+    record = getattr(_thread_state, 'metrics', None)
+    if record is None:
+        if args and wants_compact_payload():
+            args = (compact_payload(args[0]),) + args[1:]
+        return socketio_emit(event, *args, **kwargs)
+    if event.endswith('_error') or event == 'failed':
+        record['errors'] += 1
+    start_time = time.time()
+    serialize_time = record['serialize']
+    if args and wants_compact_payload():
+        args = (compact_payload(args[0]),) + args[1:]
+    try:
+        return socketio_emit(event, *args, **kwargs)
+    finally:
+        record['emit'] += time.time() - start_time - (record['serialize'] - serialize_time)
+
+
+def wants_compact_payload():
+    """Returns True if the client whose event is handled by the current thread
+        asked for the compact payload format when connecting
+    """
+    client = getattr(_thread_state, 'client', None)
+    return client is not None and client.payload_format == 'compact'
+
+
+def compact_payload(payload):
+    """Converts a list of rows sharing the same keys to the compact payload
+        format: the field names and their types sent once, followed by the
+        rows as arrays of values. Lists are also converted when found under
+        the 'records' key of a dict. Any other payload is returned unchanged
+
+        Args:
+            payload (object): The payload of an event
+    """
+    if isinstance(payload, dict) and isinstance(payload.get('records'), list) and 'fields' not in payload:
+        payload = dict(payload)
+        payload['records'] = compact_payload(payload['records'])
+        return payload
+    if not isinstance(payload, list) or payload.__len__() == 0:
+        return payload
+    fields = []
+    for row in payload:
+        if not isinstance(row, dict):
+            return payload
+        for key in row:
+            if key not in fields:
+                fields.append(key)
+    types = []
+    for field in fields:
+        value = next((row.get(field) for row in payload if row.get(field) is not None), None)
+        types.append(get_payload_type(value))
+    return {'compact': True,
+            'fields': fields,
+            'types': types,
+            'rows': [[row.get(field) for field in fields] for row in payload]}
+
+
+def get_payload_type(value):
+    """Returns the name of the type of a value of the compact payload format
+
+        Args:
+            value (object): A value of a row
+    """
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, (list, dict)):
+        return 'object'
+    return 'null' if value is None else 'string'
+
+
+def get_cursor_types(cursor, start=0):
+    """Returns the names of the database types of the columns of an executed
+        cursor, for the 'types' of the compact payload format
+
+        Args:
+            cursor (Cursor): An executed cursor
+            start (int, optional): Index of the first column to describe
+    """
+    types = []
+    for col in cursor.description[start:]:
+        type_name = getattr(col[1], 'name', None) or getattr(col[1], '__name__', str(col[1]))
+        types.append(type_name.replace('DB_TYPE_', ''))
+    return types
+
+
+def output_type_handler(cursor, name, default_type, size, precision, scale):
+    """Output type handler converting the values of the grids on the driver
+        side: NUMBER to strings keeping their full precision, dates and
+        timestamps to ISO 8601 strings, LOBs to their whole content and binary
+        values to hex strings. NULL stays None and is sent as JSON null
+
+        Args:
+            cursor (Cursor): The cursor the column is fetched with
+            name (string): Name of the column
+            default_type (DbType): Type the column would be fetched as
+            size (int): Size of the column
+            precision (int): Precision of a NUMBER column
+            scale (int): Scale of a NUMBER column
+    """
+    if default_type == cx_Oracle.NUMBER:
+        return cursor.var(str, 128, arraysize=cursor.arraysize)
+    if default_type in (cx_Oracle.DATETIME, cx_Oracle.TIMESTAMP):
+        return cursor.var(default_type, arraysize=cursor.arraysize, outconverter=lambda value: value.isoformat())
+    if default_type in (cx_Oracle.CLOB, cx_Oracle.NCLOB):
+        return cursor.var(cx_Oracle.LONG_STRING, arraysize=cursor.arraysize)
+    if default_type == cx_Oracle.BLOB:
+        return cursor.var(cx_Oracle.LONG_BINARY, arraysize=cursor.arraysize, outconverter=lambda value: value.hex())
+    if default_type == cx_Oracle.BINARY:
+        return cursor.var(default_type, size, arraysize=cursor.arraysize, outconverter=lambda value: value.hex())
+    if default_type == cx_Oracle.INTERVAL:
+        return cursor.var(default_type, arraysize=cursor.arraysize, outconverter=str)
+    return None
+
+
+def get_record_factory(column_headers, start=0):
+    """Returns a row factory building the records sent to the grids straight
+        from the fetched tuples: a dict per row or, when the client asked for
+        the compact payload format, a list of values
+
+        Args:
+            column_headers (list): Names of the columns of the records
+            start (int, optional): Index of the first column of the records in a row
+    """
+    end = start + column_headers.__len__()
+    if wants_compact_payload():
+        return lambda *row: list(row[start:end])
+    return lambda *row: dict(zip(column_headers, row[start:end]))
+
+
+def build_records(records, column_headers, first_recid=None, types=None):
+    """Numbers the records built by get_record_factory() and, when the client
+        asked for it, wraps them in the compact payload format
+
+        Args:
+            records (list): Records built by get_record_factory()
+            column_headers (list): Names of the columns of the records
+            first_recid (int, optional): 'recid' of the first record, no 'recid'
+                is added when omitted
+            types (list, optional): Database types of the columns
+    """
+    if not wants_compact_payload():
+        if first_recid is not None:
+            for n in range(0, records.__len__()):
+                records[n]['recid'] = first_recid + n
+        return records
+    fields = list(column_headers)
+    field_types = list(types) if types is not None else ['string'] * fields.__len__()
+    if first_recid is not None:
+        fields.insert(0, 'recid')
+        field_types.insert(0, 'number')
+        for n in range(0, records.__len__()):
+            records[n].insert(0, first_recid + n)
+    return {'compact': True,
+            'fields': fields,
+            'types': field_types,
+            'rows': records}
+
+
+def get_memory_size(value):
+    """Returns an estimate in bytes of the memory used by a structure made of
+        dicts, lists, tuples and scalar values
+
+        Args:
+            value (object): The structure to measure
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += get_memory_size(key) + get_memory_size(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += get_memory_size(item)
+    return size
+
+
+def quote_identifier(name):
+    """Returns the name as a double quoted Oracle identifier so that it can
+        be placed in a query where a bind variable is not allowed, like the
+        table name of a FROM clause
+
+        Args:
+            name (string): Name of the database object or column
+    """
+    return '"%s"' % name.replace('"', '""')
+
+
+DATA_PAGE_SIZE = 100
+MAX_DATA_PAGE_SIZE = 5000
+STREAM_CHUNK_SIZE = 500
+DDL_CHUNK_SIZE = 32767
+KEYSET_DATA_TYPES = ('NUMBER', 'VARCHAR2', 'CHAR', 'NVARCHAR2', 'NCHAR')
+CHARACTER_DATA_TYPES = ('VARCHAR2', 'CHAR', 'NVARCHAR2', 'NCHAR')
+ORDERABLE_DATA_TYPES = ('NUMBER', 'FLOAT', 'BINARY_FLOAT', 'BINARY_DOUBLE', 'VARCHAR2', 'CHAR', 'NVARCHAR2',
+                        'NCHAR', 'DATE', 'TIMESTAMP', 'INTERVAL', 'RAW')
+SCHEMA_TREE_CATEGORIES = ('tables', 'views', 'indexes', 'mviews', 'procedures', 'functions', 'packages',
+                          'sequences', 'synonyms', 'public_synonyms', 'triggers', 'types', 'queues',
+                          'dblinks', 'public_dblinks', 'directories')
+SCHEMA_OBJECT_QUERIES = {'tables': "SELECT table_name FROM sys.user_tables ORDER BY table_name",
+                         'views': "SELECT view_name FROM sys.user_views ORDER BY view_name",
+                         'indexes': "SELECT index_name FROM sys.user_indexes ORDER BY index_name",
+                         'mviews': "SELECT mview_name FROM sys.user_mviews ORDER BY mview_name",
+                         'procedures': "SELECT object_name FROM SYS.user_objects WHERE object_type='PROCEDURE' "
+                                       "ORDER BY object_name",
+                         'functions': "SELECT object_name FROM SYS.user_objects WHERE object_type='FUNCTION' "
+                                      "ORDER BY object_name",
+                         'packages': "SELECT object_name FROM SYS.user_objects WHERE object_type='PACKAGE' "
+                                     "ORDER BY object_name",
+                         'sequences': "SELECT sequence_name FROM sys.user_sequences ORDER BY sequence_name",
+                         'synonyms': "SELECT synonym_name FROM sys.user_synonyms ORDER BY synonym_name",
+                         'public_synonyms': "SELECT synonym_name FROM sys.all_synonyms WHERE owner='PUBLIC' "
+                                            "ORDER BY synonym_name",
+                         'triggers': "SELECT trigger_name FROM sys.user_triggers ORDER BY trigger_name",
+                         'types': "SELECT type_name FROM sys.user_types ORDER BY type_name",
+                         'queues': "SELECT name FROM sys.user_queues ORDER BY name",
+                         'dblinks': "SELECT db_link FROM sys.user_db_links ORDER BY db_link",
+                         'public_dblinks': "SELECT db_link FROM sys.all_db_links WHERE owner='PUBLIC' "
+                                           "ORDER BY db_link",
+                         'directories': "SELECT directory_name FROM sys.all_directories ORDER BY directory_name"}
+TABLE_BUNDLE_SECTIONS = ('columns', 'constraints', 'grants', 'statistics', 'triggers', 'dependencies',
+                         'indexes', 'sql')
+
+
+def get_sort_expression(column, data_type, nls_sort):
+    """Returns the expression to order and compare a column on so that ORDER BY
+        and the comparison operators agree on the order of its values. Under a
+        linguistic NLS_SORT, ORDER BY sorts character values linguistically while
+        > compares them as NLS_COMP says, so character columns are then sorted on
+        their binary NLSSORT key instead. The key is fetched as a hex string,
+        which Oracle converts back to RAW when it is bound for a comparison
+
+        Args:
+            column (string): Quoted name of the column
+            data_type (string): Data type of the column
+            nls_sort (string): NLS_SORT of the session
+    """
+    if data_type in CHARACTER_DATA_TYPES and nls_sort != 'BINARY':
+        return "NLSSORT(%s, 'NLS_SORT=BINARY')" % column
+    return column
+
+
+def get_key_columns(db_conn, table_name):
+    """Returns the columns a table can be paged on: its primary key when all
+        of the key columns have a type which survives the round trip through
+        the browser, otherwise the ROWID pseudo column. Character key columns
+        are returned as their binary sort key, see get_sort_expression()
+
+        Args:
+            db_conn (Connection): Session used to read the data dictionary
+            table_name (string): Name of the table
+    """
+    cursor = db_conn.cursor()
+    query = """
+            SELECT
+                c.column_name,
+                t.data_type,
+                SYS_CONTEXT('USERENV', 'NLS_SORT')
+            FROM SYS.user_constraints p
+            JOIN SYS.user_cons_columns c
+                ON c.constraint_name = p.constraint_name
+            JOIN SYS.user_tab_columns t
+                ON t.table_name = c.table_name
+                AND t.column_name = c.column_name
+            WHERE
+                p.table_name = :table_name
+                AND p.constraint_type = 'P'
+            ORDER BY
+                c.position
+            """
+    cursor.execute(query, table_name=table_name)
+    key_columns = []
+    for result in cursor:
+        if result[1] not in KEYSET_DATA_TYPES:
+            return ['ROWID']
+        key_columns.append(get_sort_expression(quote_identifier(result[0]), result[1], result[2]))
+    if key_columns.__len__() == 0:
+        return ['ROWID']
+    return key_columns
+
+
+def fetch_data_page(db_conn, object_name, column_headers, key_columns=None, options=None, capabilities=None,
+                    order_columns=None):
+    """Reads one page of rows of a table, view or materialized view and
+        returns it together with the token to be sent back for the next page.
+
+        Pages are read with a keyset predicate on key_columns when given, so
+        every page costs the same whatever its position in the table.
+        Without key columns rows are sorted on order_columns, numbered with
+        ROWNUM and skipped up to the requested offset. Without either, rows
+        have no stable order between two queries, so only the first page is
+        read and no token is returned
+
+        Args:
+            db_conn (Connection): Session used to read the rows
+            object_name (string): Name of the table, view or materialized view
+            column_headers (list): Names of the columns to be read
+            key_columns (list, optional): Quoted columns to page on, in order
+            options (dict, optional): 'limit' as the number of rows in the page
+                and 'token' as returned with the previous page
+            capabilities (ServerCapabilities, optional): Capabilities of the server,
+                FETCH FIRST replaces the ROWNUM wrapper of keyset pages when supported
+            order_columns (list, optional): Quoted columns sorting the rows the same
+                way in every query when paging without key columns
+    """
+    if options is None:
+        options = {}
+    limit = options.get('limit') or DATA_PAGE_SIZE
+    limit = max(1, min(int(limit), MAX_DATA_PAGE_SIZE))
+    token = options.get('token') or {}
+    offset = int(token.get('offset', 0))
+    column_list = ', '.join([quote_identifier(header) for header in column_headers])
+    binds = {'row_limit': limit + 1}
+    if key_columns:
+        key_list = ', '.join(key_columns)
+        key_select = ', '.join(['%s AS key_%d' % (key_columns[i], i) for i in range(0, key_columns.__len__())])
+        last_key = token.get('key')
+        predicate = ''
+        if last_key is not None:
+            terms = []
+            for i in range(0, key_columns.__len__()):
+                term = ['%s = :key_%d' % (key_columns[j], j) for j in range(0, i)]
+                term.append('%s > :key_%d' % (key_columns[i], i))
+                terms.append('(' + ' AND '.join(term) + ')')
+                binds['key_%d' % i] = last_key[i]
+            predicate = 'WHERE ' + ' OR '.join(terms)
+        if capabilities is not None and capabilities.supports('fetchFirst'):
+            query = """
+                    SELECT %s, %s
+                    FROM %s
+                    %s
+                    ORDER BY %s
+                    FETCH FIRST :row_limit ROWS ONLY
+                    """ % (key_select, column_list, quote_identifier(object_name), predicate, key_list)
+        else:
+            query = """
+                    SELECT *
+                    FROM (
+                        SELECT %s, %s
+                        FROM %s
+                        %s
+                        ORDER BY %s
+                    )
+                    WHERE ROWNUM <= :row_limit
+                    """ % (key_select, column_list, quote_identifier(object_name), predicate, key_list)
+        key_count = key_columns.__len__()
+    elif order_columns:
+        query = """
+                SELECT *
+                FROM (
+                    SELECT ROWNUM AS row_number, q.*
+                    FROM (
+                        SELECT %s
+                        FROM %s
+                        ORDER BY %s
+                    ) q
+                    WHERE ROWNUM <= :row_limit + :row_offset
+                )
+                WHERE row_number > :row_offset
+                """ % (column_list, quote_identifier(object_name), ', '.join(order_columns))
+        binds['row_offset'] = offset
+        key_count = 1
+    else:
+        query = """
+                SELECT ROWNUM AS row_number, %s
+                FROM %s
+                WHERE ROWNUM <= :row_limit
+                """ % (column_list, quote_identifier(object_name))
+        offset = 0
+        key_count = 1
+    cursor = db_conn.cursor()
+    cursor.arraysize = limit + 1
+    cursor.outputtypehandler = output_type_handler
+    cursor.execute(query, binds)
+    rows = cursor.fetchmany(limit + 1)
+    next_token = None
+    if rows.__len__() > limit:
+        rows = rows[0:limit]
+        if key_columns or order_columns:
+            next_token = {'offset': offset + limit}
+        if key_columns:
+            next_token['key'] = list(rows[-1][0:key_count])
+    record_factory = get_record_factory(column_headers, key_count)
+    result_array = build_records([record_factory(*row) for row in rows], column_headers, offset + 1,
+                                 get_cursor_types(cursor, key_count))
+    return {'records': result_array,
+            'offset': offset,
+            'nextToken': next_token}
+
+
+def get_chunk_size(chunk_size=None):
+    """Returns the number of rows in a streamed chunk, to be set as the arraysize
+        of the cursor before it is executed
+
+        Args:
+            chunk_size (int, optional): Number of rows asked for by the client
+    """
+    return max(1, min(int(chunk_size or STREAM_CHUNK_SIZE), MAX_DATA_PAGE_SIZE))
+
+
+def stream_cursor(socket_io, cursor, event, namespace, column_headers=None, chunk_size=None, timings=None):
+    """Emits the rows of an executed cursor as '<event>_chunk' events of at
+        most chunk_size rows each, as soon as they are fetched, followed by
+        an '<event>_done' event with the row count and the elapsed time.
+        Only one chunk is held in memory at a time
+
+        Args:
+            socket_io (SocketIO): Used to yield between two chunks so that each
+                of them is flushed to the client
+            cursor (Cursor): An executed cursor
+            event (string): Prefix of the emitted events
+            namespace (string): Namespace to emit the events to
+            column_headers (list, optional): Names of the columns, defaults to the
+                cursor description
+            chunk_size (int, optional): Number of rows in a chunk
+            timings (dict, optional): Receives the milliseconds spent fetching,
+                converting and emitting the rows, see get_timings()
+    """
+    start_time = time.time()
+    if column_headers is None:
+        column_headers = [col[0] for col in cursor.description]
+    chunk_size = get_chunk_size(chunk_size)
+    types = get_cursor_types(cursor)
+    cursor.rowfactory = get_record_factory(column_headers)
+    if timings is None:
+        timings = get_timings()
+    row_count = 0
+    while True:
+        step_time = time.time()
+        rows = cursor.fetchmany(chunk_size)
+        timings['fetchTime'] += (time.time() - step_time) * 1000
+        if rows.__len__() == 0:
+            break
+        step_time = time.time()
+        result_array = build_records(rows, column_headers, row_count + 1, types)
+        timings['convertTime'] += (time.time() - step_time) * 1000
+        step_time = time.time()
+        emit(event + '_chunk', {'columns': column_headers,
+                                'records': result_array,
+                                'offset': row_count}, namespace=namespace)
+        timings['emitTime'] += (time.time() - step_time) * 1000
+        row_count += rows.__len__()
+        socket_io.sleep(0)
+    timings['rows'] = row_count
+    emit(event + '_done', {'rowCount': row_count,
+                           'elapsedTime': int((time.time() - start_time) * 1000)}, namespace=namespace)
+
+
+def get_timings():
+    """Returns the counters of the milliseconds a handler spends executing a
+        statement, fetching its rows, converting them and emitting them
+    """
+    return {'executeTime': 0.0, 'fetchTime': 0.0, 'convertTime': 0.0, 'emitTime': 0.0, 'rows': 0}
+
+
+def stream_data(socket_io, db_conn, object_name, column_headers, namespace, options):
+    """Streams every row of a table, view or materialized view as 'data_chunk'
+        events followed by a 'data_done' event, see stream_cursor()
+
+        Args:
+            socket_io (SocketIO): An instance of the SocketIO class
+            db_conn (Connection): Session used to read the rows
+            object_name (string): Name of the table, view or materialized view
+            column_headers (list): Names of the columns to be read
+            namespace (string): Namespace to emit the events to
+            options (dict): 'chunkSize' as the number of rows in a chunk
+    """
+    query = """
+            SELECT %s
+            FROM %s
+            """ % (', '.join([quote_identifier(header) for header in column_headers]),
+                   quote_identifier(object_name))
+    cursor = db_conn.cursor()
+    cursor.arraysize = get_chunk_size(options.get('chunkSize'))
+    cursor.outputtypehandler = output_type_handler
+    cursor.execute(query)
+    stream_cursor(socket_io, cursor, 'data', namespace, column_headers, options.get('chunkSize'))
+
+
+class HandlerMetrics(object):
+    """Latency histograms and counters of the websocket event handlers, per
+        namespace and event, rendered in the Prometheus text format.
+
+        The time of a handler is split into the phases measured while it runs
+        on its thread: statements executed and rows fetched through a
+        MeteredCursor, payloads serialized through MeteredJSON and events
+        emitted. Recording an event takes one lock and a few dict updates
+    """
+
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    PHASES = ('execute', 'fetch', 'serialize', 'emit')
+
+    COUNTERS = (('events', 'oracle_handler_events_total', 'Number of events handled'),
+                ('errors', 'oracle_handler_errors_total', 'Number of events that raised or emitted an error'),
+                ('rows', 'oracle_handler_rows_fetched_total', 'Number of rows fetched from the database'),
+                ('bytes', 'oracle_handler_payload_bytes_total', 'Number of bytes of the payloads emitted'))
+
+    _histograms = None
+    _counters = None
+    _lock = None
+
+    def __init__(self):
+        """Default constructor for HandlerMetrics class
+        """
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def begin(self, namespace, event):
+        """Starts measuring an event handled by the current thread and returns
+            the record to give to end()
+
+            Args:
+                namespace (string): Namespace the event was raised in
+                event (string): Name of the event
+        """
+        record = {'namespace': namespace,
+                  'event': event,
+                  'start': time.time(),
+                  'parent': getattr(_thread_state, 'metrics', None),
+                  'execute': 0.0,
+                  'fetch': 0.0,
+                  'serialize': 0.0,
+                  'emit': 0.0,
+                  'rows': 0,
+                  'bytes': 0,
+                  'errors': 0}
+        _thread_state.metrics = record
+        return record
+
+    def end(self, record):
+        """Stops measuring an event and adds its measures to the histograms and
+            counters of its namespace and event
+
+            Args:
+                record (dict): As returned by begin()
+        """
+        _thread_state.metrics = record['parent']
+        durations = [('total', time.time() - record['start'])] + [(phase, record[phase]) for phase in self.PHASES]
+        labels = (record['namespace'], record['event'])
+        with self._lock:
+            for phase, duration in durations:
+                histogram = self._histograms.get(labels + (phase,))
+                if histogram is None:
+                    histogram = [[0] * (self.BUCKETS.__len__() + 1), 0.0, 0]
+                    self._histograms[labels + (phase,)] = histogram
+                histogram[0][bisect.bisect_left(self.BUCKETS, duration)] += 1
+                histogram[1] += duration
+                histogram[2] += 1
+            counters = self._counters.get(labels)
+            if counters is None:
+                counters = {'events': 0, 'errors': 0, 'rows': 0, 'bytes': 0}
+                self._counters[labels] = counters
+            counters['events'] += 1
+            counters['errors'] += 1 if record['errors'] > 0 else 0
+            counters['rows'] += record['rows']
+            counters['bytes'] += record['bytes']
+
+    @classmethod
+    def get_labels(cls, labels):
+        """Returns the labels of a sample in the Prometheus text format
+
+            Args:
+                labels (list): Name and value of each label
+        """
+        return ','.join(['%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                         for name, value in labels])
+
+    def render(self):
+        """Returns the histograms and counters in the Prometheus text format
+        """
+        with self._lock:
+            histograms = sorted((key, (list(value[0]), value[1], value[2])) for key, value in self._histograms.items())
+            counters = sorted((key, dict(value)) for key, value in self._counters.items())
+        lines = ['# HELP oracle_handler_duration_seconds Time spent handling an event, in total and per phase',
+                 '# TYPE oracle_handler_duration_seconds histogram']
+        for (namespace, event, phase), (buckets, total, count) in histograms:
+            labels = [('namespace', namespace), ('event', event), ('phase', phase)]
+            cumulative = 0
+            for i in range(0, self.BUCKETS.__len__()):
+                cumulative += buckets[i]
+                lines.append('oracle_handler_duration_seconds_bucket{%s} %d'
+                             % (self.get_labels(labels + [('le', repr(self.BUCKETS[i]))]), cumulative))
+            lines.append('oracle_handler_duration_seconds_bucket{%s} %d'
+                         % (self.get_labels(labels + [('le', '+Inf')]), count))
+            lines.append('oracle_handler_duration_seconds_sum{%s} %r' % (self.get_labels(labels), total))
+            lines.append('oracle_handler_duration_seconds_count{%s} %d' % (self.get_labels(labels), count))
+        for key, name, description in self.COUNTERS:
+            lines.append('# HELP %s %s' % (name, description))
+            lines.append('# TYPE %s counter' % name)
+            for (namespace, event), values in counters:
+                lines.append('%s{%s} %d' % (name, self.get_labels([('namespace', namespace), ('event', event)]),
+                                            values[key]))
+        return '\n'.join(lines) + '\n'
+
+
+HANDLER_METRICS = HandlerMetrics()
+
+
+def record_metric(phase, duration, rows=0, size=0):
+    """Adds a measure to the event handled by the current thread, if any
+
+        Args:
+            phase (string): One of HandlerMetrics.PHASES
+            duration (float): Seconds spent in the phase
+            rows (int, optional): Rows fetched
+            size (int, optional): Bytes of payload serialized
+    """
+    record = getattr(_thread_state, 'metrics', None)
+    if record is None:
+        return
+    record[phase] += duration
+    record['rows'] += rows
+    record['bytes'] += size
+
+
+def metered(handler):
+    """Decorates the handler of a websocket event so that its duration, split
+        per phase, its rows, payload bytes and errors are recorded in
+        HANDLER_METRICS under the namespace and the name of the event
+
+        Args:
+            handler (function): A method named after its event, like on_get_columns
+    """
+    event = handler.__name__[3:]
+    code = handler.__code__
+    max_args = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount - 1
+    min_args = code.co_argcount - 1 - len(handler.__defaults__ or ())
+
+    @functools.wraps(handler)
+    def wrapper(self, *args):
+        if args.__len__() < min_args or (max_args is not None and args.__len__() > max_args):
+            # Flask-SocketIO retries the connect and disconnect handlers with
+            # fewer arguments on a TypeError, which is not an error of the event
+            return handler(self, *args)
+        record = HANDLER_METRICS.begin(self.namespace, event)
+        try:
+            return handler(self, *args)
+        except Exception:
+            record['errors'] += 1
+            raise
+        finally:
+            HANDLER_METRICS.end(record)
+
+    wrapper.metered = True
+    return wrapper
+
+
+def metered_handlers(cls):
+    """Class decorator applying metered() to every websocket event handler, the
+        on_* methods, defined by a Namespace class
+
+        Args:
+            cls (class): The Namespace class
+    """
+    for name, value in list(vars(cls).items()):
+        if name.startswith('on_') and callable(value) and not getattr(value, 'metered', False):
+            setattr(cls, name, metered(value))
+    return cls
+
+
+class MeteredJSON(object):
+    """JSON module given to SocketIO, recording the time spent serializing
+        the payloads of the events and their size
+    """
+
+    @staticmethod
+    def dumps(*args, **kwargs):
+        """Serializes a packet like json.dumps()
+        """
+        start_time = time.time()
+        text = json.dumps(*args, **kwargs)
+        record_metric('serialize', time.time() - start_time, size=text.__len__())
+        return text
+
+    @staticmethod
+    def loads(*args, **kwargs):
+        """Deserializes a packet like json.loads()
+        """
+        return json.loads(*args, **kwargs)
+
+
+class MeteredCursor(cx_Oracle.Cursor):
+    """Cursor recording the time spent executing statements and fetching rows,
+        and the number of rows fetched, for the event handled by the current
+        thread
+    """
+
+    def execute(self, *args, **kwargs):
+        """Executes a statement like Cursor.execute()
+        """
+        start_time = time.time()
+        try:
+            return cx_Oracle.Cursor.execute(self, *args, **kwargs)
+        finally:
+            record_metric('execute', time.time() - start_time)
+
+    def executemany(self, *args, **kwargs):
+        """Executes a statement for each set of binds like Cursor.executemany()
+        """
+        start_time = time.time()
+        try:
+            return cx_Oracle.Cursor.executemany(self, *args, **kwargs)
+        finally:
+            record_metric('execute', time.time() - start_time)
+
+    def callproc(self, *args, **kwargs):
+        """Calls a stored procedure like Cursor.callproc()
+        """
+        start_time = time.time()
+        try:
+            return cx_Oracle.Cursor.callproc(self, *args, **kwargs)
+        finally:
+            record_metric('execute', time.time() - start_time)
+
+    def callfunc(self, *args, **kwargs):
+        """Calls a stored function like Cursor.callfunc()
+        """
+        start_time = time.time()
+        try:
+            return cx_Oracle.Cursor.callfunc(self, *args, **kwargs)
+        finally:
+            record_metric('execute', time.time() - start_time)
+
+    def fetchone(self):
+        """Fetches the next row like Cursor.fetchone()
+        """
+        start_time = time.time()
+        row = cx_Oracle.Cursor.fetchone(self)
+        record_metric('fetch', time.time() - start_time, rows=0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        """Fetches the next rows like Cursor.fetchmany()
+        """
+        start_time = time.time()
+        rows = cx_Oracle.Cursor.fetchmany(self, *args, **kwargs)
+        record_metric('fetch', time.time() - start_time, rows=rows.__len__())
+        return rows
+
+    def fetchall(self):
+        """Fetches the remaining rows like Cursor.fetchall()
+        """
+        start_time = time.time()
+        rows = cx_Oracle.Cursor.fetchall(self)
+        record_metric('fetch', time.time() - start_time, rows=rows.__len__())
+        return rows
+
+    def __iter__(self):
+        """Iterates over the rows, fetched arraysize rows at a time
+        """
+        while True:
+            rows = self.fetchmany()
+            if rows.__len__() == 0:
+                return
+            for row in rows:
+                yield row
+
+
+class MeteredConnection(cx_Oracle.Connection):
+    """Connection opening MeteredCursor cursors, used by the session pools
+    """
+
+    def cursor(self, *args, **kwargs):
+        """Returns a new MeteredCursor like Connection.cursor()
+        """
+        return MeteredCursor(self, *args, **kwargs)
+
+
+class ClientSession(object):
+    """Holds the database state of one websocket client: the pool it
+        connects through, its schema and the session holding its open
+        transaction
+    """
+
+    client_id = None
+    pool_key = None
+    schema_name = None
+    transaction_connection = None
+    running_connections = None
+    event_queues = None
+    payload_format = None
+    namespaces = None
+    active_events = 0
+    last_seen = None
+    closing = False
+
+    def __init__(self, client_id):
+        """Default constructor for ClientSession class
+
+            Args:
+                client_id (string): Id of the websocket client
+        """
+        self.client_id = client_id
+        self.namespaces = {}
+        self.running_connections = set()
+        self.event_queues = {}
+        self.active_events = 0
+        self.last_seen = time.time()
+
+
+class SchemaMetadataCache(object):
+    """Caches the lists of schema objects shown in the navigation tree per
+        pool and schema.
+
+        A cached list is served as long as it is younger than the TTL and
+        the count and latest LAST_DDL_TIME of its object type in user_objects
+        did not change. These are read for all object types at once by a
+        single probe query, itself reused for a few seconds so that a tree
+        refresh costs one probe. The least recently used lists are evicted
+        once more than max_entries are cached
+    """
+
+    OBJECT_TYPES = {'tables': 'TABLE',
+                    'views': 'VIEW',
+                    'indexes': 'INDEX',
+                    'mviews': 'MATERIALIZED VIEW',
+                    'procedures': 'PROCEDURE',
+                    'functions': 'FUNCTION',
+                    'packages': 'PACKAGE',
+                    'sequences': 'SEQUENCE',
+                    'synonyms': 'SYNONYM',
+                    'triggers': 'TRIGGER',
+                    'types': 'TYPE',
+                    'queues': 'QUEUE',
+                    'dblinks': 'DATABASE LINK'}
+
+    _entries = None
+    _probes = None
+    _ttl = None
+    _probe_interval = None
+    _max_entries = None
+    _stats = None
+    _lock = None
+
+    def __init__(self, ttl=300, max_entries=256, probe_interval=5):
+        """Default constructor for SchemaMetadataCache class
+
+            Args:
+                ttl (int, optional): Seconds after which a list is read again
+                max_entries (int, optional): Maximum number of cached lists
+                probe_interval (int, optional): Seconds during which the result of
+                    the probe query is reused
+        """
+        self._entries = collections.OrderedDict()
+        self._probes = {}
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._probe_interval = probe_interval
+        self._stats = {'hits': 0,
+                       'misses': 0,
+                       'invalidations': 0,
+                       'evictions': 0,
+                       'probes': 0}
+        self._lock = threading.RLock()
+
+    def get(self, db_conn, owner_key, category, loader):
+        """Returns the cached list of a category of schema objects, calling the
+            loader to read it again when missing, expired or changed
+
+            Args:
+                db_conn (Connection): Session used to run the probe query
+                owner_key (tuple): Identifies the pool and the schema of the list
+                category (string): Category of the objects, like 'tables'
+                loader (function): Reads the list from the database
+        """
+        key = owner_key + (category,)
+        now = time.time()
+        object_type = self.OBJECT_TYPES.get(category)
+        signature = None
+        if object_type is not None:
+            signature = self._probe(db_conn, owner_key, now).get(object_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry['loadedAt'] < self._ttl and entry['signature'] == signature:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return list(entry['value'])
+            self._stats['misses'] += 1
+            if entry is not None and entry['signature'] != signature:
+                self._stats['invalidations'] += 1
+        value = loader()
+        with self._lock:
+            self._entries[key] = {'value': list(value),
+                                  'signature': signature,
+                                  'loadedAt': now}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return value
+
+    def _probe(self, db_conn, owner_key, now):
+        """Returns the count and latest LAST_DDL_TIME of each object type of the
+            schema, running the probe query unless its last result is recent enough
+
+            Args:
+                db_conn (Connection): Session used to run the probe query
+                owner_key (tuple): Identifies the pool and the schema
+                now (float): Current time
+        """
+        with self._lock:
+            probe = self._probes.get(owner_key)
+            if probe is not None and now - probe[0] < self._probe_interval:
+                return probe[1]
+        cursor = db_conn.cursor()
+        query = """
+                SELECT
+                    object_type,
+                    COUNT(*),
+                    TO_CHAR(MAX(last_ddl_time), 'YYYYMMDDHH24MISS')
+                FROM SYS.user_objects
+                GROUP BY object_type
+                """
+        cursor.execute(query)
+        signatures = {}
+        for result in cursor:
+            signatures[result[0]] = (result[1], result[2])
+        with self._lock:
+            self._probes[owner_key] = (now, signatures)
+            self._stats['probes'] += 1
+        return signatures
+
+    def invalidate(self, owner_key):
+        """Drops every cached list of a schema
+
+            Args:
+                owner_key (tuple): Identifies the pool and the schema
+        """
+        with self._lock:
+            self._probes.pop(owner_key, None)
+            for key in [key for key in self._entries if key[0:len(owner_key)] == owner_key]:
+                del self._entries[key]
+                self._stats['invalidations'] += 1
+
+    def get_stats(self):
+        """Returns the hit and miss counters of the cache
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        stats['ttl'] = self._ttl
+        stats['maxEntries'] = self._max_entries
+        return stats
+
+
+class TrigramIndex(object):
+    """In-memory index of the names of the schema objects, answering the
+        object finder as the user types.
+
+        Names starting with the text typed are read from a sorted list with a
+        binary search. When there are not enough of them, names containing the
+        text are taken from the intersection of the sets of names of its
+        trigrams, then names sharing at least half of its trigrams are ranked
+        by the share of the trigrams they contain. Names are padded with two
+        leading spaces so that the first letters typed have trigrams too
+    """
+
+    _entries = None
+    _ids = None
+    _postings = None
+    _categories = None
+    _sorted = None
+    _next_id = 0
+    _lock = None
+
+    def __init__(self):
+        """Default constructor for TrigramIndex class
+        """
+        self._entries = {}
+        self._ids = {}
+        self._postings = {}
+        self._categories = {}
+        self._sorted = []
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_trigrams(text, pad=True):
+        """Returns the set of trigrams of a text
+
+            Args:
+                text (string): The text, upper cased before being split
+                pad (bool, optional): Adds the trigrams marking the start and the end
+                    of the text
+        """
+        padded = '  ' + text.upper() + ' ' if pad else text.upper()
+        return set(padded[i:i + 3] for i in range(0, padded.__len__() - 2))
+
+    def has_category(self, category):
+        """Returns True if the names of a category have been indexed
+
+            Args:
+                category (string): Category of the objects, like 'tables'
+        """
+        with self._lock:
+            return category in self._categories
+
+    def update_category(self, category, names):
+        """Replaces the indexed names of a category, only indexing the names
+            added and dropping the names removed since the previous update
+
+            Args:
+                category (string): Category of the objects, like 'tables'
+                names (list): Names of every object of the category
+        """
+        names = set(names)
+        with self._lock:
+            indexed = self._categories.setdefault(category, set())
+            removed = indexed - names
+            added = names - indexed
+            for name in removed:
+                entry_id = self._ids.pop((category, name))
+                del self._entries[entry_id]
+                for trigram in self.get_trigrams(name):
+                    postings = self._postings.get(trigram)
+                    postings.discard(entry_id)
+                    if postings.__len__() == 0:
+                        del self._postings[trigram]
+            for name in added:
+                entry_id = self._next_id
+                self._next_id += 1
+                self._ids[(category, name)] = entry_id
+                self._entries[entry_id] = (name, category)
+                for trigram in self.get_trigrams(name):
+                    self._postings.setdefault(trigram, set()).add(entry_id)
+            if removed.__len__() + added.__len__() > 1000:
+                self._sorted = sorted(self._entries.values())
+            else:
+                for name in removed:
+                    del self._sorted[bisect.bisect_left(self._sorted, (name, category))]
+                for name in added:
+                    bisect.insort(self._sorted, (name, category))
+            self._categories[category] = names
+
+    def search(self, text, limit=20, categories=None):
+        """Returns the names best matching a text: names starting with the text
+            first, then names containing it, then names sharing most of its
+            trigrams, each with a score from 0 to 3
+
+            Args:
+                text (string): Text typed by the user
+                limit (int, optional): Maximum number of matches to return
+                categories (list, optional): Only returns names of these categories
+        """
+        text = text.strip().upper()
+        if text.__len__() == 0:
+            return []
+        matches = []
+        found = set()
+        with self._lock:
+            position = bisect.bisect_left(self._sorted, (text,))
+            while position < self._sorted.__len__() and matches.__len__() < limit:
+                name, category = self._sorted[position]
+                position += 1
+                if not name.startswith(text):
+                    break
+                if categories is None or category in categories:
+                    matches.append({'name': name, 'category': category, 'score': 3.0})
+                    found.add((name, category))
+            if matches.__len__() >= limit:
+                return matches
+            inner = [self._postings.get(trigram, set()) for trigram in self.get_trigrams(text, pad=False)]
+            if inner.__len__() > 0:
+                inner.sort(key=len)
+                candidates = [self._entries[entry_id] for entry_id in inner[0].intersection(*inner[1:])]
+                candidates = [entry for entry in candidates if entry not in found and
+                              (categories is None or entry[1] in categories)]
+                candidates.sort(key=lambda entry: (entry[0].__len__(), entry[0]))
+                for name, category in candidates:
+                    if matches.__len__() >= limit:
+                        return matches
+                    if text in name:
+                        matches.append({'name': name, 'category': category, 'score': 2.0})
+                        found.add((name, category))
+            postings = [self._postings.get(trigram, set()) for trigram in self.get_trigrams('  ' + text, pad=False)]
+            postings.sort(key=len)
+            threshold = max(1, postings.__len__() // 2)
+            # Names sharing three quarters of the trigrams are looked up first as
+            # they rank first and only require counting the rarest trigrams
+            minimums = sorted(set([max(threshold, postings.__len__() - postings.__len__() // 4), threshold]),
+                              reverse=True)
+            for minimum in minimums:
+                scored = self._score_entries(postings, minimum, limit - matches.__len__(), found, categories)
+                if scored.__len__() >= limit - matches.__len__():
+                    break
+        for count, length, (name, category) in heapq.nsmallest(limit - matches.__len__(), scored):
+            matches.append({'name': name, 'category': category,
+                            'score': round(float(-count) / postings.__len__(), 3)})
+        return matches
+
+    def _score_entries(self, postings, minimum, needed, found, categories):
+        """Returns the names sharing at least minimum trigrams of a text, as tuples
+            sorting the names sharing the most trigrams and the shortest first.
+            Only the names sharing enough trigrams to be among the needed best ones
+            are returned. Must be called with the lock held
+
+            Args:
+                postings (list): Sets of the ids of the names of each trigram of the
+                    text, the smallest first
+                minimum (int): Number of trigrams a name must share
+                needed (int): Number of names to return at least, when there are
+                found (set): Names already matched, which are left out
+                categories (list): Only returns names of these categories, if given
+        """
+        # A name sharing minimum trigrams has at least one of the rarest ones
+        rarest = postings.__len__() - minimum + 1
+        counts = collections.Counter()
+        for entry_ids in postings[0:rarest]:
+            counts.update(entry_ids)
+        candidates = counts.keys()
+        for entry_ids in postings[rarest:]:
+            counts.update(candidates & entry_ids)
+        histogram = collections.Counter(counts.values())
+        cutoff = postings.__len__()
+        total = histogram[cutoff]
+        while cutoff > minimum and total < needed + found.__len__():
+            cutoff -= 1
+            total += histogram[cutoff]
+        while True:
+            scored = []
+            for entry_id in [entry_id for entry_id, count in counts.items() if count >= cutoff]:
+                entry = self._entries[entry_id]
+                if entry not in found and (categories is None or entry[1] in categories):
+                    scored.append((-counts[entry_id], entry[0].__len__(), entry))
+            if scored.__len__() >= needed or cutoff == minimum:
+                return scored
+            cutoff = minimum
+
+    def get_stats(self):
+        """Returns the number of names and trigrams held by the index and an
+            estimate of the memory it uses
+        """
+        with self._lock:
+            return {'names': len(self._entries),
+                    'trigrams': len(self._postings),
+                    'categories': sorted(self._categories.keys()),
+                    'bytes': get_memory_size(self._entries) + get_memory_size(self._postings)}
+
+
+class SourceIndex(object):
+    """Full-text index of the PL/SQL, trigger and type source of a schema.
+
+        user_source is read once with bulk fetches and kept in memory together
+        with an inverted index from each identifier to the objects using it, so
+        that a search only scans the lines of the objects holding every word
+        searched. The index is refreshed incrementally: only the objects whose
+        LAST_DDL_TIME changed are read again.
+
+        When a path is given, the source is also written to a SQLite file, in
+        an FTS table when SQLite supports it, from which the index is loaded
+        on the next start before being refreshed
+    """
+
+    SOURCE_TYPES = ('PROCEDURE', 'FUNCTION', 'PACKAGE', 'PACKAGE BODY', 'TRIGGER', 'TYPE', 'TYPE BODY',
+                    'JAVA SOURCE', 'LIBRARY')
+
+    TOKEN_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_$#]*')
+
+    SIGNATURE_QUERY = """
+            SELECT
+                object_name,
+                object_type,
+                TO_CHAR(last_ddl_time, 'YYYYMMDDHH24MISS')
+            FROM SYS.user_objects
+            WHERE object_type IN (%s)
+            """ % ', '.join(["'%s'" % object_type for object_type in SOURCE_TYPES])
+
+    SOURCE_QUERY = """
+            SELECT
+                name,
+                type,
+                text
+            FROM SYS.user_source
+            %s
+            ORDER BY
+                name,
+                type,
+                line
+            """
+
+    _sources = None
+    _tokens = None
+    _signatures = None
+    _path = None
+    _checked_at = None
+    _check_interval = None
+    _refreshes = 0
+    _lock = None
+
+    def __init__(self, path=None, check_interval=5):
+        """Default constructor for SourceIndex class
+
+            Args:
+                path (string, optional): SQLite file the source is persisted to
+                check_interval (int, optional): Seconds during which the index is
+                    served without checking the schema for DDL changes
+        """
+        self._sources = {}
+        self._tokens = {}
+        self._signatures = {}
+        self._path = path if sqlite3 is not None else None
+        self._check_interval = check_interval
+        self._refreshes = 0
+        self._lock = threading.RLock()
+        if self._path is not None:
+            try:
+                self._load_file()
+            except sqlite3.Error as e:
+                print("Error while reading the source index file: " + str(e))
+
+    @classmethod
+    def get_tokens(cls, text):
+        """Returns the set of upper cased identifiers of a text
+
+            Args:
+                text (string): A line of source or the text searched
+        """
+        return set(token.upper() for token in cls.TOKEN_PATTERN.findall(text or ''))
+
+    def refresh(self, db_conn):
+        """Reads the source of the objects created or compiled since the previous
+            refresh and drops the objects dropped since. The schema is checked at
+            most once per check interval
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+        """
+        now = time.time()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self._check_interval:
+                return
+            self._checked_at = now
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(self.SIGNATURE_QUERY)
+        signatures = dict(((result[0], result[1]), result[2]) for result in cursor)
+        with self._lock:
+            changed = [key for key, signature in signatures.items() if self._signatures.get(key) != signature]
+            dropped = [key for key in self._signatures if key not in signatures]
+        if changed.__len__() == 0 and dropped.__len__() == 0:
+            return
+        full = changed.__len__() > 0 and changed.__len__() == signatures.__len__()
+        if full:
+            sources = self._read_source(db_conn)
+        else:
+            sources = {}
+            names = sorted(set(key[0] for key in changed))
+            for i in range(0, names.__len__(), 500):
+                sources.update(self._read_source(db_conn, names[i:i + 500]))
+        sources = dict((key, sources.get(key, [])) for key in changed)
+        with self._lock:
+            for key in dropped + changed:
+                self._remove(key)
+            for key, lines in sources.items():
+                self._add(key, lines, signatures[key])
+            self._refreshes += 1
+        if self._path is not None:
+            try:
+                self._save_file(sources, dropped, signatures, full)
+            except sqlite3.Error as e:
+                print("Error while writing the source index file: " + str(e))
+
+    def _read_source(self, db_conn, names=None):
+        """Reads the lines of source of the given objects, or of the whole schema
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                names (list, optional): Names of the objects to read
+        """
+        cursor = db_conn.cursor()
+        cursor.arraysize = 5000
+        if names is None:
+            cursor.execute(self.SOURCE_QUERY % '')
+        else:
+            binds = dict(('n%d' % i, names[i]) for i in range(0, names.__len__()))
+            cursor.execute(self.SOURCE_QUERY % ('WHERE name IN (%s)' % ', '.join([':n%d' % i for i in range(0, names.__len__())])),
+                           binds)
+        sources = {}
+        while True:
+            rows = cursor.fetchmany()
+            if rows.__len__() == 0:
+                break
+            for result in rows:
+                sources.setdefault((result[0], result[1]), []).append((result[2] or '').rstrip('\n'))
+        return sources
+
+    def _add(self, key, lines, signature):
+        """Indexes the source of an object. Must be called with the lock held
+
+            Args:
+                key (tuple): Name and type of the object
+                lines (list): Lines of source of the object
+                signature (string): LAST_DDL_TIME of the object
+        """
+        self._sources[key] = lines
+        self._signatures[key] = signature
+        tokens = set()
+        for line in lines:
+            tokens.update(self.get_tokens(line))
+        for token in tokens:
+            self._tokens.setdefault(token, set()).add(key)
+
+    def _remove(self, key):
+        """Drops the source of an object from the index. Must be called with the
+            lock held
+
+            Args:
+                key (tuple): Name and type of the object
+        """
+        lines = self._sources.pop(key, None)
+        self._signatures.pop(key, None)
+        if lines is None:
+            return
+        for line in lines:
+            for token in self.get_tokens(line):
+                keys = self._tokens.get(token)
+                if keys is not None:
+                    keys.discard(key)
+                    if keys.__len__() == 0:
+                        del self._tokens[token]
+
+    def search(self, text, limit=200, phrase=False):
+        """Returns the lines of source holding every identifier of the text
+
+            Args:
+                text (string): Words searched
+                limit (int, optional): Maximum number of lines to return
+                phrase (bool, optional): Only returns the lines holding the text as
+                    typed, case aside
+        """
+        tokens = self.get_tokens(text)
+        if tokens.__len__() == 0:
+            return []
+        hits = []
+        with self._lock:
+            sets = sorted([self._tokens.get(token, set()) for token in tokens], key=len)
+            keys = sorted(sets[0].intersection(*sets[1:]))
+            for key in keys:
+                for i, line in enumerate(self._sources[key]):
+                    if phrase:
+                        if text.upper() not in line.upper():
+                            continue
+                    elif not tokens.issubset(self.get_tokens(line)):
+                        continue
+                    hits.append({'name': key[0],
+                                 'type': key[1],
+                                 'line': i + 1,
+                                 'text': line})
+                    if hits.__len__() >= limit:
+                        return hits
+        return hits
+
+    def _connect_file(self):
+        """Opens the SQLite file, creating its tables when missing
+        """
+        connection = sqlite3.connect(self._path)
+        connection.execute("CREATE TABLE IF NOT EXISTS source_objects "
+                           "(name TEXT, type TEXT, signature TEXT, PRIMARY KEY (name, type))")
+        for module in ('fts5', 'fts4', None):
+            try:
+                if module is None:
+                    connection.execute("CREATE TABLE IF NOT EXISTS source_lines "
+                                       "(name TEXT, type TEXT, line INTEGER, text TEXT)")
+                else:
+                    connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS source_lines "
+                                       "USING %s(name, type, line, text)" % module)
+                break
+            except sqlite3.OperationalError:
+                continue
+        return connection
+
+    def _load_file(self):
+        """Loads the index from the SQLite file
+        """
+        connection = self._connect_file()
+        try:
+            signatures = dict(((row[0], row[1]), row[2]) for row in
+                              connection.execute("SELECT name, type, signature FROM source_objects"))
+            sources = {}
+            for row in connection.execute("SELECT name, type, text FROM source_lines "
+                                          "ORDER BY name, type, CAST(line AS INTEGER)"):
+                sources.setdefault((row[0], row[1]), []).append(row[2])
+        finally:
+            connection.close()
+        with self._lock:
+            for key, signature in signatures.items():
+                self._add(key, sources.get(key, []), signature)
+
+    def _save_file(self, sources, dropped, signatures, full=False):
+        """Writes the objects read again and removes the objects dropped from the
+            SQLite file
+
+            Args:
+                sources (dict): Lines of source of the objects read again, by key
+                dropped (list): Keys of the objects dropped
+                signatures (dict): LAST_DDL_TIME of the objects, by key
+                full (bool, optional): The whole schema was read again and replaces
+                    the content of the file
+        """
+        connection = self._connect_file()
+        try:
+            with connection:
+                if full:
+                    connection.execute("DELETE FROM source_objects")
+                    connection.execute("DELETE FROM source_lines")
+                for key in ([] if full else dropped + list(sources.keys())):
+                    connection.execute("DELETE FROM source_objects WHERE name = ? AND type = ?", key)
+                    connection.execute("DELETE FROM source_lines WHERE name = ? AND type = ?", key)
+                for key, lines in sources.items():
+                    connection.execute("INSERT INTO source_objects VALUES (?, ?, ?)",
+                                       (key[0], key[1], signatures[key]))
+                    connection.executemany("INSERT INTO source_lines VALUES (?, ?, ?, ?)",
+                                           [(key[0], key[1], i + 1, lines[i]) for i in range(0, lines.__len__())])
+        finally:
+            connection.close()
+
+    def expire(self):
+        """Makes the next refresh check the schema whatever the check interval
+        """
+        with self._lock:
+            self._checked_at = None
+
+    def get_stats(self):
+        """Returns the number of objects, lines and words held by the index and an
+            estimate of the memory it uses
+        """
+        with self._lock:
+            return {'objects': len(self._sources),
+                    'lines': sum(len(lines) for lines in self._sources.values()),
+                    'tokens': len(self._tokens),
+                    'bytes': get_memory_size(self._sources) + get_memory_size(self._tokens),
+                    'path': self._path,
+                    'refreshes': self._refreshes}
+
+
+class SchemaSnapshot(object):
+    """In-memory copy of the column, constraint and index dictionary of a
+        schema, read with a few bulk queries and indexed by table name so that
+        the table handlers do not query the dictionary for every click.
+
+        The snapshot is refreshed incrementally: a signature made of the
+        LAST_DDL_TIME of each table and of its indexes is compared with the
+        one of the last load and only the tables whose signature changed are
+        read again.
+
+        When a path is given, the snapshot is also written to a SQLite file
+        from which it is loaded on the next start. A snapshot loaded from its
+        file is served right away and compared with the schema by its first
+        refresh
+    """
+
+    COLUMNS_QUERY = """
+            SELECT
+                a.table_name,
+                a.column_name,
+                CASE
+                    WHEN a.data_type IN ('VARCHAR2', 'CHAR', 'VARCHAR', 'CHAR VARYING', 'CHARACTER', 'CHARACTER VARYING')
+                        THEN a.data_type || '(' || a.data_length || ' ' || decode(a.char_used, 'B', 'BYTE', 'C', 'CHAR', a.char_used) || ')'
+                    WHEN a.data_type IN ('NUMBER', 'DEC', 'DECIMAL', 'NUMERIC') AND a.data_precision IS NOT NULL AND a.data_scale IS NOT NULL
+                        THEN a.data_type || '(' || a.data_precision || ', ' || a.data_scale || ')'
+                    WHEN a.data_type IN ('NUMBER', 'DEC', 'DECIMAL', 'NUMERIC') AND a.data_precision IS NOT NULL AND a.data_scale IS NULL
+                        THEN a.data_type || '(' || a.data_precision || ')'
+                    WHEN a.data_type IN ('NATIONAL CHAR', 'NATIONAL CHAR VARYING', 'NATIONAL CHARACTER', 'NATIONAL CHARACTER VARYING', 'NCHAR', 'NCHAR VARYING', 'NVARCHAR2', 'RAW', 'UROWID') AND a.char_length IS NOT NULL
+                        THEN a.data_type || '(' || a.char_length || ' CHAR)'
+                    ELSE a.data_type
+                END AS data_type,
+                a.nullable,
+                a.data_default,
+                a.column_id,
+                b.comments
+            FROM SYS.user_tab_columns a,
+                SYS.user_col_comments b
+            WHERE
+                a.table_name = b.table_name (+)
+                AND a.column_name = b.column_name (+)
+                %s
+            ORDER BY
+                a.table_name,
+                a.column_id
+            """
+
+    CONSTRAINTS_QUERY = """
+            SELECT
+                a.table_name,
+                CASE a.constraint_type
+                    WHEN 'P' THEN '<img src="/static/icons/primarykey.png" /> Primary Key'
+                    WHEN 'R' THEN '<img src="/static/icons/foreignkey.png" /> Foreign Key'
+                    WHEN 'U' THEN '<img src="/static/icons/key.png" /> Unique'
+                    WHEN 'C' THEN '<img src="/static/icons/constraint.png" /> Check'
+                END AS constraint_type,
+                a.constraint_name AS name,
+                decode(a.status, 'ENABLED', 'true', 'false') AS enabled,
+                decode(a.deferrable,
+                        'INITIALLY IMMEDIATE', 'Initially Immediate',
+                        'NOT DEFERRABLE', 'Not Deferrable',
+                        'INITIALLY DEFERRED', 'Initially Deferred',
+                        a.deferrable) as deferrable_state,
+                a.constraint_type,
+                a.search_condition AS check_condition,
+                a.r_owner,
+                b.table_name,
+                a.r_constraint_name,
+                decode(a.delete_rule, 'NO ACTION', 'No Action', 'CASCADE', 'Cascade', 'SET NULL', 'Set Null', a.delete_rule) AS delete_rule,
+                a.index_name
+            FROM
+                SYS.user_constraints a,
+                SYS.user_constraints b
+            WHERE
+                a.r_constraint_name = b.constraint_name (+)
+                %s
+            ORDER BY
+                a.table_name,
+                a.constraint_name
+            """
+
+    CONS_COLUMNS_QUERY = """
+            SELECT
+                a.table_name,
+                a.constraint_name,
+                a.column_name
+            FROM SYS.user_cons_columns a
+            WHERE 1 = 1
+                %s
+            ORDER BY
+                a.table_name,
+                a.constraint_name,
+                a.position
+            """
+
+    INDEXES_QUERY = """
+            SELECT
+                a.table_name,
+                a.index_name,
+                decode(a.uniqueness,
+                        'UNIQUE', 'Unique',
+                        'NONUNIQUE', 'Non-Unique',
+                        a.uniqueness) AS index_type
+            FROM SYS.user_indexes a
+            WHERE 1 = 1
+                %s
+            ORDER BY
+                a.table_name,
+                a.index_name
+            """
+
+    IND_COLUMNS_QUERY = """
+            SELECT
+                a.table_name,
+                a.index_name,
+                a.column_name
+            FROM SYS.user_ind_columns a
+            WHERE 1 = 1
+                %s
+            ORDER BY
+                a.table_name,
+                a.index_name,
+                a.column_position
+            """
+
+    SIGNATURE_QUERY = """
+            SELECT
+                table_name,
+                TO_CHAR(MAX(last_ddl_time), 'YYYYMMDDHH24MISS'),
+                COUNT(*)
+            FROM (
+                SELECT
+                    object_name AS table_name,
+                    last_ddl_time
+                FROM SYS.user_objects
+                WHERE object_type IN ('TABLE', 'VIEW')
+                UNION ALL
+                SELECT
+                    i.table_name,
+                    o.last_ddl_time
+                FROM SYS.user_indexes i,
+                    SYS.user_objects o
+                WHERE
+                    o.object_name = i.index_name
+                    AND o.object_type = 'INDEX'
+            )
+            GROUP BY table_name
+            """
+
+    _tables = None
+    _constraints = None
+    _signatures = None
+    _path = None
+    _loaded_at = None
+    _checked_at = None
+    _check_interval = None
+    _validated = False
+    _revalidating = False
+    _refreshes = 0
+    _lock = None
+
+    def __init__(self, check_interval=5, path=None):
+        """Default constructor for SchemaSnapshot class
+
+            Args:
+                check_interval (int, optional): Seconds during which the snapshot is
+                    served without comparing the signatures of the tables again
+                path (string, optional): SQLite file the snapshot is persisted to
+        """
+        self._tables = {}
+        self._constraints = {}
+        self._signatures = {}
+        self._path = path if sqlite3 is not None else None
+        self._check_interval = check_interval
+        self._refreshes = 0
+        self._lock = threading.RLock()
+        if self._path is not None:
+            try:
+                self._load_file()
+            except (sqlite3.Error, ValueError) as e:
+                print("Error while reading the schema snapshot file: " + str(e))
+
+    def refresh(self, db_conn):
+        """Loads the whole snapshot on the first call, then reads again only the
+            tables created, altered or dropped since the previous refresh. The
+            signatures are compared at most once per check interval
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+        """
+        now = time.time()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self._check_interval:
+                return
+            self._checked_at = now
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(self.SIGNATURE_QUERY)
+        signatures = dict((result[0], (result[1], result[2])) for result in cursor)
+        dropped = []
+        with self._lock:
+            if self._loaded_at is None:
+                changed = None
+            else:
+                changed = [name for name, signature in signatures.items() if self._signatures.get(name) != signature]
+                dropped = [name for name in self._signatures if name not in signatures]
+                for name in dropped:
+                    self._drop_table(name)
+                if changed.__len__() == 0:
+                    self._signatures = signatures
+                    self._validated = True
+        if changed is not None and changed.__len__() == 0:
+            if dropped.__len__() > 0:
+                self._save_file({}, dropped, signatures)
+            return
+        tables = self._load(db_conn, changed)
+        with self._lock:
+            for name in (changed if changed is not None else []):
+                self._drop_table(name)
+            for name, table in tables.items():
+                self._tables[name] = table
+                for constraint in table['constraints']:
+                    self._constraints[constraint['constraintName']] = name
+            self._signatures = signatures
+            self._loaded_at = now
+            self._validated = True
+            self._refreshes += 1
+        self._save_file(tables, dropped + (changed if changed is not None else []), signatures, changed is None)
+
+    def _drop_table(self, table_name):
+        """Removes a table from the snapshot. Must be called with the lock held
+
+            Args:
+                table_name (string): Name of the table
+        """
+        table = self._tables.pop(table_name, None)
+        self._signatures.pop(table_name, None)
+        if table is not None:
+            for constraint in table['constraints']:
+                self._constraints.pop(constraint['constraintName'], None)
+
+    def _load(self, db_conn, table_names=None):
+        """Reads the dictionary of the given tables, or of the whole schema, with
+            one bulk query per dictionary view and returns it indexed by table name
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_names (list, optional): Names of the tables to read
+        """
+        tables = {}
+
+        def get_table(name):
+            if name not in tables:
+                tables[name] = {'columns': [],
+                                'constraints': [],
+                                'consColumns': {},
+                                'indexes': [],
+                                'indColumns': {}}
+            return tables[name]
+
+        for rows in self._fetch(db_conn, self.COLUMNS_QUERY, table_names):
+            for result in rows:
+                get_table(result[0])['columns'].append({'columnName': result[1],
+                                                        'dataType': result[2],
+                                                        'nullable': result[3],
+                                                        'dataDefault': result[4],
+                                                        'columnId': result[5],
+                                                        'comments': result[6]})
+        for rows in self._fetch(db_conn, self.CONSTRAINTS_QUERY, table_names):
+            for result in rows:
+                get_table(result[0])['constraints'].append({'type': result[1],
+                                                            'name': result[2],
+                                                            'enabled': json.loads(result[3]),
+                                                            'deferrableState': result[4],
+                                                            'constraintType': result[5],
+                                                            'checkCondition': result[6],
+                                                            'refOwner': result[7],
+                                                            'refTable': result[8],
+                                                            'refConstraintName': result[9],
+                                                            'deleteRule': result[10],
+                                                            'indexName': result[11],
+                                                            'constraintName': result[2]})
+        for rows in self._fetch(db_conn, self.CONS_COLUMNS_QUERY, table_names):
+            for result in rows:
+                get_table(result[0])['consColumns'].setdefault(result[1], []).append(result[2])
+        for rows in self._fetch(db_conn, self.INDEXES_QUERY, table_names):
+            for result in rows:
+                get_table(result[0])['indexes'].append({'indexName': result[1],
+                                                        'indexType': result[2]})
+        for rows in self._fetch(db_conn, self.IND_COLUMNS_QUERY, table_names):
+            for result in rows:
+                get_table(result[0])['indColumns'].setdefault(result[1], []).append(result[2])
+        return tables
+
+    def _fetch(self, db_conn, query, table_names=None):
+        """Runs a bulk dictionary query for the given tables, or for the whole
+            schema, and yields its rows in batches
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                query (string): The query, with a placeholder for the table filter
+                table_names (list, optional): Names of the tables to read
+        """
+        if table_names is None:
+            batches = [None]
+        else:
+            batches = [table_names[i:i + 500] for i in range(0, table_names.__len__(), 500)]
+        for batch in batches:
+            cursor = db_conn.cursor()
+            cursor.arraysize = 1000
+            if batch is None:
+                cursor.execute(query % '')
+            else:
+                binds = dict(('t%d' % i, batch[i]) for i in range(0, batch.__len__()))
+                predicate = 'AND a.table_name IN (%s)' % ', '.join([':t%d' % i for i in range(0, batch.__len__())])
+                cursor.execute(query % predicate, binds)
+            while True:
+                rows = cursor.fetchmany()
+                if rows.__len__() == 0:
+                    break
+                yield rows
+
+    def _load_file(self):
+        """Loads the snapshot from the SQLite file
+        """
+        connection = self._connect_file()
+        try:
+            signatures = dict((row[0], tuple(json.loads(row[1]))) for row in
+                              connection.execute("SELECT name, signature FROM snapshot_signatures"))
+            tables = dict((row[0], json.loads(row[1])) for row in
+                          connection.execute("SELECT name, data FROM snapshot_tables"))
+        finally:
+            connection.close()
+        if signatures.__len__() == 0:
+            return
+        with self._lock:
+            for name, table in tables.items():
+                self._tables[name] = table
+                for constraint in table['constraints']:
+                    self._constraints[constraint['constraintName']] = name
+            self._signatures = signatures
+            self._loaded_at = os.path.getmtime(self._path)
+
+    def _connect_file(self):
+        """Opens the SQLite file, creating its tables when missing
+        """
+        connection = sqlite3.connect(self._path)
+        connection.execute("CREATE TABLE IF NOT EXISTS snapshot_signatures (name TEXT PRIMARY KEY, signature TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS snapshot_tables (name TEXT PRIMARY KEY, data TEXT)")
+        return connection
+
+    def _save_file(self, tables, removed, signatures, full=False):
+        """Writes the tables read again and removes the tables dropped from the
+            SQLite file, if any. Errors are reported but not raised, the snapshot
+            in memory being up to date
+
+            Args:
+                tables (dict): The tables read again, by name
+                removed (list): Names of the tables dropped or read again
+                signatures (dict): Signatures of all the tables, by name
+                full (bool, optional): The whole schema was read again and replaces
+                    the content of the file
+        """
+        if self._path is None:
+            return
+        try:
+            connection = self._connect_file()
+            try:
+                with connection:
+                    if full:
+                        connection.execute("DELETE FROM snapshot_tables")
+                    connection.executemany("DELETE FROM snapshot_tables WHERE name = ?",
+                                           [(name,) for name in ([] if full else removed)])
+                    connection.executemany("INSERT INTO snapshot_tables VALUES (?, ?)",
+                                           [(name, json.dumps(table, default=str)) for name, table in tables.items()])
+                    connection.execute("DELETE FROM snapshot_signatures")
+                    connection.executemany("INSERT INTO snapshot_signatures VALUES (?, ?)",
+                                           [(name, json.dumps(signature)) for name, signature in signatures.items()])
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print("Error while writing the schema snapshot file: " + str(e))
+
+    def delete_file(self):
+        """Removes the SQLite file of the snapshot, if any
+        """
+        if self._path is None or not os.path.exists(self._path):
+            return
+        try:
+            os.remove(self._path)
+        except OSError as e:
+            print("Error while removing the schema snapshot file: " + str(e))
+
+    def start_revalidation(self):
+        """Returns True the first time it is called on a snapshot loaded from its
+            file and not compared with the schema yet, so that the caller starts
+            the refresh revalidating it exactly once
+        """
+        with self._lock:
+            if self._validated or self._revalidating or self._loaded_at is None:
+                return False
+            self._revalidating = True
+            return True
+
+    def revalidate(self, db_conn):
+        """Refreshes a snapshot loaded from its file, see start_revalidation()
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+        """
+        try:
+            self.refresh(db_conn)
+        finally:
+            with self._lock:
+                self._revalidating = False
+
+    def is_revalidating(self):
+        """Returns True while the snapshot loaded from its file is being compared
+            with the schema
+        """
+        with self._lock:
+            return self._revalidating
+
+    def expire(self):
+        """Makes the next refresh compare the signatures of the tables whatever
+            the check interval
+        """
+        with self._lock:
+            self._checked_at = None
+
+    def has_table(self, table_name):
+        """Returns True if the table is part of the snapshot
+
+            Args:
+                table_name (string): Name of the table or view
+        """
+        with self._lock:
+            return table_name in self._tables
+
+    def get_columns(self, table_name):
+        """Returns the columns of a table ordered by position
+
+            Args:
+                table_name (string): Name of the table or view
+        """
+        with self._lock:
+            table = self._tables.get(table_name)
+            return [dict(column) for column in table['columns']] if table is not None else []
+
+    def get_constraints(self, table_name):
+        """Returns the constraints of a table
+
+            Args:
+                table_name (string): Name of the table
+        """
+        with self._lock:
+            table = self._tables.get(table_name)
+            return [dict(constraint) for constraint in table['constraints']] if table is not None else []
+
+    def get_constraint_columns(self, constraint_name):
+        """Returns the columns of a constraint ordered by position, or None when
+            the constraint is not owned by the schema
+
+            Args:
+                constraint_name (string): Name of the constraint
+        """
+        with self._lock:
+            table_name = self._constraints.get(constraint_name)
+            if table_name is None:
+                return None
+            return list(self._tables[table_name]['consColumns'].get(constraint_name, []))
+
+    def get_column_constraints(self, table_name, column_name):
+        """Returns the constraints of a table including the given column
+
+            Args:
+                table_name (string): Name of the table
+                column_name (string): Name of the column
+        """
+        with self._lock:
+            table = self._tables.get(table_name)
+            if table is None:
+                return []
+            return [dict(constraint) for constraint in table['constraints']
+                    if column_name in table['consColumns'].get(constraint['constraintName'], [])]
+
+    def get_column_indexes(self, table_name, column_name):
+        """Returns the indexes of a table including the given column
+
+            Args:
+                table_name (string): Name of the table
+                column_name (string): Name of the column
+        """
+        with self._lock:
+            table = self._tables.get(table_name)
+            if table is None:
+                return []
+            return [dict(index) for index in table['indexes']
+                    if column_name in table['indColumns'].get(index['indexName'], [])]
+
+    def get_stats(self):
+        """Returns the number of tables held by the snapshot and an estimate of
+            the memory it uses
+        """
+        with self._lock:
+            return {'tables': len(self._tables),
+                    'constraints': len(self._constraints),
+                    'bytes': get_memory_size(self._tables) + get_memory_size(self._constraints),
+                    'refreshes': self._refreshes,
+                    'loadedAt': self._loaded_at,
+                    'validated': self._validated,
+                    'path': self._path}
+
+
+class DependencyGraph(object):
+    """In-memory graph of the dependencies between the objects a schema can
+        see, read from public_dependency once and kept as adjacency lists
+        keyed by object_id in both directions, so that the closure of an
+        object is walked in process instead of with CONNECT BY.
+
+        Dependencies of objects owned by SYS and SYSTEM are not loaded: their
+        objects appear as leaves only. The graph is refreshed incrementally
+        with the objects whose LAST_DDL_TIME changed, and read again entirely
+        when objects were dropped
+    """
+
+    OBJECTS_QUERY = """
+            SELECT
+                object_id,
+                object_name,
+                owner,
+                object_type,
+                status
+            FROM sys.all_objects
+            WHERE
+                owner NOT IN ('SYS', 'SYSTEM')
+                %s
+            """
+
+    EDGES_QUERY = """
+            SELECT
+                d.object_id,
+                d.referenced_object_id,
+                r.object_name,
+                r.owner,
+                r.object_type,
+                r.status
+            FROM
+                public_dependency d,
+                sys.all_objects o,
+                sys.all_objects r
+            WHERE
+                o.object_id = d.object_id
+                AND r.object_id = d.referenced_object_id
+                AND o.owner NOT IN ('SYS', 'SYSTEM')
+                %s
+            """
+
+    PROBE_QUERY = """
+            SELECT
+                COUNT(*),
+                TO_CHAR(SYSDATE, 'YYYYMMDDHH24MISS'),
+                USER
+            FROM sys.all_objects
+            WHERE owner NOT IN ('SYS', 'SYSTEM')
+            """
+
+    _objects = None
+    _upstream = None
+    _downstream = None
+    _by_name = None
+    _user = None
+    _since = None
+    _checked_at = None
+    _check_interval = None
+    _refreshes = 0
+    _lock = None
+
+    def __init__(self, check_interval=5):
+        """Default constructor for DependencyGraph class
+
+            Args:
+                check_interval (int, optional): Seconds during which the graph is
+                    served without checking the schema for DDL changes
+        """
+        self._objects = {}
+        self._upstream = {}
+        self._downstream = {}
+        self._by_name = {}
+        self._check_interval = check_interval
+        self._refreshes = 0
+        self._lock = threading.RLock()
+
+    def refresh(self, db_conn):
+        """Loads the whole graph on the first call, then reads again the
+            dependencies of the objects compiled since the previous refresh.
+            The schema is checked at most once per check interval
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+        """
+        now = time.time()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self._check_interval:
+                return
+            self._checked_at = now
+            since = self._since
+        cursor = db_conn.cursor()
+        cursor.execute(self.PROBE_QUERY)
+        object_count, database_time, user = cursor.fetchone()
+        if since is None:
+            self._load(db_conn, database_time, user)
+            return
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(self.OBJECTS_QUERY % "AND last_ddl_time >= TO_DATE(:since, 'YYYYMMDDHH24MISS')",
+                       since=since)
+        changed = cursor.fetchall()
+        with self._lock:
+            for result in changed:
+                self._add_object(result[0], result[1:])
+            known = sum(1 for value in self._objects.values() if value[1] not in ('SYS', 'SYSTEM'))
+        if known != object_count:
+            self._load(db_conn, database_time, user)
+            return
+        object_ids = [result[0] for result in changed]
+        edges = []
+        for i in range(0, object_ids.__len__(), 500):
+            batch = object_ids[i:i + 500]
+            binds = dict(('o%d' % j, batch[j]) for j in range(0, batch.__len__()))
+            cursor = db_conn.cursor()
+            cursor.arraysize = 1000
+            cursor.execute(self.EDGES_QUERY % ('AND d.object_id IN (%s)' % ', '.join([':o%d' % j for j in range(0, batch.__len__())])),
+                           binds)
+            edges.extend(cursor.fetchall())
+        with self._lock:
+            for object_id in object_ids:
+                for referenced_id in self._upstream.pop(object_id, ()):
+                    self._downstream.get(referenced_id, set()).discard(object_id)
+            self._add_edges(edges)
+            self._since = database_time
+            self._refreshes += 1
+
+    def _load(self, db_conn, database_time, user):
+        """Reads the whole graph and replaces the one held
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                database_time (string): Time of the database the graph is read at
+                user (string): Name of the user the session is connected as
+        """
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(self.OBJECTS_QUERY % '')
+        objects = cursor.fetchall()
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(self.EDGES_QUERY % '')
+        edges = cursor.fetchall()
+        with self._lock:
+            self._objects = {}
+            self._upstream = {}
+            self._downstream = {}
+            self._by_name = {}
+            for result in objects:
+                self._add_object(result[0], result[1:])
+            self._add_edges(edges)
+            self._user = user
+            self._since = database_time
+            self._refreshes += 1
+
+    def _add_object(self, object_id, value):
+        """Adds or updates an object. Must be called with the lock held
+
+            Args:
+                object_id (int): Id of the object
+                value (tuple): Name, owner, type and status of the object
+        """
+        self._objects[object_id] = tuple(value)
+        self._by_name.setdefault(value[0], set()).add(object_id)
+
+    def _add_edges(self, edges):
+        """Adds the rows read with EDGES_QUERY. Must be called with the lock held
+
+            Args:
+                edges (list): Rows of EDGES_QUERY
+        """
+        for result in edges:
+            if result[1] not in self._objects:
+                self._add_object(result[1], result[2:])
+            self._upstream.setdefault(result[0], set()).add(result[1])
+            self._downstream.setdefault(result[1], set()).add(result[0])
+
+    def expire(self):
+        """Makes the next refresh check the schema whatever the check interval
+        """
+        with self._lock:
+            self._checked_at = None
+
+    def get_object_ids(self, object_name, object_type=None, own=True):
+        """Returns the ids of the objects of the given name
+
+            Args:
+                object_name (string): Name of the objects
+                object_type (string, optional): Only returns objects of this type
+                own (bool, optional): Only returns the objects of the connected user
+        """
+        with self._lock:
+            return [object_id for object_id in self._by_name.get(object_name, ())
+                    if (object_type is None or self._objects[object_id][2] == object_type) and
+                    (not own or self._objects[object_id][1] == self._user)]
+
+    def get_object(self, object_id):
+        """Returns the id, name, owner, type and status of an object as a dict
+
+            Args:
+                object_id (int): Id of the object
+        """
+        with self._lock:
+            value = self._objects.get(object_id)
+        if value is None:
+            return None
+        return {'objectId': object_id,
+                'name': value[0],
+                'owner': value[1],
+                'type': value[2],
+                'status': value[3]}
+
+    def get_edges(self, object_ids, direction='upstream', own=True):
+        """Returns the direct dependencies between the given objects and the
+            objects they depend on, or the objects depending on them, as pairs
+            of (dependent, referenced) objects
+
+            Args:
+                object_ids (list): Ids of the objects
+                direction (string, optional): 'upstream' for the objects the given
+                    ones depend on, 'downstream' for the objects depending on them
+                own (bool, optional): Only returns the dependencies whose dependent
+                    object belongs to the connected user
+        """
+        adjacency = self._upstream if direction == 'upstream' else self._downstream
+        with self._lock:
+            pairs = []
+            for object_id in object_ids:
+                for other_id in adjacency.get(object_id, ()):
+                    if direction == 'upstream':
+                        pair = (object_id, other_id)
+                    else:
+                        pair = (other_id, object_id)
+                    if not own or self._objects.get(pair[0], (None, None))[1] == self._user:
+                        pairs.append(pair)
+        return [(self.get_object(dependent_id), self.get_object(referenced_id))
+                for dependent_id, referenced_id in pairs]
+
+    def get_dependency_records(self, object_name, direction='upstream'):
+        """Returns the direct dependencies of the objects of the connected user of
+            the given name, or the dependencies on any object of that name, as the
+            rows of user_dependencies would
+
+            Args:
+                object_name (string): Name of the objects
+                direction (string, optional): 'upstream' for the objects they depend
+                    on, 'downstream' for the objects depending on them
+        """
+        object_ids = self.get_object_ids(object_name, own=direction == 'upstream')
+        result_array = []
+        for dependent, referenced in self.get_edges(object_ids, direction):
+            if dependent is None or referenced is None:
+                continue
+            result_array.append({'recid': result_array.__len__() + 1,
+                                 'name': dependent['name'],
+                                 'type': dependent['type'],
+                                 'referencedOwner': referenced['owner'],
+                                 'referencedName': referenced['name'],
+                                 'referencedType': referenced['type']
+                                 })
+        return result_array
+
+    def closure(self, object_ids, direction='upstream', max_depth=None):
+        """Returns the objects the given ones depend on, or the objects depending
+            on them, directly or not, walked breadth first. Every object is
+            returned once, with the level it was first reached at, so cycles
+            end the walk
+
+            Args:
+                object_ids (list): Ids of the objects to start from
+                direction (string, optional): 'upstream' or 'downstream'
+                max_depth (int, optional): Number of levels to walk, all by default
+        """
+        adjacency = self._upstream if direction == 'upstream' else self._downstream
+        visited = set(object_ids)
+        queue = collections.deque((object_id, 0) for object_id in object_ids)
+        reached = []
+        with self._lock:
+            while queue.__len__() > 0:
+                object_id, level = queue.popleft()
+                if max_depth is not None and level >= max_depth:
+                    continue
+                for other_id in adjacency.get(object_id, ()):
+                    if other_id in visited:
+                        continue
+                    visited.add(other_id)
+                    reached.append((other_id, level + 1))
+                    queue.append((other_id, level + 1))
+        result_array = []
+        for object_id, level in reached:
+            value = self.get_object(object_id)
+            if value is not None:
+                value['level'] = level
+                result_array.append(value)
+        return result_array
+
+    def get_stats(self):
+        """Returns the number of objects and dependencies held by the graph and an
+            estimate of the memory it uses
+        """
+        with self._lock:
+            return {'objects': len(self._objects),
+                    'dependencies': sum(len(value) for value in self._upstream.values()),
+                    'bytes': (get_memory_size(self._objects) + get_memory_size(self._upstream) +
+                              get_memory_size(self._downstream) + get_memory_size(self._by_name)),
+                    'refreshes': self._refreshes}
+
+
+class ServerCapabilities(object):
+    """Version and optional SQL features of a database server, read once per
+        pool so that the handlers pick the query variant suited to the server
+        without asking the database for its version on every event
+    """
+
+    FEATURES = (('listagg', (11, 2), "SELECT LISTAGG(dummy, ',') WITHIN GROUP (ORDER BY dummy) FROM dual"),
+                ('identityColumns', (12, 1), "SELECT COUNT(*) FROM SYS.user_tab_identity_cols WHERE 1 = 0"),
+                ('fetchFirst', (12, 1), "SELECT dummy FROM dual FETCH FIRST 1 ROWS ONLY"),
+                ('json', (12, 1), "SELECT dummy FROM dual WHERE '{}' IS JSON"),
+                ('approxCount', (12, 1), "SELECT APPROX_COUNT_DISTINCT(dummy) FROM dual"))
+
+    version = None
+    features = None
+    db_id = None
+
+    def __init__(self, version, features=None, db_id=None):
+        """Default constructor for ServerCapabilities class
+
+            Args:
+                version (string): Version of the server as in Connection.version
+                features (dict, optional): Name of each feature mapped to True when
+                    the server supports it
+                db_id (string, optional): DBID of the database
+        """
+        self.version = tuple(int(part) for part in version.split('.') if part.isdigit())
+        self.features = dict(features or {})
+        self.db_id = db_id
+
+    @classmethod
+    def probe(cls, db_conn):
+        """Returns the capabilities of the server the given session is connected
+            to. The features the version may support are checked with a single
+            query, then one by one only when that query fails
+
+            Args:
+                db_conn (Connection): Session connected to the server
+        """
+        capabilities = cls(db_conn.version)
+        cursor = db_conn.cursor()
+        try:
+            cursor.execute("SELECT SYS_CONTEXT('USERENV', 'DBID') FROM dual")
+            capabilities.db_id = cursor.fetchone()[0]
+        except cx_Oracle.DatabaseError:
+            pass
+        candidates = [feature for feature in cls.FEATURES if capabilities.version >= feature[1]]
+        for name, min_version, query in cls.FEATURES:
+            capabilities.features[name] = False
+        if candidates.__len__() == 0:
+            return capabilities
+        cursor = db_conn.cursor()
+        try:
+            cursor.execute('SELECT %s FROM dual' % ', '.join(['(%s)' % query for name, min_version, query in candidates]))
+            cursor.fetchall()
+            for name, min_version, query in candidates:
+                capabilities.features[name] = True
+            return capabilities
+        except cx_Oracle.DatabaseError:
+            pass
+        for name, min_version, query in candidates:
+            cursor = db_conn.cursor()
+            try:
+                cursor.execute(query)
+                cursor.fetchall()
+                capabilities.features[name] = True
+            except cx_Oracle.DatabaseError:
+                capabilities.features[name] = False
+        return capabilities
+
+    def supports(self, feature):
+        """Returns True if the server supports the given feature
+
+            Args:
+                feature (string): Name of the feature, see FEATURES
+        """
+        return self.features.get(feature, False)
+
+    def to_dict(self):
+        """Returns the capabilities as sent to the clients
+        """
+        result = dict(self.features)
+        result['version'] = '.'.join([str(part) for part in self.version])
+        return result
+
+
+class SingleFlight(object):
+    """Shares one call between the identical requests made while it is in
+        flight: the first request runs the call, the ones arriving before it
+        returns wait for it and get its result instead of running it again
+    """
+
+    _calls = None
+    _lock = None
+    _stats = None
+
+    def __init__(self):
+        """Default constructor for SingleFlight class
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'shared': 0, 'maxWaiters': 0}
+
+    def do(self, key, function):
+        """Returns the result of the call of the given key and True if the current
+            thread made the call, False if it waited for the thread making it.
+            An exception raised by the call is raised in the waiting threads too
+
+            Args:
+                key (tuple): Identifies the identical requests
+                function (function): The call, made without arguments
+        """
+        owner = False
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call['waiters'] += 1
+                self._stats['shared'] += 1
+                self._stats['maxWaiters'] = max(self._stats['maxWaiters'], call['waiters'])
+            else:
+                call = {'done': threading.Event(), 'waiters': 0, 'result': None, 'error': None}
+                self._calls[key] = call
+                self._stats['calls'] += 1
+                owner = True
+        if not owner:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], False
+        try:
+            call['result'] = function()
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result'], True
+
+    def get_stats(self):
+        """Returns the number of calls made, of requests that shared the call of
+            another one and of calls currently in flight
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['inFlight'] = self._calls.__len__()
+        return stats
+
+
+class PlanService(object):
+    """Reads the execution plans of the statements of the worksheet, either
+        explained into the plan table of the session or, for queries, as run
+        with gather_plan_statistics so that the actual rows of each step can be
+        compared with the estimated ones.
+
+        The rows an explain writes to the plan table are deleted once read.
+        Explained plans are cached per pool and schema by SQL_ID, along with
+        their plan hash value, so that explaining the same text again costs no
+        round trip until the TTL expires. The last plans read for each text are
+        kept as its history, which compare() diffs to spot regressions
+    """
+
+    SQL_ID_ALPHABET = '0123456789abcdfghjkmnpqrstuvwxyz'
+
+    PLAN_HASH_PATTERN = re.compile(r'<info type="plan_hash"[^>]*>(\d+)</info>')
+
+    PLAN_QUERY = """
+            SELECT
+                ROWNUM,
+                p.operation,
+                p.options,
+                p.object_name,
+                p.object_type,
+                p.id,
+                p.parent_id,
+                p.cost,
+                p.cardinality,
+                DBMS_LOB.SUBSTR(p.other_xml, 4000, 1),
+                p.access_predicates
+            FROM plan_table p
+            WHERE p.statement_id = :statement_id
+            AND p.plan_id = (SELECT MAX(plan_id) FROM plan_table WHERE statement_id = :statement_id)
+            ORDER BY p.id
+            """
+
+    DISPLAY_QUERY = """
+            SELECT plan_table_output
+            FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', :statement_id, 'TYPICAL'))
+            """
+
+    CURSOR_QUERY = """
+            SELECT
+                prev_sql_id,
+                prev_child_number
+            FROM v$session
+            WHERE sid = SYS_CONTEXT('USERENV', 'SID')
+            """
+
+    STATISTICS_QUERY = """
+            SELECT
+                p.id + 1,
+                p.operation,
+                p.options,
+                p.object_name,
+                p.object_type,
+                p.id,
+                p.parent_id,
+                p.cost,
+                p.cardinality,
+                p.plan_hash_value,
+                p.access_predicates,
+                p.last_starts,
+                p.last_output_rows,
+                p.last_elapsed_time,
+                p.last_cr_buffer_gets
+            FROM v$sql_plan_statistics_all p
+            WHERE p.sql_id = :sql_id
+            AND p.child_number = :child_number
+            ORDER BY p.id
+            """
+
+    DISPLAY_CURSOR_QUERY = """
+            SELECT plan_table_output
+            FROM TABLE(DBMS_XPLAN.DISPLAY_CURSOR(:sql_id, :child_number, 'ALLSTATS LAST'))
+            """
+
+    CURSOR_PLANS_QUERY = """
+            SELECT
+                child_number,
+                plan_hash_value,
+                executions,
+                elapsed_time,
+                TO_CHAR(last_active_time, 'YYYY-MM-DD HH24:MI:SS')
+            FROM v$sql
+            WHERE sql_id = :sql_id
+            ORDER BY last_active_time DESC
+            """
+
+    _entries = None
+    _history = None
+    _history_size = None
+    _next_plan_id = 1
+    _ttl = None
+    _max_entries = None
+    _stats = None
+    _lock = None
+
+    def __init__(self, ttl=300, max_entries=256, history_size=10):
+        """Default constructor for PlanService class
+
+            Args:
+                ttl (int, optional): Seconds after which a statement is explained again
+                max_entries (int, optional): Maximum number of cached plans, and of
+                    statements whose history is kept
+                history_size (int, optional): Number of plans kept per statement
+        """
+        self._entries = collections.OrderedDict()
+        self._history = collections.OrderedDict()
+        self._history_size = history_size
+        self._next_plan_id = 1
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._stats = {'hits': 0,
+                       'misses': 0,
+                       'explains': 0,
+                       'runs': 0,
+                       'evictions': 0}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def get_sql_id(cls, sql):
+        """Returns the SQL_ID Oracle gives to the text of a statement: the last
+            64 bits of the MD5 of the text, written in base 32
+
+            Args:
+                sql (string): Text of the statement
+        """
+        digest = hashlib.md5(sql.encode('utf-8') + b'\x00').digest()
+        value = (int.from_bytes(digest[8:12], 'little') << 32) + int.from_bytes(digest[12:16], 'little')
+        sql_id = ''
+        for i in range(0, 13):
+            sql_id = cls.SQL_ID_ALPHABET[value % 32] + sql_id
+            value //= 32
+        return sql_id
+
+    @classmethod
+    def is_query(cls, sql):
+        """Returns True if the statement is a query, which can be run to gather
+            the actual rows of its plan without changing any data
+
+            Args:
+                sql (string): Text of the statement
+        """
+        text = re.sub(r'^(\s+|--[^\n]*\n?|/\*.*?\*/)+', '', sql, flags=re.S)
+        return re.match(r'(SELECT|WITH)\b', text, re.I) is not None
+
+    @classmethod
+    def add_hint(cls, sql, hint):
+        """Adds a hint to the first query block of a query, next to the hints it
+            already has since Oracle only reads the first hint comment
+
+            Args:
+                sql (string): Text of the query
+                hint (string): The hint, like 'gather_plan_statistics'
+        """
+        match = re.search(r'\bSELECT\b(\s*/\*\+)?', sql, re.I)
+        if match is None:
+            return sql
+        if match.group(1):
+            return sql[:match.end()] + ' ' + hint + sql[match.end():]
+        return sql[:match.end()] + ' /*+ ' + hint + ' */' + sql[match.end():]
+
+    def explain(self, db_conn, owner_key, sql, refresh=False):
+        """Returns the plan of a statement explained into the plan table, read
+            from the cache when the same text was explained in the schema before
+
+            Args:
+                db_conn (Connection): Session used to explain the statement
+                owner_key (tuple): Identifies the pool and the schema
+                sql (string): Text of the statement
+                refresh (bool, optional): Explains the statement even if cached
+        """
+        sql = sql.strip().rstrip(';')
+        sql_id = self.get_sql_id(sql)
+        key = owner_key + (sql_id,)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if not refresh and entry is not None and now - entry['loadedAt'] < self._ttl:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                plan = dict(entry['plan'])
+                plan['cached'] = True
+                return plan
+            self._stats['misses'] += 1
+        statement_id = 'PLAN%016x' % random.getrandbits(64)
+        cursor = db_conn.cursor()
+        cursor.execute("EXPLAIN PLAN SET STATEMENT_ID = '%s' FOR %s" % (statement_id, sql))
+        try:
+            cursor = db_conn.cursor()
+            cursor.execute(self.PLAN_QUERY, statement_id=statement_id)
+            rows = []
+            plan_hash_value = None
+            for result in cursor:
+                match = self.PLAN_HASH_PATTERN.search(result[9] or '')
+                if match is not None and plan_hash_value is None:
+                    plan_hash_value = int(match.group(1))
+                rows.append({'recid': result[0],
+                             'operation': result[1],
+                             'options': result[2],
+                             'objectName': result[3],
+                             'objectType': result[4],
+                             'id': result[5],
+                             'parentId': result[6],
+                             'cost': result[7],
+                             'cardinality': result[8],
+                             'otherXml': result[9],
+                             'accessPredicates': result[10]})
+            cursor = db_conn.cursor()
+            cursor.execute(self.DISPLAY_QUERY, statement_id=statement_id)
+            text = [result[0] for result in cursor]
+        finally:
+            cursor = db_conn.cursor()
+            cursor.execute("DELETE FROM plan_table WHERE statement_id = :statement_id", statement_id=statement_id)
+        plan = {'mode': 'explain',
+                'sqlId': sql_id,
+                'planHashValue': plan_hash_value,
+                'rows': rows,
+                'text': text,
+                'explainedAt': now}
+        with self._lock:
+            self._stats['explains'] += 1
+            self._entries[key] = {'plan': plan, 'loadedAt': now}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+            self._record(key, plan)
+        plan = dict(plan)
+        plan['cached'] = False
+        return plan
+
+    def _record(self, key, plan):
+        """Adds a plan to the history of its statement, giving it an id. Must be
+            called with the lock held
+
+            Args:
+                key (tuple): Identifies the pool, the schema and the statement
+                plan (dict): The plan as returned by explain() or run()
+        """
+        plan['planId'] = self._next_plan_id
+        self._next_plan_id += 1
+        history = self._history.get(key)
+        if history is None:
+            history = collections.deque(maxlen=self._history_size)
+            self._history[key] = history
+        history.append(plan)
+        self._history.move_to_end(key)
+        while len(self._history) > self._max_entries:
+            self._history.popitem(last=False)
+
+    def get_history(self, owner_key, sql):
+        """Returns the plans read for a statement, the oldest first
+
+            Args:
+                owner_key (tuple): Identifies the pool and the schema
+                sql (string): Text of the statement
+        """
+        with self._lock:
+            return list(self._history.get(owner_key + (self.get_sql_id(sql.strip().rstrip(';')),), []))
+
+    def get_cursor_plans(self, db_conn, sql_id):
+        """Returns the plan hash value of each child cursor of a statement in the
+            shared pool, the most recently used first, or None when v$sql cannot
+            be read by the user
+
+            Args:
+                db_conn (Connection): Session used to read v$sql
+                sql_id (string): SQL_ID of the statement
+        """
+        cursor = db_conn.cursor()
+        try:
+            cursor.execute(self.CURSOR_PLANS_QUERY, sql_id=sql_id)
+        except cx_Oracle.DatabaseError as e:
+            print("Error while reading v$sql: " + str(e))
+            return None
+        return [{'childNumber': result[0],
+                 'planHashValue': result[1],
+                 'executions': result[2],
+                 'elapsedTime': result[3] / 1000.0 if result[3] is not None else None,
+                 'lastActiveTime': result[4]} for result in cursor]
+
+    @classmethod
+    def get_plan_nodes(cls, plan):
+        """Returns the steps of a plan in execution plan order with their depth
+
+            Args:
+                plan (dict): The plan as returned by explain() or run()
+        """
+        depths = {}
+        nodes = []
+        for row in plan['rows']:
+            depth = depths.get(row['parentId'], -1) + 1
+            depths[row['id']] = depth
+            node = {'id': row['id'],
+                    'depth': depth,
+                    'operation': row['operation'],
+                    'options': row['options'],
+                    'objectName': row['objectName'],
+                    'cardinality': row['cardinality'],
+                    'cost': row['cost']}
+            if 'actualRows' in row:
+                node['actualRows'] = row['actualRows']
+            nodes.append(node)
+        return nodes
+
+    @classmethod
+    def compare(cls, left, right, cardinality_ratio=10, cost_ratio=1.5):
+        """Diffs two plans of a statement step by step and lists the changes that
+            are likely regressions: full scans of tables the other plan read
+            through an index, cartesian joins, cardinalities off by more than the
+            given ratio and a total cost growing by more than the given ratio
+
+            Args:
+                left (dict): The plan compared against, usually the older one
+                right (dict): The plan compared, usually the newer one
+                cardinality_ratio (float, optional): Ratio between the cardinalities
+                    of a step flagged as a jump
+                cost_ratio (float, optional): Ratio between the total costs flagged
+                    as an increase
+        """
+        left_nodes = cls.get_plan_nodes(left)
+        right_nodes = cls.get_plan_nodes(right)
+
+        # Steps are aligned on their depth, operation, options and object. The steps
+        # left unaligned are aligned again on their operation and object, to pair
+        # the steps that moved or changed access path, then on their depth and
+        # operation, to pair the steps that changed object
+        signatures = (lambda node: (node['depth'], node['operation'], node['options'], node['objectName']),
+                      lambda node: (node['operation'], node['objectName']),
+                      lambda node: (node['depth'], node['operation']))
+
+        def align(left_steps, right_steps, level):
+            matcher = difflib.SequenceMatcher(None, [signatures[level](node) for node in left_steps],
+                                              [signatures[level](node) for node in right_steps], autojunk=False)
+            pairs = []
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == 'equal':
+                    pairs.extend(zip(left_steps[i1:i2], right_steps[j1:j2]))
+                elif tag == 'replace' and level + 1 < signatures.__len__():
+                    pairs.extend(align(left_steps[i1:i2], right_steps[j1:j2], level + 1))
+                else:
+                    pairs.extend((left_node, None) for left_node in left_steps[i1:i2])
+                    pairs.extend((None, right_node) for right_node in right_steps[j1:j2])
+            return pairs
+
+        nodes = []
+        regressions = []
+        for left_node, right_node in align(left_nodes, right_nodes, 0):
+            if right_node is None:
+                nodes.append({'status': 'removed', 'left': left_node, 'right': None, 'changes': {}})
+                continue
+            if left_node is None:
+                nodes.append({'status': 'added', 'left': None, 'right': right_node, 'changes': {}})
+                continue
+            changes = {}
+            for field in ('depth', 'operation', 'options', 'objectName', 'cardinality', 'cost'):
+                if left_node[field] != right_node[field]:
+                    changes[field] = [left_node[field], right_node[field]]
+            nodes.append({'status': 'same' if changes.__len__() == 0 else 'changed',
+                          'left': left_node,
+                          'right': right_node,
+                          'changes': changes})
+            if left_node['cardinality'] is None or right_node['cardinality'] is None:
+                continue
+            low, high = sorted([left_node['cardinality'], right_node['cardinality']])
+            if high >= max(low, 1) * cardinality_ratio:
+                regressions.append({'type': 'cardinalityJump',
+                                    'leftId': left_node['id'],
+                                    'rightId': right_node['id'],
+                                    'objectName': right_node['objectName'],
+                                    'message': 'Cardinality of step %d went from %s to %s'
+                                               % (right_node['id'], left_node['cardinality'],
+                                                  right_node['cardinality'])})
+
+        def get_scans(plan_nodes, indexed):
+            objects = set()
+            for node in plan_nodes:
+                if node['operation'] == 'TABLE ACCESS' and (node['options'] or '').startswith('BY ') == indexed:
+                    objects.add(node['objectName'])
+            return objects
+
+        for object_name in sorted(get_scans(right_nodes, False) & get_scans(left_nodes, True) - get_scans(left_nodes, False)):
+            regressions.append({'type': 'fullScan',
+                                'objectName': object_name,
+                                'message': 'Table %s is read with a full scan instead of through an index' % object_name})
+        if any(node['operation'] == 'MERGE JOIN' and node['options'] == 'CARTESIAN' for node in right_nodes) and \
+                not any(node['operation'] == 'MERGE JOIN' and node['options'] == 'CARTESIAN' for node in left_nodes):
+            regressions.append({'type': 'cartesianJoin',
+                                'message': 'The plan now joins with a cartesian product'})
+        left_cost = left_nodes[0]['cost'] if left_nodes.__len__() > 0 else None
+        right_cost = right_nodes[0]['cost'] if right_nodes.__len__() > 0 else None
+        if left_cost is not None and right_cost is not None and right_cost > max(left_cost, 1) * cost_ratio:
+            regressions.append({'type': 'costIncrease',
+                                'message': 'Total cost went from %s to %s' % (left_cost, right_cost)})
+        return {'nodes': nodes,
+                'regressions': regressions,
+                'samePlan': left.get('planHashValue') is not None
+                and left.get('planHashValue') == right.get('planHashValue')}
+
+    def run(self, db_conn, owner_key, sql):
+        """Runs a query with gather_plan_statistics, fetching all its rows, and
+            returns its plan as found in the cursor cache with the estimated and
+            the actual rows of each step
+
+            Args:
+                db_conn (Connection): Session used to run the query
+                owner_key (tuple): Identifies the pool and the schema
+                sql (string): Text of the query
+        """
+        sql = sql.strip().rstrip(';')
+        if not self.is_query(sql):
+            raise ValueError('Only queries can be run to gather the actual rows of their plan')
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(self.add_hint(sql, 'gather_plan_statistics'))
+        fetched_rows = 0
+        while True:
+            rows = cursor.fetchmany()
+            if rows.__len__() == 0:
+                break
+            fetched_rows += rows.__len__()
+        cursor.close()
+        cursor = db_conn.cursor()
+        cursor.execute(self.CURSOR_QUERY)
+        sql_id, child_number = cursor.fetchone()
+        cursor = db_conn.cursor()
+        cursor.execute(self.STATISTICS_QUERY, sql_id=sql_id, child_number=child_number)
+        rows = []
+        plan_hash_value = None
+        for result in cursor:
+            plan_hash_value = result[9]
+            rows.append({'recid': result[0],
+                         'operation': result[1],
+                         'options': result[2],
+                         'objectName': result[3],
+                         'objectType': result[4],
+                         'id': result[5],
+                         'parentId': result[6],
+                         'cost': result[7],
+                         'cardinality': result[8],
+                         'accessPredicates': result[10],
+                         'starts': result[11],
+                         'actualRows': result[12],
+                         'actualTime': result[13] / 1000.0 if result[13] is not None else None,
+                         'buffers': result[14]})
+        cursor = db_conn.cursor()
+        cursor.execute(self.DISPLAY_CURSOR_QUERY, sql_id=sql_id, child_number=child_number)
+        text = [result[0] for result in cursor]
+        plan = {'mode': 'actual',
+                'sqlId': sql_id,
+                'childNumber': child_number,
+                'planHashValue': plan_hash_value,
+                'rows': rows,
+                'text': text,
+                'fetchedRows': fetched_rows,
+                'explainedAt': time.time(),
+                'cached': False}
+        with self._lock:
+            self._stats['runs'] += 1
+            self._record(owner_key + (self.get_sql_id(sql),), plan)
+        return dict(plan)
+
+    def get_stats(self):
+        """Returns the hit and miss counters of the plan cache
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        stats['ttl'] = self._ttl
+        stats['maxEntries'] = self._max_entries
+        return stats
+
+
+class SessionStatistics(object):
+    """Statistics, I/O and non-idle waits of the current session as read from
+        v$mystat, v$sess_io and v$session_event with a single query. The
+        difference between the snapshots taken before and after a statement
+        tells what the statement cost the database
+    """
+
+    STATISTICS = (('session logical reads', 'logicalReads'),
+                  ('physical reads', 'physicalReads'),
+                  ('redo size', 'redoSize'),
+                  ('sorts (memory)', 'memorySorts'),
+                  ('sorts (disk)', 'diskSorts'),
+                  ('sorts (rows)', 'sortedRows'),
+                  ('parse count (total)', 'parses'),
+                  ('parse count (hard)', 'hardParses'),
+                  ('execute count', 'executions'),
+                  ('CPU used by this session', 'cpuTime'),
+                  ('DB time', 'dbTime'),
+                  ('SQL*Net roundtrips to/from client', 'roundTrips'),
+                  ('bytes sent via SQL*Net to client', 'bytesSent'))
+
+    CENTISECOND_STATISTICS = ('cpuTime', 'dbTime')
+
+    IO_COLUMNS = (('block_gets', 'blockGets'),
+                  ('consistent_gets', 'consistentGets'),
+                  ('physical_reads', 'physicalReads'),
+                  ('block_changes', 'blockChanges'),
+                  ('consistent_changes', 'consistentChanges'))
+
+    QUERY = """
+            SELECT
+                'STAT',
+                n.name,
+                m.value,
+                CAST(NULL AS NUMBER)
+            FROM v$mystat m,
+                v$statname n
+            WHERE
+                m.statistic# = n.statistic#
+                AND n.name IN ('session logical reads', 'physical reads', 'redo size', 'sorts (memory)',
+                               'sorts (disk)', 'sorts (rows)', 'parse count (total)', 'parse count (hard)',
+                               'execute count', 'CPU used by this session', 'DB time',
+                               'SQL*Net roundtrips to/from client', 'bytes sent via SQL*Net to client')
+            UNION ALL
+            SELECT
+                'IO',
+                'blockGets',
+                block_gets,
+                CAST(NULL AS NUMBER)
+            FROM v$sess_io
+            WHERE sid = SYS_CONTEXT('USERENV', 'SID')
+            UNION ALL
+            SELECT
+                'IO',
+                'consistentGets',
+                consistent_gets,
+                CAST(NULL AS NUMBER)
+            FROM v$sess_io
+            WHERE sid = SYS_CONTEXT('USERENV', 'SID')
+            UNION ALL
+            SELECT
+                'IO',
+                'physicalReads',
+                physical_reads,
+                CAST(NULL AS NUMBER)
+            FROM v$sess_io
+            WHERE sid = SYS_CONTEXT('USERENV', 'SID')
+            UNION ALL
+            SELECT
+                'IO',
+                'blockChanges',
+                block_changes,
+                CAST(NULL AS NUMBER)
+            FROM v$sess_io
+            WHERE sid = SYS_CONTEXT('USERENV', 'SID')
+            UNION ALL
+            SELECT
+                'IO',
+                'consistentChanges',
+                consistent_changes,
+                CAST(NULL AS NUMBER)
+            FROM v$sess_io
+            WHERE sid = SYS_CONTEXT('USERENV', 'SID')
+            UNION ALL
+            SELECT
+                'WAIT',
+                e.event,
+                e.total_waits,
+                e.time_waited_micro
+            FROM v$session_event e
+            WHERE
+                e.sid = SYS_CONTEXT('USERENV', 'SID')
+                AND e.wait_class <> 'Idle'
+            """
+
+    statistics = None
+    io = None
+    waits = None
+    taken_at = None
+
+    def __init__(self, statistics=None, io=None, waits=None):
+        """Default constructor for SessionStatistics class
+
+            Args:
+                statistics (dict, optional): Value of each statistic, by key
+                io (dict, optional): Value of each v$sess_io column, by key
+                waits (dict, optional): Number of waits and microseconds waited,
+                    by wait event
+        """
+        self.statistics = dict(statistics or {})
+        self.io = dict(io or {})
+        self.waits = dict(waits or {})
+        self.taken_at = time.time()
+
+    @classmethod
+    def take(cls, db_conn):
+        """Returns a snapshot of the statistics of the session
+
+            Args:
+                db_conn (Connection): The session
+        """
+        keys = dict(cls.STATISTICS)
+        snapshot = cls()
+        cursor = db_conn.cursor()
+        cursor.arraysize = 200
+        cursor.execute(cls.QUERY)
+        for result in cursor:
+            if result[0] == 'STAT':
+                snapshot.statistics[keys[result[1]]] = result[2]
+            elif result[0] == 'IO':
+                snapshot.io[result[1]] = result[2]
+            else:
+                snapshot.waits[result[1]] = (result[2], result[3])
+        return snapshot
+
+    def diff(self, later, top_waits=5):
+        """Returns what happened in the session between this snapshot and a later
+            one: the increase of each statistic, with the times in milliseconds,
+            and the wait events the session waited on the longest
+
+            Args:
+                later (SessionStatistics): The later snapshot
+                top_waits (int, optional): Number of wait events returned
+        """
+        result = {}
+        for name, key in self.STATISTICS:
+            value = later.statistics.get(key, 0) - self.statistics.get(key, 0)
+            result[key] = value * 10 if key in self.CENTISECOND_STATISTICS else value
+        result['io'] = dict((key, later.io.get(key, 0) - self.io.get(key, 0)) for column, key in self.IO_COLUMNS)
+        waits = []
+        for event, (count, waited) in later.waits.items():
+            before = self.waits.get(event, (0, 0))
+            if count - before[0] > 0:
+                waits.append({'event': event,
+                              'waits': count - before[0],
+                              'timeWaited': (waited - before[1]) / 1000.0})
+        result['waits'] = heapq.nlargest(top_waits, waits, key=lambda wait: wait['timeWaited'])
+        result['elapsedTime'] = int((later.taken_at - self.taken_at) * 1000)
+        return result
+
+
+class ProgressMonitor(object):
+    """Reads the progress of a statement running in another session of the
+        pool: its current plan line and wait event from v$session and the
+        share of work done and time remaining of its long operation from
+        v$session_longops. The running session is found by the ACTION it
+        was tagged with, set on the connection so that tagging it costs no
+        round trip.
+
+        v$sql_monitor and v$sql_plan_monitor, part of the Tuning Pack, are
+        only read when the license allows it
+    """
+
+    SESSION_QUERY = """
+            SELECT
+                s.sid,
+                s.sql_id,
+                s.sql_plan_line_id,
+                s.sql_plan_operation,
+                s.sql_plan_options,
+                s.event,
+                l.opname,
+                l.target,
+                l.sofar,
+                l.totalwork,
+                l.units,
+                l.time_remaining,
+                l.elapsed_seconds
+            FROM v$session s
+            LEFT JOIN v$session_longops l
+                ON l.sid = s.sid
+                AND l.serial# = s.serial#
+                AND l.sql_exec_id = s.sql_exec_id
+                AND l.sofar < l.totalwork
+            WHERE s.action = :action
+            ORDER BY l.last_update_time DESC NULLS LAST
+            """
+
+    MONITOR_QUERY = """
+            SELECT
+                m.elapsed_time,
+                m.cpu_time,
+                m.buffer_gets,
+                m.disk_reads,
+                p.output_rows
+            FROM v$sql_monitor m
+            LEFT JOIN v$sql_plan_monitor p
+                ON p.key = m.key
+                AND p.plan_line_id = :plan_line_id
+            WHERE
+                m.sid = :sid
+                AND m.sql_id = :sql_id
+                AND m.status = 'EXECUTING'
+            ORDER BY m.sql_exec_start DESC
+            """
+
+    @classmethod
+    def get_action(cls):
+        """Returns a new ACTION to tag the session running a statement with
+        """
+        return 'SQL:%016x' % random.getrandbits(64)
+
+    @classmethod
+    def poll(cls, db_conn, action, sql_monitor=False):
+        """Returns the progress of the statement run by the session tagged with
+            the given ACTION, or None when no session is tagged with it anymore
+
+            Args:
+                db_conn (Connection): Session used to read the progress, not the
+                    one running the statement
+                action (string): ACTION the running session was tagged with
+                sql_monitor (bool, optional): Also reads v$sql_monitor
+        """
+        cursor = db_conn.cursor()
+        cursor.execute(cls.SESSION_QUERY, action=action)
+        result = cursor.fetchone()
+        if result is None:
+            return None
+        progress = {'sqlId': result[1],
+                    'planLineId': result[2],
+                    'operation': ' '.join([part for part in (result[3], result[4]) if part]) or None,
+                    'event': result[5],
+                    'opname': result[6],
+                    'target': result[7],
+                    'percentDone': round(result[8] * 100.0 / result[9], 1) if result[9] else None,
+                    'units': result[10],
+                    'timeRemaining': result[11],
+                    'elapsedSeconds': result[12],
+                    'monitor': None}
+        if sql_monitor and result[1] is not None:
+            cursor = db_conn.cursor()
+            cursor.execute(cls.MONITOR_QUERY, sid=result[0], sql_id=result[1], plan_line_id=result[2])
+            monitor = cursor.fetchone()
+            if monitor is not None:
+                progress['monitor'] = {'elapsedTime': monitor[0] / 1000.0 if monitor[0] is not None else None,
+                                       'cpuTime': monitor[1] / 1000.0 if monitor[1] is not None else None,
+                                       'bufferGets': monitor[2],
+                                       'diskReads': monitor[3],
+                                       'planLineRows': monitor[4]}
+        return progress
+
+
+@metered_handlers
 class DatabaseConnectionServer(Namespace):
     """DatabaseConnection class provides methods to connect to Oracle DB
-    and provides the connection instance to be used by other classes
+    and provides the connection instance to be used by other classes.
+
+    Connections are served from a cx_Oracle.SessionPool: every websocket
+    event acquires a session through acquire() and hands it back with
+    release() once the event has been handled.
+
+    Each websocket client gets its own ClientSession holding its credentials,
+    schema and transaction. Sessions are evicted once the client disconnects
+    from every namespace or stays idle longer than the configured timeout
     """
 
-    _connection_string = None
-    _username = None
-    _password = None
-    _db = None
+    _pools = None
+    _capabilities = None
+    _clients = None
+    _pool_min = None
+    _pool_max = None
+    _pool_increment = None
+    _pool_wait_timeout = None
+    _stmt_cache_size = None
+    _call_timeout = None
+    _executor = None
+    _task_executor = None
+    _single_flight = None
+    _pool_stats = None
+    _pool_lock = None
+    _client_idle_timeout = None
+    _client_eviction_interval = None
+    _local = None
     _socket_io = None
     _namespace_url = None
     _logger = None
 
-    def __init__(self, socket_io):
+    def __init__(self, socket_io, pool_min=1, pool_max=10, pool_increment=1, pool_wait_timeout=10000,
+                 client_idle_timeout=1800, client_eviction_interval=60, stmt_cache_size=50,
+                 call_timeout=0, handler_workers=8, task_workers=4):
         """Default constructor for DatabaseConnectionServer class
 
             Args:
                 socket_io (SocketIO, required): An instance of SocketIO class
+                pool_min (int, optional): Number of sessions opened when the pool is created
+                pool_max (int, optional): Maximum number of sessions the pool can open
+                pool_increment (int, optional): Number of sessions opened each time the pool grows
+                pool_wait_timeout (int, optional): Milliseconds to wait for a free session
+                    before acquire() gives up
+                client_idle_timeout (int, optional): Seconds of inactivity after which the
+                    session of a client is evicted
+                client_eviction_interval (int, optional): Seconds between two checks for
+                    idle clients
+                stmt_cache_size (int, optional): Number of parsed statements each pooled
+                    session keeps cached for reuse
+                call_timeout (int, optional): Default and upper limit in milliseconds of
+                    a statement run with begin_statement(), 0 for no limit
+                handler_workers (int, optional): Number of threads running the handlers
+                    of the events dispatched with dispatch()
+                task_workers (int, optional): Number of threads running the queries
+                    handed over to run_concurrently()
         """
         Namespace.__init__(self, '/oracle_db_connection')
         self._namespace_url = '/oracle_db_connection'
         self._socket_io = socket_io
+        self._pools = {}
+        self._capabilities = {}
+        self._clients = {}
+        self._pool_min = pool_min
+        self._pool_max = pool_max
+        self._pool_increment = pool_increment
+        self._pool_wait_timeout = pool_wait_timeout
+        self._stmt_cache_size = stmt_cache_size
+        self._call_timeout = call_timeout
+        self._executor = ThreadPoolExecutor(max_workers=handler_workers)
+        self._task_executor = ThreadPoolExecutor(max_workers=task_workers)
+        self._single_flight = SingleFlight()
+        self._pool_stats = {'acquires': 0,
+                            'releases': 0,
+                            'waits': 0,
+                            'timeouts': 0,
+                            'waitTime': 0.0,
+                            'maxWaitTime': 0.0}
+        self._pool_lock = threading.RLock()
+        self._client_idle_timeout = client_idle_timeout
+        self._client_eviction_interval = client_eviction_interval
+        self._local = _thread_state
         socket_io.on_namespace(self)
+        socket_io.start_background_task(self._evict_idle_clients)
         self._logger = logging.getLogger(__name__)
 
+    def trigger_event(self, event, *args):
+        """Dispatches an event to its handler while the session of the
+            client raising it is bound to the current thread
+
+            Args:
+                event (string): Name of the event raised by websocket
+        """
+        client = self.bind_client(args[0], self._namespace_url, event, create=True)
+        try:
+            return Namespace.trigger_event(self, event, *args)
+        finally:
+            self.unbind_client(client, self._namespace_url, event)
+
     def on_db_connect(self, props):
         """For internal user only: This method is called by websocket when
             'db_connect' event is raised
@@ -45,52 +3301,810 @@ class DatabaseConnectionServer(Namespace):
             Args:
                 props (dict): contains the parameters to connect to db
         """
+        client = self.get_client()
         conn_str = props['connectionString']
-        if conn_str is not None:
-            self._connection_string = conn_str
         user = props['username']
-        if user is not None:
-            self._username = user
         passw = props['password']
-        if passw is not None:
-            self._password = passw
+        client.payload_format = props.get('payloadFormat')
         try:
-            self._db = cx_Oracle.connect(self._username, self._password, self._connection_string)
+            previous_key = client.pool_key
+            if previous_key != self._get_pool_key(user, passw, conn_str):
+                self.unpin(rollback=True)
+            capabilities = self._create_pool(client, user, passw, conn_str)
+            if client.pool_key != previous_key:
+                self._close_unused_pools()
+            version = capabilities.to_dict()['version']
             emit('connected', namespace=self._namespace_url)
-            print("Connected to database version: " + self._db.version)
+            print("Connected to database version: " + version)
         except Exception as e:
             print("Error: " + str(e))
             msg = "Cannot connect to database: " + str(e)
             emit('failed', {'status': False, 'message': msg},
                  namespace=self._namespace_url)
 
+    def on_get_pool_stats(self):
+        """For internal use only: will be called when 'get_pool_stats' event will be emitted
+        """
+        emit('pool_stats_result', self.get_pool_stats(), namespace=self._namespace_url)
+
+    def on_get_capabilities(self):
+        """For internal use only: will be called when 'get_capabilities' event will be emitted
+        """
+        capabilities = self.get_capabilities()
+        emit('capabilities_result', capabilities.to_dict() if capabilities is not None else None,
+             namespace=self._namespace_url)
+
+    def get_capabilities(self):
+        """Returns the ServerCapabilities of the database the client whose event
+            is being handled is connected to, or None before it connects
+        """
+        client = self.get_client()
+        if client is None or client.pool_key is None:
+            return None
+        with self._pool_lock:
+            return self._capabilities.get(client.pool_key)
+
+    def _get_pool_key(self, username, password, connection_string):
+        """Returns the key under which the pool of the given credentials is stored
+
+            Args:
+                username (string): Name of the database user
+                password (string): Password of the database user
+                connection_string (string): Connect string of the database
+        """
+        return connection_string, username, hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+    def _create_pool(self, client, username, password, connection_string):
+        """Creates the session pool for the given credentials unless one already
+            exists, makes the client connect through it and returns the capabilities
+            of its database. The client is switched to the pool while the pool lock
+            is held so that _close_unused_pools() never sees the pool unused
+
+            Args:
+                client (ClientSession): Session of the websocket client connecting
+                username (string): Name of the database user
+                password (string): Password of the database user
+                connection_string (string): Connect string of the database
+        """
+        pool_key = self._get_pool_key(username, password, connection_string)
+        with self._pool_lock:
+            if pool_key in self._pools:
+                client.pool_key = pool_key
+                return self._capabilities[pool_key]
+        pool = cx_Oracle.SessionPool(user=username,
+                                     password=password,
+                                     dsn=connection_string,
+                                     min=self._pool_min,
+                                     max=self._pool_max,
+                                     increment=self._pool_increment,
+                                     threaded=True,
+                                     connectiontype=MeteredConnection,
+                                     getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,
+                                     wait_timeout=self._pool_wait_timeout)
+        pool.stmtcachesize = self._stmt_cache_size
+        db_conn = pool.acquire()
+        try:
+            capabilities = ServerCapabilities.probe(db_conn)
+        finally:
+            pool.release(db_conn)
+        with self._pool_lock:
+            existing = pool_key in self._pools
+            if not existing:
+                self._pools[pool_key] = pool
+                self._capabilities[pool_key] = capabilities
+            client.pool_key = pool_key
+            capabilities = self._capabilities[pool_key]
+        if existing:
+            pool.close(force=True)
+        return capabilities
+
+    def _close_unused_pools(self):
+        """Closes the pools no client connects through anymore
+        """
+        with self._pool_lock:
+            used = set(client.pool_key for client in self._clients.values())
+            unused = [key for key in self._pools if key not in used]
+            pools = [self._pools.pop(key) for key in unused]
+            for key in unused:
+                self._capabilities.pop(key, None)
+        for pool in pools:
+            try:
+                pool.close(force=True)
+            except cx_Oracle.Error as e:
+                print("Error: " + str(e))
+
+    def get_client_id(self, sid, namespace):
+        """Returns the id identifying a websocket client across all namespaces
+
+            Args:
+                sid (string): Session id of the client in the given namespace
+                namespace (string): Namespace the event was raised in
+        """
+        manager = getattr(self._socket_io.server, 'manager', None)
+        if manager is not None and hasattr(manager, 'eio_sid_from_sid'):
+            eio_sid = manager.eio_sid_from_sid(sid, namespace)
+            if eio_sid is not None:
+                return eio_sid
+        return sid
+
+    def bind_client(self, sid, namespace, event, create=False):
+        """Binds the session of the client raising an event to the current thread,
+            creating it on the first event of the client. Returns None, binding
+            nothing, if the session is gone: the client disconnected or was
+            evicted as idle while its event was queued
+
+            Args:
+                sid (string): Session id of the client in the given namespace
+                namespace (string): Namespace the event was raised in
+                event (string): Name of the event raised by websocket
+                create (bool, optional): Creates the session on any event, for the
+                    events handled right as they are received
+        """
+        client_id = self.get_client_id(sid, namespace)
+        with self._pool_lock:
+            if create or event == 'connect':
+                client = self._get_or_create_client(client_id)
+            else:
+                client = self._clients.get(client_id)
+            if client is None:
+                return None
+            if event == 'connect':
+                client.closing = False
+                client.namespaces[namespace] = sid
+            client.active_events += 1
+            client.last_seen = time.time()
+        self._local.client = client
+        return client
+
+    def _get_or_create_client(self, client_id):
+        """Returns the session of a client, creating it on the first event of the
+            client. Must be called with the pool lock held
+
+            Args:
+                client_id (string): Id of the websocket client
+        """
+        client = self._clients.get(client_id)
+        if client is None:
+            client = ClientSession(client_id)
+            self._clients[client_id] = client
+        return client
+
+    def dispatch(self, sid, namespace, handler, serialize=False):
+        """Runs the handler of an event on the worker threads so that the thread
+            receiving the websocket events is never blocked by the database.
+            Handlers dispatched with serialize set run one after another in the
+            order their events were received from the client in the namespace
+
+            Args:
+                sid (string): Session id of the client in the given namespace
+                namespace (string): Namespace the event was raised in
+                handler (function): Handles the event, called without arguments
+                serialize (bool, optional): Keeps the order of the events of the client
+        """
+        if not serialize:
+            self._executor.submit(self._run_handler, handler)
+            return
+        client_id = self.get_client_id(sid, namespace)
+        with self._pool_lock:
+            client = self._clients.get(client_id)
+            if client is None:
+                print("DatabaseConnection: Dropping event of a disconnected client: " + client_id)
+                return
+            queue = client.event_queues.setdefault(namespace, collections.deque())
+            queue.append(handler)
+            if len(queue) > 1:
+                return
+        self._executor.submit(self._run_queue, client, queue)
+
+    def _run_queue(self, client, queue):
+        """Runs the handlers queued by dispatch() for a client until none is left.
+            The session of the client is evicted after the last one if the client
+            disconnected from every namespace meanwhile
+
+            Args:
+                client (ClientSession): The session of the client
+                queue (deque): The handlers queued for the client and a namespace
+        """
+        while True:
+            self._run_handler(queue[0])
+            with self._pool_lock:
+                queue.popleft()
+                if len(queue) > 0:
+                    continue
+                if not self._is_closed(client):
+                    return
+            self.evict_client(client.client_id)
+            return
+
+    def _is_closed(self, client):
+        """Returns True if the client disconnected from every namespace and none of
+            its handlers is running or queued anymore. Must be called with the pool
+            lock held
+
+            Args:
+                client (ClientSession): The session of the client
+        """
+        return client.closing and client.active_events == 0 and not any(client.event_queues.values())
+
+    def unpin_after_events(self, namespace, rollback=False):
+        """Gives back to the pool the session kept with pin() for the current client
+            once the handlers queued with serialize for it in the namespace are done,
+            so that a statement still running on the session keeps it until it
+            returns. Gives it back right away if no handler is queued
+
+            Args:
+                namespace (string): Namespace the handlers were dispatched in
+                rollback (bool, optional): Rolls back the open transaction first
+        """
+        client = self.get_client()
+        if client is None:
+            return
+
+        def handler():
+            self._local.client = client
+            try:
+                self.unpin(rollback)
+            finally:
+                self._local.client = None
+
+        with self._pool_lock:
+            queue = client.event_queues.get(namespace)
+            if queue:
+                queue.append(handler)
+                return
+        self.unpin(rollback)
+
+    def _run_handler(self, handler):
+        """Runs a dispatched handler, reporting the errors it raises
+
+            Args:
+                handler (function): Handles the event, called without arguments
+        """
+        try:
+            handler()
+        except Exception as e:
+            print("Error: " + str(e))
+
+    def unbind_client(self, client, namespace, event):
+        """Unbinds the session bound by bind_client(). The session is evicted once
+            the client has disconnected from every namespace and none of its
+            handlers is running or queued anymore
+
+            Args:
+                client (ClientSession): The session returned by bind_client()
+                namespace (string): Namespace the event was raised in
+                event (string): Name of the event raised by websocket
+        """
+        self._local.client = None
+        with self._pool_lock:
+            client.active_events -= 1
+            client.last_seen = time.time()
+            if event == 'disconnect':
+                client.namespaces.pop(namespace, None)
+                client.closing = len(client.namespaces) == 0
+            if not self._is_closed(client):
+                return
+        self.evict_client(client.client_id)
+
+    def run_concurrently(self, tasks):
+        """Runs functions concurrently, each with its own session acquired from the
+            pool of the client bound to the current thread, and waits for all of
+            them. They run on their own threads rather than on the handler ones so
+            that a handler waiting for them never holds up the threads it waits for
+
+            Args:
+                tasks (dict): Functions called with a cx_Oracle.Connection, by name
+
+            Returns:
+                dict: For each name, 'result' as returned by the function or 'error'
+                    as the message of the exception it raised, and 'elapsedTime' in
+                    milliseconds
+        """
+        client = self.get_client()
+        futures = dict((name, self._task_executor.submit(self.run_task, client, task)) for name, task in tasks.items())
+        return dict((name, future.result()) for name, future in futures.items())
+
+    def run_in_background(self, task):
+        """Runs a function with its own session acquired from the pool of the
+            client bound to the current thread, without waiting for it. The error
+            it raises, if any, is reported
+
+            Args:
+                task (function): Function called with a cx_Oracle.Connection
+        """
+        def run(client):
+            outcome = self.run_task(client, task)
+            if 'error' in outcome:
+                print("Error in background task: " + outcome['error'])
+
+        self._task_executor.submit(run, self.get_client())
+
+    def run_task(self, client, task):
+        """Calls a function while the session of the given client and a session
+            acquired from its pool are bound to the current thread, for the
+            threads not handling an event of the client
+
+            Args:
+                client (ClientSession): The session of the client the task runs for
+                task (function): Function called with a cx_Oracle.Connection
+
+            Returns:
+                dict: 'result' as returned by the function or 'error' as the message
+                    of the exception it raised, and 'elapsedTime' in milliseconds
+        """
+        self._local.client = client
+        start_time = time.time()
+        try:
+            connection = self.acquire()
+            try:
+                outcome = {'result': task(connection)}
+            finally:
+                self.release()
+        except Exception as e:
+            outcome = {'error': str(e)}
+        finally:
+            self._local.client = None
+        outcome['elapsedTime'] = int((time.time() - start_time) * 1000)
+        return outcome
+
+    def get_client(self):
+        """Returns the session of the client whose event is handled by the current thread
+        """
+        return getattr(self._local, 'client', None)
+
+    def evict_client(self, client_id):
+        """Drops the session of a client: its open transaction is rolled back and
+            the pools nobody uses anymore are closed
+
+            Args:
+                client_id (string): Id of the websocket client
+        """
+        with self._pool_lock:
+            client = self._clients.pop(client_id, None)
+            if client is not None:
+                client.closing = True
+        if client is None:
+            return
+        if client.transaction_connection is not None:
+            self._release_to_pool(client, client.transaction_connection, rollback=True)
+            client.transaction_connection = None
+        self._close_unused_pools()
+
+    def _evict_idle_clients(self):
+        """Background task evicting the sessions of idle clients
+        """
+        while True:
+            self._socket_io.sleep(self._client_eviction_interval)
+            now = time.time()
+            with self._pool_lock:
+                idle = [client for client in self._clients.values()
+                        if client.active_events == 0 and not any(client.event_queues.values())
+                        and now - client.last_seen > self._client_idle_timeout]
+            for client in idle:
+                print("DatabaseConnection: Evicting idle client session: " + client.client_id)
+                self.evict_client(client.client_id)
+                sid = client.namespaces.get(self._namespace_url)
+                if sid is not None:
+                    self._socket_io.emit('session_expired', namespace=self._namespace_url, room=sid)
+
+    def _get_pool(self, client):
+        """Returns the pool the given client connects through
+
+            Args:
+                client (ClientSession): Session of the websocket client
+        """
+        with self._pool_lock:
+            pool = self._pools.get(client.pool_key) if client is not None else None
+        if pool is None:
+            raise cx_Oracle.InterfaceError("Not connected to database")
+        return pool
+
+    def _release_to_pool(self, client, connection, rollback=False, drop=False):
+        """Gives a session back to the pool of the given client
+
+            Args:
+                client (ClientSession): Session of the websocket client
+                connection (cx_Oracle.Connection): The session to give back
+                rollback (bool, optional): Rolls back any open transaction first
+                drop (bool, optional): Closes the session instead because it is
+                    no longer usable
+        """
+        try:
+            if drop:
+                self._get_pool(client).drop(connection)
+            else:
+                if rollback:
+                    connection.rollback()
+                self._get_pool(client).release(connection)
+        except cx_Oracle.Error as e:
+            print("Error: " + str(e))
+        with self._pool_lock:
+            self._pool_stats['releases'] += 1
+
+    def acquire(self, connection=None):
+        """Acquires a session from the pool of the client bound to the current thread
+            so that get_connection() returns it until release() is called
+
+            Args:
+                connection (cx_Oracle.Connection, optional): An already acquired session
+                    to bind instead of taking a new one from the pool. It is not given
+                    back to the pool by release()
+        """
+        if connection is not None:
+            self._local.connection = connection
+            self._local.owned = False
+            return connection
+        pool = self._get_pool(self.get_client())
+        saturated = pool.busy >= pool.opened and pool.opened >= pool.max
+        start = time.time()
+        try:
+            connection = pool.acquire()
+        except cx_Oracle.DatabaseError as e:
+            error, = e.args
+            if getattr(error, 'code', None) == 24457:
+                with self._pool_lock:
+                    self._pool_stats['timeouts'] += 1
+            raise
+        wait_time = (time.time() - start) * 1000
+        with self._pool_lock:
+            self._pool_stats['acquires'] += 1
+            if saturated:
+                self._pool_stats['waits'] += 1
+            self._pool_stats['waitTime'] += wait_time
+            self._pool_stats['maxWaitTime'] = max(self._pool_stats['maxWaitTime'], wait_time)
+        self._local.connection = connection
+        self._local.owned = True
+        return connection
+
+    def release(self):
+        """Unbinds the session bound to the current thread by acquire() and gives
+            it back to the pool
+        """
+        connection = getattr(self._local, 'connection', None)
+        owned = getattr(self._local, 'owned', False)
+        broken = getattr(self._local, 'broken', False)
+        self._local.connection = None
+        self._local.owned = False
+        self._local.broken = False
+        if connection is None or not owned:
+            return
+        self._release_to_pool(self.get_client(), connection, drop=broken)
+
+    def pin(self):
+        """Keeps the session bound to the current thread out of the pool after the
+            current event because a transaction is open on it. It is returned by
+            get_transaction_connection() until unpin() is called. The transaction of
+            a client closing or evicted is rolled back instead and None is returned
+        """
+        client = self.get_client()
+        connection = self.get_connection()
+        with self._pool_lock:
+            closing = client.closing
+            if not closing:
+                self._local.owned = False
+                client.transaction_connection = connection
+        if closing:
+            print("DatabaseConnection: Rolling back the transaction of a disconnected client: " + client.client_id)
+            connection.rollback()
+            return None
+        return connection
+
+    def unpin(self, rollback=False):
+        """Gives back to the pool the session kept with pin() for the current client
+
+            Args:
+                rollback (bool, optional): Rolls back the open transaction first
+        """
+        client = self.get_client()
+        connection = client.transaction_connection if client is not None else None
+        if connection is None:
+            return
+        client.transaction_connection = None
+        if self.get_connection() is connection:
+            if rollback:
+                connection.rollback()
+            self._local.owned = True
+            return
+        self._release_to_pool(client, connection, rollback)
+
+    def begin_statement(self, call_timeout=None):
+        """Registers the session bound to the current thread as running a statement
+            of the current client, so that cancel_statements() can interrupt it,
+            and limits the duration of each of its round trips to the database
+
+            Args:
+                call_timeout (int, optional): Milliseconds a round trip may last,
+                    capped by the call_timeout given to the constructor
+        """
+        connection = self.get_connection()
+        if call_timeout is None or call_timeout <= 0:
+            call_timeout = self._call_timeout
+        elif self._call_timeout > 0:
+            call_timeout = min(call_timeout, self._call_timeout)
+        try:
+            connection.callTimeout = int(call_timeout)
+        except (AttributeError, cx_Oracle.Error) as e:
+            print("Error: Cannot set call timeout: " + str(e))
+        with self._pool_lock:
+            self.get_client().running_connections.add(connection)
+
+    def end_statement(self, error=None):
+        """Unregisters the session registered by begin_statement(). A session whose
+            round trip ran into the call timeout cannot be trusted anymore and is
+            dropped from the pool once the event has been handled
+
+            Args:
+                error (Exception, optional): The error raised by the statement, if any
+        """
+        client = self.get_client()
+        connection = self.get_connection()
+        with self._pool_lock:
+            client.running_connections.discard(connection)
+        if isinstance(error, cx_Oracle.DatabaseError) and error.args:
+            code = getattr(error.args[0], 'code', None)
+            full_code = getattr(error.args[0], 'full_code', '')
+            if code == 3156 or full_code == 'DPI-1067':
+                self._local.broken = True
+                if client.transaction_connection is connection:
+                    client.transaction_connection = None
+                    self._local.owned = True
+                return
+        try:
+            connection.callTimeout = 0
+        except (AttributeError, cx_Oracle.Error):
+            pass
+
+    def cancel_statements(self):
+        """Interrupts the statements running for the current client, whether they
+            are still executing or fetching rows, and returns how many were cancelled
+        """
+        client = self.get_client()
+        with self._pool_lock:
+            connections = list(client.running_connections)
+        for connection in connections:
+            try:
+                connection.cancel()
+            except cx_Oracle.Error as e:
+                print("Error: Cannot cancel statement: " + str(e))
+        return len(connections)
+
+    def get_transaction_connection(self):
+        """Returns the session holding the open transaction of the current client, if any
+        """
+        client = self.get_client()
+        return client.transaction_connection if client is not None else None
+
     def get_connection(self):
-        """Returns the instance of the cx_Oracle
+        """Returns the instance of the cx_Oracle connection acquired for the
+            event being handled by the current thread
+        """
+        return getattr(self._local, 'connection', None)
+
+    def get_pool_stats(self):
+        """Returns the usage statistics of the session pools
+        """
+        with self._pool_lock:
+            stats = dict(self._pool_stats)
+            pools = list(self._pools.values())
+            stats['clients'] = len(self._clients)
+        stats['pools'] = len(pools)
+        stats['busy'] = sum(pool.busy for pool in pools)
+        stats['open'] = sum(pool.opened for pool in pools)
+        stats['min'] = self._pool_min
+        stats['max'] = self._pool_max
+        stats['increment'] = self._pool_increment
+        if stats['acquires'] > 0:
+            stats['avgWaitTime'] = stats['waitTime'] / stats['acquires']
+        else:
+            stats['avgWaitTime'] = 0.0
+        stats['coalescing'] = self._single_flight.get_stats()
+        return stats
+
+    def coalesce(self, key, function):
+        """Makes a call once for all the identical requests raised while it is in
+            flight, see SingleFlight.do()
+
+            Args:
+                key (tuple): Identifies the identical requests
+                function (function): The call, made without arguments
+        """
+        return self._single_flight.do(key, function)
+
+
+class DatabaseNamespace(Namespace):
+    """Base class of the namespaces that query the database. A session is
+        acquired from the pool of the client raising an event before its
+        handler runs and released when the handler returns.
+
+        Handlers querying the database run on the worker threads of the
+        DatabaseConnectionServer and emit their result to the client that
+        raised the event once done
+    """
+
+    _db_connection = None
+    _no_session_events = ('connect', 'disconnect')
+    _serialize_events = False
+    _coalesce_events = False
+    _uncoalesced_events = ('get_data',)
+
+    def trigger_event(self, event, *args):
+        """Hands an event over to the worker threads, except the events handled
+            without a database session which are handled right away. No request
+            context is active here: Namespace.trigger_event() pushes it on the
+            worker thread when the handler is called
+
+            Args:
+                event (string): Name of the event raised by websocket
+        """
+        if event in self._no_session_events:
+            return self._handle_event(event, *args)
+
+        def handler():
+            self._handle_event(event, *args)
+
+        self._db_connection.dispatch(args[0], self.namespace, handler, self._serialize_events)
+
+    def _handle_event(self, event, *args):
+        """Calls the handler of an event while the client session and a pooled
+            database session are bound to the current thread
+
+            Args:
+                event (string): Name of the event raised by websocket
+        """
+        client = self._db_connection.bind_client(args[0], self.namespace, event)
+        if client is None:
+            if event in self._no_session_events:
+                return Namespace.trigger_event(self, event, *args)
+            print("Dropping '" + event + "' event of a disconnected client")
+            return None
+        try:
+            if event in self._no_session_events:
+                return Namespace.trigger_event(self, event, *args)
+            if self._is_coalesced(event):
+                return self._handle_coalesced_event(client, event, *args)
+            return self._handle_session_event(event, *args)
+        finally:
+            self._db_connection.unbind_client(client, self.namespace, event)
+
+    def _handle_session_event(self, event, *args):
+        """Calls the handler of an event while a pooled database session is bound
+            to the current thread
+
+            Args:
+                event (string): Name of the event raised by websocket
+        """
+        try:
+            self._db_connection.acquire(self._get_pinned_connection())
+        except Exception as e:
+            print("Error: Cannot acquire database session: " + str(e))
+            self._emit_to_client(args[0], [(event + '_error', (str(e),), {'namespace': self._namespace_url})])
+            return None
+        try:
+            return Namespace.trigger_event(self, event, *args)
+        finally:
+            self._db_connection.release()
+
+    def _is_coalesced(self, event):
+        """Returns True if the identical requests of an event raised at the same
+            time by several clients can share a single call of its handler
+
+            Args:
+                event (string): Name of the event raised by websocket
         """
-        return self._db
+        return self._coalesce_events and event.startswith('get_') and event not in self._uncoalesced_events
 
+    def _handle_coalesced_event(self, client, event, *args):
+        """Calls the handler of an event once for all the clients of the same
+            connection and schema raising it with the same arguments while it
+            runs. The events emitted by the handler are recorded and emitted
+            again to each client that waited for it
 
-class DatabaseSchemaServer(Namespace):
+            Args:
+                client (ClientSession): The session of the client raising the event
+                event (string): Name of the event raised by websocket
+        """
+        key = (client.pool_key, client.schema_name, self.namespace, event,
+               json.dumps(args[1:], sort_keys=True, default=str))
+
+        def record():
+            _thread_state.recorded_emits = []
+            try:
+                self._handle_session_event(event, *args)
+                return _thread_state.recorded_emits
+            finally:
+                _thread_state.recorded_emits = None
+
+        recorded_emits, owner = self._db_connection.coalesce(key, record)
+        if not owner:
+            self._emit_to_client(args[0], recorded_emits)
+        return None
+
+    def _emit_to_client(self, sid, emits):
+        """Emits events to the client raising an event from outside of its handler,
+            where no request context tells emit() the client to reply to. Like
+            emit(), the events are recorded when the emits of a coalesced call are,
+            and lists of rows are converted to the compact payload format when the
+            client asked for it
+
+            Args:
+                sid (string): Session id of the client in the namespace
+                emits (list): The (event, args, kwargs) of each event to emit
+        """
+        recorded_emits = getattr(_thread_state, 'recorded_emits', None)
+        for emitted_event, emitted_args, emitted_kwargs in emits:
+            if recorded_emits is not None:
+                recorded_emits.append((emitted_event, emitted_args, emitted_kwargs))
+            if emitted_args and wants_compact_payload():
+                emitted_args = (compact_payload(emitted_args[0]),) + emitted_args[1:]
+            self._socket_io.emit(emitted_event, *emitted_args, room=sid, **emitted_kwargs)
+
+    def _get_pinned_connection(self):
+        """Returns the session to use instead of a pooled one, if any
+        """
+        return None
+
+
+@metered_handlers
+class DatabaseSchemaServer(DatabaseNamespace):
     """Class to interact with any given schema
     """
 
     _socket_io = None
-    _schema_name = None
     _db_connection = None
     _namespace_url = None
-
-    def __init__(self, socket_io, db_connection):
+    _coalesce_events = True
+    _cache = None
+    _snapshots = None
+    _snapshot_enabled = False
+    _snapshot_interval = None
+    _snapshot_lock = None
+    _dependency_graphs = None
+    _dependency_graph_enabled = False
+    _search_indexes = None
+    _source_indexes = None
+    _source_index_path = None
+    _snapshot_path = None
+    _no_session_events = ('connect', 'disconnect', 'set_schema', 'refresh_schema', 'get_cache_stats',
+                          'get_snapshot_stats')
+
+    def __init__(self, socket_io, db_connection, cache_ttl=300, cache_max_entries=256,
+                 snapshot_enabled=False, snapshot_interval=5, dependency_graph_enabled=False,
+                 source_index_path=None, snapshot_path=None):
         """Default constructor for DatabaseSchemaServer class
 
 
             Args:
                 socket_io (SocketIO): An instance of the SocketIO class
                 connection (DatabaseConnection): An instance of DatabaseConnection Class
+                cache_ttl (int, optional): Seconds a cached list of schema objects is served
+                cache_max_entries (int, optional): Maximum number of cached lists
+                snapshot_enabled (bool, optional): Serves the columns and constraints of the
+                    tables from a SchemaSnapshot instead of querying the dictionary each time
+                snapshot_interval (int, optional): Seconds during which a snapshot is served
+                    without checking the schema for DDL changes
+                dependency_graph_enabled (bool, optional): Serves the dependencies of the
+                    objects from a DependencyGraph instead of querying the dictionary each time
+                source_index_path (string, optional): Directory the SourceIndex of each
+                    schema is persisted to, kept in memory only by default
+                snapshot_path (string, optional): Directory the SchemaSnapshot of each
+                    schema is persisted to, so that it is served right away after a
+                    restart, kept in memory only by default
         """
         Namespace.__init__(self, '/oracle_db_schema')
         self._namespace_url = '/oracle_db_schema'
         self._socket_io = socket_io
         self._db_connection = db_connection
+        self._cache = SchemaMetadataCache(ttl=cache_ttl, max_entries=cache_max_entries)
+        self._snapshots = {}
+        self._snapshot_enabled = snapshot_enabled
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_lock = threading.Lock()
+        self._dependency_graphs = {}
+        self._dependency_graph_enabled = dependency_graph_enabled
+        self._search_indexes = {}
+        self._source_indexes = {}
+        self._source_index_path = source_index_path
+        self._snapshot_path = snapshot_path
         socket_io.on_namespace(self)
 
     def get_connection(self):
@@ -105,218 +4119,414 @@ class DatabaseSchemaServer(Namespace):
                 schema_name (string): Name of the db schema
         """
         print("DatabaseSchema: Setting up schema name: " + schema_name)
-        self._schema_name = schema_name
+        self._db_connection.get_client().schema_name = schema_name
 
     def get_schema_name(self):
         """Returns the name of the schema set through 'set_schema' websocket event
+            by the client whose event is being handled
+        """
+        client = self._db_connection.get_client()
+        return client.schema_name if client is not None else None
+
+    def _get_cache_key(self):
+        """Returns the key of the cached lists of the client whose event is being handled
+        """
+        client = self._db_connection.get_client()
+        return (client.pool_key, client.schema_name)
+
+    def _get_object_list(self, category):
+        """Returns the names read by the query of a category, served from the
+            cache of schema objects while the objects of the category did not
+            change. The search index is updated whenever the names are read again
+
+            Args:
+                category (string): Category of the objects, see SCHEMA_OBJECT_QUERIES
         """
-        return self._schema_name
+        db_conn = self._db_connection.get_connection()
+        key = self._get_cache_key()
+
+        def load():
+            cursor = db_conn.cursor()
+            cursor.arraysize = 1000
+            cursor.execute(SCHEMA_OBJECT_QUERIES[category])
+            names = [result[0] for result in cursor]
+            with self._snapshot_lock:
+                index = self._search_indexes.get(key)
+            if index is not None:
+                index.update_category(category, names)
+            return names
+
+        return self._cache.get(db_conn, key, category, load)
+
+    def on_search_objects(self, text, options=None):
+        """For internal use only: will be called when 'search_objects' event will be emitted.
+            Emits the names of the schema objects and public synonyms best matching the
+            text typed by the user, looked up in a trigram index of the schema
+
+            Args:
+                text (string): Text typed by the user
+                options (dict, optional): 'limit' as the maximum number of matches and
+                    'categories' as the list of categories to search, all by default
+        """
+        if options is None:
+            options = {}
+        start_time = time.time()
+        key = self._get_cache_key()
+        with self._snapshot_lock:
+            index = self._search_indexes.get(key)
+            if index is None:
+                index = TrigramIndex()
+                self._search_indexes[key] = index
+        categories = options.get('categories') or SCHEMA_TREE_CATEGORIES
+        for category in categories:
+            if category not in SCHEMA_OBJECT_QUERIES:
+                continue
+            names = self._get_object_list(category)
+            if not index.has_category(category):
+                index.update_category(category, names)
+        matches = index.search(text, int(options.get('limit') or 20), categories)
+        emit('search_objects_result', {'text': text,
+                                       'matches': matches,
+                                       'elapsedTime': int((time.time() - start_time) * 1000)},
+             namespace=self._namespace_url)
+
+    def invalidate_cache(self):
+        """Drops the cached lists of schema objects of the client whose event is being handled
+            and makes its snapshot check the schema for DDL changes on next use
+        """
+        key = self._get_cache_key()
+        self._cache.invalidate(key)
+        with self._snapshot_lock:
+            expired = [self._snapshots.get(key), self._dependency_graphs.get(key), self._source_indexes.get(key)]
+        for snapshot in expired:
+            if snapshot is not None:
+                snapshot.expire()
+
+    def get_snapshot(self, table_name=None):
+        """Returns the SchemaSnapshot of the schema of the client whose event is
+            being handled, refreshed with the DDL changes made since it was last
+            used, or None when snapshots are disabled
+
+            Args:
+                table_name (string, optional): Returns None as well when this table
+                    is not part of the snapshot, so the caller queries the dictionary
+        """
+        if not self._snapshot_enabled:
+            return None
+        key = self._get_cache_key()
+        with self._snapshot_lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                snapshot = SchemaSnapshot(check_interval=self._snapshot_interval, path=self._get_snapshot_file())
+                self._snapshots[key] = snapshot
+        try:
+            if snapshot.start_revalidation():
+                self._db_connection.run_in_background(snapshot.revalidate)
+            if not snapshot.is_revalidating():
+                snapshot.refresh(self._db_connection.get_connection())
+        except Exception as e:
+            print("Error while refreshing the schema snapshot: " + str(e))
+            return None
+        if table_name is not None and not snapshot.has_table(table_name):
+            return None
+        return snapshot
+
+    def _get_snapshot_file(self):
+        """Returns the SQLite file the snapshot of the schema of the client whose
+            event is being handled is persisted to, or None when snapshots are kept
+            in memory only. The file is named after the connect string, the user,
+            the schema and the id of the database, so that a snapshot is never
+            loaded for another database reached through the same connect string
+        """
+        if self._snapshot_path is None:
+            return None
+        client = self._db_connection.get_client()
+        capabilities = self._db_connection.get_capabilities()
+        key = (client.pool_key[0], client.pool_key[1], client.schema_name,
+               capabilities.db_id if capabilities is not None else None)
+        os.makedirs(self._snapshot_path, exist_ok=True)
+        return os.path.join(self._snapshot_path,
+                            'snapshot-%s.sqlite' % hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[0:16])
+
+    def get_dependency_graph(self):
+        """Returns the DependencyGraph of the schema of the client whose event is
+            being handled, refreshed with the DDL changes made since it was last
+            used, or None when dependency graphs are disabled
+        """
+        if not self._dependency_graph_enabled:
+            return None
+        key = self._get_cache_key()
+        with self._snapshot_lock:
+            graph = self._dependency_graphs.get(key)
+            if graph is None:
+                graph = DependencyGraph(check_interval=self._snapshot_interval)
+                self._dependency_graphs[key] = graph
+        try:
+            graph.refresh(self._db_connection.get_connection())
+        except Exception as e:
+            print("Error while refreshing the dependency graph: " + str(e))
+            return None
+        return graph
+
+    def get_source_index(self):
+        """Returns the SourceIndex of the schema of the client whose event is being
+            handled, refreshed with the objects compiled since it was last used
+        """
+        key = self._get_cache_key()
+        with self._snapshot_lock:
+            index = self._source_indexes.get(key)
+            if index is None:
+                path = None
+                if self._source_index_path is not None:
+                    os.makedirs(self._source_index_path, exist_ok=True)
+                    path = os.path.join(self._source_index_path,
+                                        'source-%s.sqlite' % hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[0:16])
+                index = SourceIndex(path=path, check_interval=self._snapshot_interval)
+                self._source_indexes[key] = index
+        index.refresh(self._db_connection.get_connection())
+        return index
+
+    def on_search_source(self, text, options=None):
+        """For internal use only: will be called when 'search_source' event will be emitted.
+            Emits the lines of PL/SQL, trigger and type source holding every word of
+            the text, looked up in the source index of the schema
+
+            Args:
+                text (string): Words searched
+                options (dict, optional): 'limit' as the maximum number of lines and
+                    'phrase' to only match the text as typed
+        """
+        if options is None:
+            options = {}
+        start_time = time.time()
+        try:
+            index = self.get_source_index()
+        except Exception as e:
+            print("Error while indexing the source: " + str(e))
+            emit('search_source_error', str(e), namespace=self._namespace_url)
+            return
+        hits = index.search(text, int(options.get('limit') or 200), bool(options.get('phrase')))
+        emit('search_source_result', {'text': text,
+                                      'hits': hits,
+                                      'elapsedTime': int((time.time() - start_time) * 1000)},
+             namespace=self._namespace_url)
+
+    def invalidate_snapshot(self):
+        """Drops the snapshot, with its file, and the dependency graph of the schema
+            of the client whose event is being handled
+        """
+        key = self._get_cache_key()
+        with self._snapshot_lock:
+            snapshot = self._snapshots.pop(key, None)
+            self._dependency_graphs.pop(key, None)
+        if snapshot is not None:
+            snapshot.delete_file()
+
+    def on_refresh_schema(self):
+        """For internal use only: will be called when 'refresh_schema' event will be emitted.
+            The next requests for lists of schema objects read them from the database
+        """
+        self.invalidate_cache()
+        self.invalidate_snapshot()
+        emit('refresh_schema_result', 'ok', namespace=self._namespace_url)
+
+    def on_get_cache_stats(self):
+        """For internal use only: will be called when 'get_cache_stats' event will be emitted
+        """
+        emit('cache_stats_result', self._cache.get_stats(), namespace=self._namespace_url)
+
+    def on_get_snapshot_stats(self):
+        """For internal use only: will be called when 'get_snapshot_stats' event will be emitted.
+            Emits the size and estimated memory use of the snapshot and of the dependency
+            graph of each schema
+        """
+        with self._snapshot_lock:
+            snapshots = list(self._snapshots.items())
+            graphs = list(self._dependency_graphs.items())
+            indexes = list(self._search_indexes.items())
+            sources = list(self._source_indexes.items())
+        result = {'enabled': self._snapshot_enabled,
+                  'schemas': [],
+                  'dependencyGraphEnabled': self._dependency_graph_enabled,
+                  'dependencyGraphs': [],
+                  'searchIndexes': [],
+                  'sourceIndexes': []}
+        for name, items in (('schemas', snapshots), ('dependencyGraphs', graphs), ('searchIndexes', indexes),
+                            ('sourceIndexes', sources)):
+            for key, snapshot in items:
+                stats = snapshot.get_stats()
+                stats['schema'] = key[1]
+                stats['username'] = key[0][1] if key[0] is not None else None
+                result[name].append(stats)
+        emit('snapshot_stats_result', result, namespace=self._namespace_url)
+
+    def on_get_schema_tree(self, options=None):
+        """For internal use only: will be called when 'get_schema_tree' event will be emitted.
+            Reads every category of the navigation tree in a single query over user_objects
+            and the public dictionary views, and emits them grouped and sorted by name
+
+            Args:
+                options (dict, optional): 'categories' as the list of categories to read,
+                    all but 'public_synonyms' by default, and 'lazy' to only receive the
+                    number of objects of each category, to be expanded later
+        """
+        if options is None:
+            options = {}
+        categories = options.get('categories') or [category for category in SCHEMA_TREE_CATEGORIES
+                                                    if category != 'public_synonyms']
+        categories = [category for category in SCHEMA_TREE_CATEGORIES if category in categories]
+        object_types = [(category, SchemaMetadataCache.OBJECT_TYPES[category]) for category in categories
+                        if category in SchemaMetadataCache.OBJECT_TYPES]
+        parts = []
+        if object_types.__len__() > 0:
+            parts.append("""
+                    SELECT
+                        CASE object_type %s END AS category,
+                        object_name AS name
+                    FROM SYS.user_objects
+                    WHERE
+                        object_type IN (%s)
+                        AND object_name NOT LIKE 'BIN$%%'
+                    """ % (' '.join(["WHEN '%s' THEN '%s'" % (object_type, category)
+                                     for category, object_type in object_types]),
+                           ', '.join(["'%s'" % object_type for category, object_type in object_types])))
+        for category in ('public_synonyms', 'public_dblinks', 'directories'):
+            if category in categories:
+                query = SCHEMA_OBJECT_QUERIES[category]
+                parts.append("SELECT '%s' AS category, n.%s AS name FROM (%s) n"
+                             % (category, query.split()[1], query))
+        result = {}
+        if parts.__len__() == 0:
+            emit('schema_tree_result', {'lazy': bool(options.get('lazy')),
+                                        'categories': result}, namespace=self._namespace_url)
+            return
+        if options.get('lazy'):
+            query = """
+                    SELECT category, COUNT(*)
+                    FROM (%s)
+                    GROUP BY category
+                    """ % ' UNION ALL '.join(parts)
+            for category in categories:
+                result[category] = 0
+        else:
+            query = """
+                    SELECT category, name
+                    FROM (%s)
+                    ORDER BY category, name
+                    """ % ' UNION ALL '.join(parts)
+            for category in categories:
+                result[category] = []
+        db_conn = self._db_connection.get_connection()
+        cursor = db_conn.cursor()
+        cursor.arraysize = 1000
+        cursor.execute(query)
+        for row in cursor:
+            if options.get('lazy'):
+                result[row[0]] = row[1]
+            else:
+                result[row[0]].append(row[1])
+        emit('schema_tree_result', {'lazy': bool(options.get('lazy')),
+                                    'categories': result}, namespace=self._namespace_url)
 
     def on_get_tables(self):
         """For internal use only: will be called when 'get_tables' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT table_name FROM sys.user_tables ORDER BY table_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('tables')
         emit('tables_result', result_array, namespace=self._namespace_url)
 
     def on_get_views(self):
         """For internal use only: will be called when 'get_views' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT view_name FROM sys.user_views ORDER BY view_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('views')
         emit('views_result', result_array, namespace=self._namespace_url)
 
     def on_get_indexes(self):
         """For internal use only: will be called when 'get_indexes' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT index_name FROM sys.user_indexes ORDER BY index_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('indexes')
         emit('indexes_result', result_array, namespace=self._namespace_url)
 
     def on_get_mviews(self):
         """For internal use only: will be called when 'get_mviews' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT mview_name FROM sys.user_mviews ORDER BY mview_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('mviews')
         emit('mviews_result', result_array, namespace=self._namespace_url)
 
     def on_get_procedures(self):
         """For internal use only: will be called when 'get_procedures' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        query = """
-                SELECT
-                    object_name
-                FROM
-                    SYS.user_objects
-                WHERE
-                    object_type='PROCEDURE'
-                ORDER BY object_name
-                """
-        cursor = db_conn.cursor()
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('procedures')
         emit('procedures_result', result_array, namespace=self._namespace_url)
 
     def on_get_functions(self):
         """For internal use only: will be called when 'get_functions' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        query = """
-                SELECT
-                    object_name
-                FROM
-                    SYS.user_objects
-                WHERE
-                    object_type='FUNCTION'
-                ORDER BY object_name
-                """
-        cursor = db_conn.cursor()
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('functions')
         emit('functions_result', result_array, namespace=self._namespace_url)
 
     def on_get_packages(self):
         """For internal use only: will be called when 'get_packages' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        query = """
-                    SELECT
-                        object_name
-                    FROM
-                        SYS.user_objects
-                    WHERE
-                        object_type='PACKAGE'
-                ORDER BY object_name
-                    """
-        cursor = db_conn.cursor()
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('packages')
         emit('packages_result', result_array, namespace=self._namespace_url)
 
     def on_get_sequences(self):
         """For internal use only: will be called when 'get_sequences' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT sequence_name FROM sys.user_sequences ORDER BY sequence_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('sequences')
         emit('sequences_result', result_array, namespace=self._namespace_url)
 
     def on_get_synonyms(self):
         """For internal use only: will be called when 'get_synonyms' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT synonym_name FROM sys.user_synonyms ORDER BY synonym_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('synonyms')
         emit('synonyms_result', result_array, namespace=self._namespace_url)
 
     def on_get_public_synonyms(self):
         """For internal use only: will be called when 'get_public_synonyms' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT synonym_name FROM sys.all_synonyms ORDER BY synonym_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('public_synonyms')
         emit('public_synonyms_result', result_array, namespace=self._namespace_url)
 
     def on_get_triggers(self):
         """For internal use only: will be called when 'get_triggers' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT trigger_name FROM sys.user_triggers ORDER BY trigger_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('triggers')
         emit('triggers_result', result_array, namespace=self._namespace_url)
 
     def on_get_types(self):
         """For internal use only: will be called when 'get_types' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT type_name FROM sys.user_types ORDER BY type_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('types')
         emit('types_result', result_array, namespace=self._namespace_url)
 
     def on_get_queues(self):
         """For internal use only: will be called when 'get_queues' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT name FROM sys.user_queues ORDER BY name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('queues')
         emit('queues_result', result_array, namespace=self._namespace_url)
 
     def on_get_dblinks(self):
         """For internal use only: will be called when 'get_dblinks' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT db_link FROM sys.user_db_links ORDER BY db_link")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('dblinks')
         emit('dblinks_result', result_array, namespace=self._namespace_url)
 
     def on_get_public_dblinks(self):
         """For internal use only: will be called when 'get_public_dblinks' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT db_link FROM sys.all_db_links WHERE owner='PUBLIC' ORDER BY db_link")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('public_dblinks')
         emit('public_dblinks_result', result_array, namespace=self._namespace_url)
 
     def on_get_directories(self):
         """For internal use only: will be called when 'get_directories' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT directory_name FROM sys.all_directories ORDER BY directory_name")
-        result_array = []
-        for result in cursor:
-            result_array.append(result[0])
+        result_array = self._get_object_list('directories')
         emit('directories_result', result_array, namespace=self._namespace_url)
 
 
-class DatabaseTableServer(Namespace):
+@metered_handlers
+class DatabaseTableServer(DatabaseNamespace):
     """Class to interact with the database table available under schema
         provided as parameter to the class
     """
@@ -326,6 +4536,7 @@ class DatabaseTableServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseTableServer class
@@ -346,7 +4557,23 @@ class DatabaseTableServer(Namespace):
     def on_get_columns(self, table_name):
         """For internal use only: will be called when 'get_columns' event will be emitted
         """
+        snapshot = self._schema.get_snapshot(table_name)
+        if snapshot is not None:
+            result_array = snapshot.get_columns(table_name)
+            for i in range(0, result_array.__len__()):
+                result_array[i]['recid'] = i + 1
+            emit('columns_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
+        emit('columns_result', self._fetch_columns(db_conn, table_name), namespace=self._namespace_url)
+
+    def _fetch_columns(self, db_conn, table_name):
+        """Returns the columns of a table
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+        """
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.column_name,
@@ -370,9 +4597,9 @@ class DatabaseTableServer(Namespace):
                 WHERE
                     a.table_name = b.table_name (+)
                     AND a.column_name = b.column_name (+)
-                    AND a.table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    AND a.table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -382,22 +4609,29 @@ class DatabaseTableServer(Namespace):
                                  'dataDefault': result[4],
                                  'columnId': result[5],
                                  'comments': result[6]})
-        emit('columns_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_column_headers(self, table_name):
         """For internal use only: will be called when 'get_column_headers' event will be emitted
         """
+        snapshot = self._schema.get_snapshot(table_name)
+        if snapshot is not None:
+            result_array = [{'field': column['columnName'],
+                             'caption': column['columnName'],
+                             'size': '100px'} for column in snapshot.get_columns(table_name)]
+            emit('column_headers_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
                 SELECT a.column_name
                 FROM SYS.user_tab_columns a
                 WHERE
-                    a.table_name='%s'
+                    a.table_name=:table_name
                 ORDER BY
                     a.column_id
-                """ % table_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'field': result[0],
@@ -405,8 +4639,14 @@ class DatabaseTableServer(Namespace):
                                  'size': '100px'})
         emit('column_headers_result', result_array, namespace=self._namespace_url)
 
-    def on_get_data(self, table_name):
+    def on_get_data(self, table_name, options=None):
         """For internal use only: will be called when 'get_data' event will be emitted
+
+            Args:
+                table_name (string): Name of the object to read the rows from
+                options (dict, optional): 'limit' as the page size and 'token' as
+                    received with the previous page, see fetch_data_page(), or
+                    'stream' to receive all rows as 'data_chunk' events instead
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
@@ -414,38 +4654,34 @@ class DatabaseTableServer(Namespace):
                 SELECT a.column_name
                 FROM SYS.user_tab_columns a
                 WHERE
-                    a.table_name='%s'
+                    a.table_name=:table_name
                 ORDER BY
                     a.column_id
-                """ % table_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         column_headers = []
         for result in cursor:
             column_headers.append(result[0])
-        header_string = 'ROWNUM'
-        for header in column_headers:
-            header_string += ', ' + header
-        query = """
-                SELECT %s
-                FROM %s
-                """ % (header_string, table_name)
-        cursor = db_conn.cursor()
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            row = {}
-            for i in range(0, column_headers.__len__() + 1):
-                if i == 0:
-                    row['recid'] = result[i]
-                else:
-                    row[column_headers[i - 1]] = str(result[i])
-            result_array.append(row)
-        emit('data_result', result_array, namespace=self._namespace_url)
+        if options is not None and options.get('stream'):
+            stream_data(self._socket_io, db_conn, table_name, column_headers, self._namespace_url, options)
+            return
+        result = fetch_data_page(db_conn, table_name, column_headers, get_key_columns(db_conn, table_name), options,
+                                 self._db_connection.get_capabilities())
+        emit('data_result', result, namespace=self._namespace_url)
 
     def on_get_constraints(self, table_name):
         """For internal use only: will be called when 'get_constraints' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        emit('constraints_result', self._fetch_constraints(db_conn, table_name), namespace=self._namespace_url)
+
+    def _fetch_constraints(self, db_conn, table_name):
+        """Returns the constraints of a table
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+        """
         cursor = db_conn.cursor()
         query = """
                 SELECT
@@ -473,9 +4709,9 @@ class DatabaseTableServer(Namespace):
                     SYS.user_constraints b
                 WHERE
                     a.r_constraint_name = b.constraint_name(+)
-                    AND a.table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    AND a.table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -498,7 +4734,7 @@ class DatabaseTableServer(Namespace):
                                  'invalid': result[17],
                                  'viewRelated': result[18]
                                  })
-        emit('constraints_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_constraint_details(self, props):
         """For internal use only: will be called when 'get_constraint_details' event will be emitted
@@ -515,10 +4751,10 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_cons_columns
                 WHERE
-                    table_name='%s'
-                    AND constraint_name='%s'
-                """ % (table_name, constraint_name)
-        cursor.execute(query)
+                    table_name=:table_name
+                    AND constraint_name=:constraint_name
+                """
+        cursor.execute(query, table_name=table_name, constraint_name=constraint_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -531,6 +4767,15 @@ class DatabaseTableServer(Namespace):
         """For internal use only: will be called when 'get_grants' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        emit('grants_result', self._fetch_grants(db_conn, table_name), namespace=self._namespace_url)
+
+    def _fetch_grants(self, db_conn, table_name):
+        """Returns the privileges granted on a table
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+        """
         cursor = db_conn.cursor()
         query = """
                 SELECT
@@ -543,9 +4788,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_tab_privs
                 WHERE
-                    table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -555,34 +4800,43 @@ class DatabaseTableServer(Namespace):
                                  'grantor': result[4],
                                  'objectName': result[5]
                                  })
-        emit('grants_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_statistics(self, table_name):
         """For internal use only: will be called when 'get_statistics' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        emit('statistics_result', self._fetch_statistics(db_conn, table_name), namespace=self._namespace_url)
+
+    def _fetch_statistics(self, db_conn, table_name):
+        """Returns the optimizer statistics of a table as name and value pairs
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+        """
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.* FROM (
-                SELECT 'NUM_ROWS' AS Name, to_char(num_rows) AS Value FROM SYS.user_tab_statistics WHERE table_name='%s'
+                SELECT 'NUM_ROWS' AS Name, to_char(num_rows) AS Value FROM SYS.user_tab_statistics WHERE table_name=:table_name
                 UNION
-                SELECT 'BLOCKS' AS Name, to_char(blocks) AS Value FROM SYS.user_tab_statistics WHERE table_name='%s'
+                SELECT 'BLOCKS' AS Name, to_char(blocks) AS Value FROM SYS.user_tab_statistics WHERE table_name=:table_name
                 UNION
-                SELECT 'AVG_ROW_LEN' AS Name, to_char(avg_row_len) AS Value FROM SYS.user_tab_statistics WHERE table_name='%s'
+                SELECT 'AVG_ROW_LEN' AS Name, to_char(avg_row_len) AS Value FROM SYS.user_tab_statistics WHERE table_name=:table_name
                 UNION
-                SELECT 'SAMPLE_SIZE' AS Name, to_char(sample_size) AS Value FROM SYS.user_tab_statistics WHERE table_name='%s'
+                SELECT 'SAMPLE_SIZE' AS Name, to_char(sample_size) AS Value FROM SYS.user_tab_statistics WHERE table_name=:table_name
                 UNION
-                SELECT 'LAST_ANALYZED' AS Name, to_char(last_analyzed) AS Value FROM SYS.user_tab_statistics WHERE table_name='%s'
+                SELECT 'LAST_ANALYZED' AS Name, to_char(last_analyzed) AS Value FROM SYS.user_tab_statistics WHERE table_name=:table_name
                 ) a ORDER BY Name
-                """ % (table_name, table_name, table_name, table_name, table_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
                                  'name': result[1],
                                  'value': result[2]
                                  })
-        emit('statistics_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_statistics_details(self, table_name):
         """For internal use only: will be called when 'get_statistics_details' event will be emitted
@@ -609,9 +4863,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_tab_columns
                 WHERE
-                    table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -636,6 +4890,15 @@ class DatabaseTableServer(Namespace):
         """For internal use only: will be called when 'get_triggers' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        emit('triggers_result', self._fetch_triggers(db_conn, table_name), namespace=self._namespace_url)
+
+    def _fetch_triggers(self, db_conn, table_name):
+        """Returns the triggers defined on a table
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+        """
         cursor = db_conn.cursor()
         query = """
                 SELECT
@@ -649,9 +4912,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_triggers
                 WHERE
-                    table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -662,7 +4925,7 @@ class DatabaseTableServer(Namespace):
                                  'status': result[5],
                                  'tableName': result[6]
                                  })
-        emit('triggers_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_trigger_body(self, trigger_name):
         """For internal use only: will be called when 'get_trigger_body' event will be emitted
@@ -675,11 +4938,11 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_source
                 WHERE
-                    name='%s'
+                    name=:trigger_name
                     AND type='TRIGGER'
                 ORDER BY line
-                """ % trigger_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, trigger_name=trigger_name)
         result_string = ""
         for result in cursor:
             result_string += result[0]
@@ -689,6 +4952,18 @@ class DatabaseTableServer(Namespace):
         """For internal use only: will be called when 'get_dependencies' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        emit('dependencies_result', self._fetch_dependencies(db_conn, table_name), namespace=self._namespace_url)
+
+    def _fetch_dependencies(self, db_conn, table_name):
+        """Returns the objects depending on a table
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+        """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            return graph.get_dependency_records(table_name, 'downstream')
         cursor = db_conn.cursor()
         query = """
                 SELECT
@@ -701,9 +4976,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_dependencies
                 WHERE
-                    referenced_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    referenced_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -713,11 +4988,15 @@ class DatabaseTableServer(Namespace):
                                  'referencedName': result[4],
                                  'referencedType': result[5]
                                  })
-        emit('dependencies_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_dependencies_details(self, table_name):
         """For internal use only: will be called when 'get_dependencies_details' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            emit('dependencies_details_result', graph.get_dependency_records(table_name, 'upstream'), namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -731,9 +5010,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_dependencies
                 WHERE
-                    name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -749,18 +5028,20 @@ class DatabaseTableServer(Namespace):
         """For internal use only: will be called when 'get_indexes' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        emit('indexes_result', self._fetch_indexes(db_conn, table_name, self._db_connection.get_capabilities()),
+             namespace=self._namespace_url)
+
+    def _fetch_indexes(self, db_conn, table_name, capabilities=None):
+        """Returns the indexes of a table with their columns
+
+            Args:
+                db_conn (Connection): Session used to read the dictionary
+                table_name (string): Name of the table
+                capabilities (ServerCapabilities, optional): Capabilities of the server,
+                    LISTAGG replaces xmlagg when supported
+        """
         cursor = db_conn.cursor()
-        # ########## Get Oracle Version ################
-        version_str = ""
-        query = "SELECT version FROM PRODUCT_COMPONENT_VERSION WHERE product LIKE '%Oracle%'"
-        cursor.execute(query)
-        for result in cursor:
-            version_str = result[0]
-        version_array = version_str.split('.')
-        version = int(version_array[0])
-        # ######### Get Indexes based on version #####################
-        cursor = db_conn.cursor()
-        if version <= 10:
+        if capabilities is None or not capabilities.supports('listagg'):
             query = """
                 SELECT
                     ROWNUM,
@@ -783,8 +5064,8 @@ class DatabaseTableServer(Namespace):
                     GROUP BY index_name) b
                 WHERE
                     a.index_name = b.index_name
-                    AND a.table_name='%s'
-                """ % table_name
+                    AND a.table_name=:table_name
+                """
         else:
             query = """
                     SELECT
@@ -811,9 +5092,9 @@ class DatabaseTableServer(Namespace):
                         GROUP BY index_name) b
                     WHERE
                         a.index_name = b.index_name
-                        AND a.table_name='%s'
-                    """ % table_name
-        cursor.execute(query)
+                        AND a.table_name=:table_name
+                    """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -827,7 +5108,7 @@ class DatabaseTableServer(Namespace):
                                  'joinIndex': result[8],
                                  'columns': result[9]
                                  })
-        emit('indexes_result', result_array, namespace=self._namespace_url)
+        return result_array
 
     def on_get_indexes_details(self, props):
         """For internal use only: will be called when 'get_indexes_details' event will be emitted
@@ -857,10 +5138,10 @@ class DatabaseTableServer(Namespace):
                     AND a.table_name = b.table_name (+)
                     AND a.index_name = c.index_name (+)
                     AND a.table_name = c.table_name (+)
-                    AND a.table_name='%s'
-                    AND a.index_name='%s'
-                """ % (table_name, index_name)
-        cursor.execute(query)
+                    AND a.table_name=:table_name
+                    AND a.index_name=:index_name
+                """
+        cursor.execute(query, table_name=table_name, index_name=index_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -877,81 +5158,126 @@ class DatabaseTableServer(Namespace):
         emit('indexes_details_result', result_array, namespace=self._namespace_url)
 
     def on_get_sql(self, table_name):
-        """For internal use only: will be called when 'get_sql' event will be emitted
+        """For internal use only: will be called when 'get_sql' event will be emitted.
+            The DDL of the table, its comments, indexes and triggers is gathered as one
+            CLOB and streamed as 'sql_chunk' events when it is larger than one chunk
         """
         db_conn = self._db_connection.get_connection()
-        sql = ""
-        # ########### Get DDL of table ###############
-        cursor = db_conn.cursor()
-        query = """
-                SELECT to_char(dbms_metadata.get_ddl('TABLE', '%s')) FROM dual
-                """ % table_name
-        cursor.execute(query)
-        for result in cursor:
-            sql = result[0]
-        sql += ';\n\n'
-        # ########## Get comments on columns if available ##########
-        cursor = db_conn.cursor()
-        query = """
-                SELECT
-                    'COMMENT ON COLUMN ' ||
-                    '"' || sys_context( 'userenv', 'current_schema' ) ||
-                    '"."' || table_name ||
-                    '"."' || column_name ||
-                    '" IS ''' || comments || ''';'
-                FROM
-                    SYS.user_col_comments
-                WHERE
-                    table_name='%s'
-                    AND comments IS NOT NULL
-                """ % table_name
-        cursor.execute(query)
-        for result in cursor:
-            sql += '  ' + result[0] + '\n'
-        # ########## Get comments on table if available ##########
-        cursor = db_conn.cursor()
-        query = """
-                SELECT
-                    'COMMENT ON TABLE ' ||
-                    '"' || sys_context( 'userenv', 'current_schema' ) ||
-                                    '"."' || table_name ||
-                                    '" IS ''' || comments || ''';'
-                FROM
-                    SYS.user_tab_comments
-                WHERE
-                    table_name='%s'
-                    AND comments IS NOT NULL
-                """ % table_name
-        cursor.execute(query)
-        for result in cursor:
-            sql += '  ' + result[0] + '\n'
-        # ########## Get indexes if available #################
-        cursor = db_conn.cursor()
-        query = """
-                SELECT
-                    to_char(dbms_metadata.get_ddl('INDEX', index_name))
-                FROM
-                    SYS.user_indexes
-                WHERE
-                    table_name='%s'
-                """ % table_name
-        cursor.execute(query)
-        for result in cursor:
-            sql += result[0] + '\n'
-        # ########## Get Triggers if available ##############
+        lob = self._fetch_sql(db_conn, table_name)
+        if lob is None:
+            emit('sql_result', '', namespace=self._namespace_url)
+            return
+        size = lob.size()
+        if size <= DDL_CHUNK_SIZE:
+            emit('sql_result', lob.read(), namespace=self._namespace_url)
+            return
+        offset = 1
+        while offset <= size:
+            emit('sql_chunk', {'offset': offset - 1,
+                               'text': lob.read(offset, DDL_CHUNK_SIZE)}, namespace=self._namespace_url)
+            offset += DDL_CHUNK_SIZE
+            self._socket_io.sleep(0)
+        emit('sql_done', {'size': size}, namespace=self._namespace_url)
+
+    def _fetch_sql(self, db_conn, table_name):
+        """Returns the DDL of a table, its comments, indexes and triggers as a
+            LOB to be read while the session is held, or None
+
+            Args:
+                db_conn (Connection): Session used to read the DDL
+                table_name (string): Name of the table
+        """
         cursor = db_conn.cursor()
+        ddl = cursor.var(cx_Oracle.CLOB)
         query = """
-                SELECT
-                    to_char(dbms_metadata.get_ddl('TRIGGER', trigger_name))
-                FROM
-                    SYS.user_triggers
-                WHERE
-                    table_name='%s'
-                """ % table_name
-        cursor.execute(query)
-        for result in cursor:
-            sql += result[0] + '\n'
-        emit('sql_result', sql, namespace=self._namespace_url)
+                DECLARE
+                    no_dependent_ddl EXCEPTION;
+                    PRAGMA EXCEPTION_INIT(no_dependent_ddl, -31608);
+                    l_table_name VARCHAR2(128) := :table_name;
+                    l_ddl CLOB;
+
+                    PROCEDURE append_dependent_ddl(p_object_type VARCHAR2) IS
+                    BEGIN
+                        dbms_lob.append(l_ddl, dbms_metadata.get_dependent_ddl(p_object_type, l_table_name));
+                    EXCEPTION
+                        WHEN no_dependent_ddl THEN
+                            NULL;
+                    END;
+                BEGIN
+                    dbms_metadata.set_transform_param(dbms_metadata.session_transform, 'PRETTY', TRUE);
+                    dbms_metadata.set_transform_param(dbms_metadata.session_transform, 'SQLTERMINATOR', TRUE);
+                    BEGIN
+                        l_ddl := dbms_metadata.get_ddl('TABLE', l_table_name);
+                        append_dependent_ddl('COMMENT');
+                        append_dependent_ddl('INDEX');
+                        append_dependent_ddl('TRIGGER');
+                    EXCEPTION
+                        WHEN OTHERS THEN
+                            dbms_metadata.set_transform_param(dbms_metadata.session_transform, 'DEFAULT');
+                            RAISE;
+                    END;
+                    dbms_metadata.set_transform_param(dbms_metadata.session_transform, 'DEFAULT');
+                    :ddl := l_ddl;
+                END;
+                """
+        cursor.execute(query, table_name=table_name, ddl=ddl)
+        return ddl.getvalue()
+
+    def on_get_table_bundle(self, table_name, options=None):
+        """For internal use only: will be called when 'get_table_bundle' event will be emitted.
+            Reads the sections shown when a table is opened, each on its own pooled
+            session, and emits them as one 'table_bundle_result' event
+
+            Args:
+                table_name (string): Name of the table
+                options (dict, optional): 'sections' as the list of sections to read, all
+                    of TABLE_BUNDLE_SECTIONS by default, and 'concurrent' set to False to
+                    read them one after another on the session of the event
+        """
+        if options is None:
+            options = {}
+        start_time = time.time()
+        requested = options.get('sections') or TABLE_BUNDLE_SECTIONS
+        capabilities = self._db_connection.get_capabilities()
+
+        def fetch_sql(db_conn):
+            lob = self._fetch_sql(db_conn, table_name)
+            return lob.read() if lob is not None else ''
+
+        fetchers = {'columns': lambda db_conn: self._fetch_columns(db_conn, table_name),
+                    'constraints': lambda db_conn: self._fetch_constraints(db_conn, table_name),
+                    'grants': lambda db_conn: self._fetch_grants(db_conn, table_name),
+                    'statistics': lambda db_conn: self._fetch_statistics(db_conn, table_name),
+                    'triggers': lambda db_conn: self._fetch_triggers(db_conn, table_name),
+                    'dependencies': lambda db_conn: self._fetch_dependencies(db_conn, table_name),
+                    'indexes': lambda db_conn: self._fetch_indexes(db_conn, table_name, capabilities),
+                    'sql': fetch_sql}
+        sections = {}
+        snapshot = self._schema.get_snapshot(table_name) if 'columns' in requested else None
+        if snapshot is not None:
+            section_start = time.time()
+            records = snapshot.get_columns(table_name)
+            for i in range(0, records.__len__()):
+                records[i]['recid'] = i + 1
+            sections['columns'] = {'result': records,
+                                   'elapsedTime': int((time.time() - section_start) * 1000)}
+        tasks = dict((name, fetchers[name]) for name in TABLE_BUNDLE_SECTIONS
+                     if name in requested and name not in sections)
+        if options.get('concurrent', True) and tasks.__len__() > 1:
+            sections.update(self._db_connection.run_concurrently(tasks))
+        else:
+            db_conn = self._db_connection.get_connection()
+            for name, task in tasks.items():
+                section_start = time.time()
+                try:
+                    sections[name] = {'result': task(db_conn)}
+                except Exception as e:
+                    sections[name] = {'error': str(e)}
+                sections[name]['elapsedTime'] = int((time.time() - section_start) * 1000)
+        emit('table_bundle_result', {'tableName': table_name,
+                                     'sections': sections,
+                                     'elapsedTime': int((time.time() - start_time) * 1000)},
+             namespace=self._namespace_url)
 
     def on_get_columns_to_edit(self, table_name):
         """For internal use only: will be called when 'get_columns_to_edit' event will be emitted
@@ -1026,12 +5352,12 @@ class DatabaseTableServer(Namespace):
                     AND b.column_name = f.column_name (+)
                     AND b.table_name = g.table_name (+)
                     AND b.column_name = g.column_name (+)
-                    AND a.table_name = '%s'
+                    AND a.table_name = :table_name
                     AND c.constraint_type (+)= 'P'
                 ORDER BY
                     b.column_id
-                """ % table_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1062,11 +5388,22 @@ class DatabaseTableServer(Namespace):
 
     def on_get_column_constraints(self, props):
         """For internal use only: will be called when 'get_column_constraints' event will be emitted
-        """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
+        """
         table_name = props['tableName']
         column_name = props['columnName']
+        snapshot = self._schema.get_snapshot(table_name)
+        if snapshot is not None:
+            constraints = snapshot.get_column_constraints(table_name, column_name)
+            result_array = []
+            for i in range(0, constraints.__len__()):
+                result_array.append({'recid': i + 1,
+                                     'constraintName': constraints[i]['constraintName'],
+                                     'constraintType': constraints[i]['type'] or constraints[i]['constraintType']
+                                     })
+            emit('column_constraints_result', result_array, namespace=self._namespace_url)
+            return
+        db_conn = self._db_connection.get_connection()
+        cursor = db_conn.cursor()
         query = """
                 SELECT
                     ROWNUM,
@@ -1083,10 +5420,10 @@ class DatabaseTableServer(Namespace):
                 WHERE
                     a.constraint_name = b.constraint_name
                     AND a.table_name = b.table_name
-                    AND a.table_name='%s'
-                    AND b.column_name='%s'
-                """ % (table_name, column_name)
-        cursor.execute(query)
+                    AND a.table_name=:table_name
+                    AND b.column_name=:column_name
+                """
+        cursor.execute(query, table_name=table_name, column_name=column_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1098,10 +5435,21 @@ class DatabaseTableServer(Namespace):
     def on_get_column_indexes(self, props):
         """For internal use only: will be called when 'get_column_indexes' event will be emitted
         """
-        db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
         table_name = props['tableName']
         column_name = props['columnName']
+        snapshot = self._schema.get_snapshot(table_name)
+        if snapshot is not None:
+            indexes = snapshot.get_column_indexes(table_name, column_name)
+            result_array = []
+            for i in range(0, indexes.__len__()):
+                result_array.append({'recid': i + 1,
+                                     'indexName': indexes[i]['indexName'],
+                                     'indexType': indexes[i]['indexType']
+                                     })
+            emit('column_indexes_result', result_array, namespace=self._namespace_url)
+            return
+        db_conn = self._db_connection.get_connection()
+        cursor = db_conn.cursor()
         query = """
                 SELECT
                     ROWNUM,
@@ -1116,10 +5464,10 @@ class DatabaseTableServer(Namespace):
                 WHERE
                     a.index_name = b.index_name
                     AND a.table_name = b.table_name
-                    AND a.table_name='%s'
-                    AND b.column_name='%s'
-                """ % (table_name, column_name)
-        cursor.execute(query)
+                    AND a.table_name=:table_name
+                    AND b.column_name=:column_name
+                """
+        cursor.execute(query, table_name=table_name, column_name=column_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1149,25 +5497,25 @@ class DatabaseTableServer(Namespace):
                 AND EXISTS (SELECT 1
                             FROM   SYS.ALL_TRIGGERS T
                             WHERE  T.OWNER = S.OWNER
-                            AND    T.TABLE_NAME = '%s' 
+                            AND    T.TABLE_NAME = :table_name
                             AND    T.TRIGGER_NAME = S.NAME
                             AND    T.TABLE_OWNER = S.OWNER
                             AND    T.BASE_OBJECT_TYPE = 'TABLE'
-                            AND    T.TRIGGER_TYPE LIKE '%%EACH ROW'
-                            AND    T.TRIGGERING_EVENT LIKE '%%INSERT%%'
+                            AND    T.TRIGGER_TYPE LIKE '%EACH ROW'
+                            AND    T.TRIGGERING_EVENT LIKE '%INSERT%'
                             AND EXISTS (SELECT 1
                                         FROM   SYS.ALL_SOURCE S2
                                         WHERE  S2.OWNER = S.OWNER
                                         AND    S2.NAME = S.NAME
                                         AND    S2.TYPE = S2.TYPE
-                                        AND    S2.TEXT LIKE '%%COLUMN_SEQUENCES%%'
+                                        AND    S2.TEXT LIKE '%COLUMN_SEQUENCES%'
                                         )
                              )
-                AND S.TEXT LIKE '%%NEXTVAL%%'
-                AND S.TEXT LIKE '%%:NEW.%s%%'
+                AND S.TEXT LIKE '%NEXTVAL%'
+                AND S.TEXT LIKE '%:NEW.' || :column_name || '%'
                 ORDER BY S.NAME, S.LINE
-                """ % (table_name, column_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name, column_name=column_name)
         result_array = []
         for result in cursor:
             result_array.append({'triggerName': result[0],
@@ -1180,7 +5528,7 @@ class DatabaseTableServer(Namespace):
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
-        cursor.execute("SELECT sequence_name FROM sys.all_sequences WHERE sequence_owner='" + schema_name + "'")
+        cursor.execute("SELECT sequence_name FROM sys.all_sequences WHERE sequence_owner=:schema_name", schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1213,7 +5561,7 @@ class DatabaseTableServer(Namespace):
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
-        cursor.execute("SELECT type_name FROM SYS.all_types WHERE owner='" + schema_name + "'")
+        cursor.execute("SELECT type_name FROM SYS.all_types WHERE owner=:schema_name", schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1222,6 +5570,13 @@ class DatabaseTableServer(Namespace):
     def on_get_constraints_to_edit(self, table_name):
         """For internal use only: will be called when 'get_constraints_to_edit' event will be emitted
         """
+        snapshot = self._schema.get_snapshot(table_name)
+        if snapshot is not None:
+            result_array = snapshot.get_constraints(table_name)
+            for i in range(0, result_array.__len__()):
+                result_array[i]['recid'] = i + 1
+            emit('constraints_result_to_edit', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -1253,9 +5608,9 @@ class DatabaseTableServer(Namespace):
                     SYS.user_constraints b
                 WHERE
                     a.r_constraint_name = b.constraint_name (+)
-                    AND a.table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    AND a.table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1279,7 +5634,7 @@ class DatabaseTableServer(Namespace):
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
-        cursor.execute("SELECT table_name FROM SYS.all_tables WHERE owner='" + schema_name + "'")
+        cursor.execute("SELECT table_name FROM SYS.all_tables WHERE owner=:schema_name", schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1292,8 +5647,8 @@ class DatabaseTableServer(Namespace):
         cursor = db_conn.cursor()
         cursor.execute("""SELECT constraint_name
                             FROM SYS.all_constraints
-                            WHERE table_name='""" + table_name + "' " + """
-                            AND constraint_type in ('P', 'U')""")
+                            WHERE table_name=:table_name
+                            AND constraint_type in ('P', 'U')""", table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1302,11 +5657,16 @@ class DatabaseTableServer(Namespace):
     def on_get_columns_list(self, table_name):
         """For internal use only: will be called when 'get_ref_columns_list' event will be emitted
         """
+        snapshot = self._schema.get_snapshot(table_name)
+        if snapshot is not None:
+            emit('columns_list_result', [column['columnName'] for column in snapshot.get_columns(table_name)],
+                 namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         cursor.execute("""SELECT column_name
                             FROM SYS.user_tab_columns
-                            WHERE table_name='""" + table_name + "'")
+                            WHERE table_name=:table_name""", table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1319,12 +5679,14 @@ class DatabaseTableServer(Namespace):
         ref_constraint_name = props['refConstraintName']
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
-        cursor.execute("SELECT column_name FROM SYS.all_cons_columns WHERE constraint_name='" + constraint_name + "'")
+        cursor.execute("SELECT column_name FROM SYS.all_cons_columns WHERE constraint_name=:constraint_name",
+                       constraint_name=constraint_name)
         local_columns = []
         for result in cursor:
             local_columns.append(result[0])
         cursor = db_conn.cursor()
-        cursor.execute("SELECT column_name FROM SYS.all_cons_columns WHERE constraint_name='" + ref_constraint_name + "'")
+        cursor.execute("SELECT column_name FROM SYS.all_cons_columns WHERE constraint_name=:constraint_name",
+                       constraint_name=ref_constraint_name)
         ref_columns = []
         for result in cursor:
             ref_columns.append(result[0])
@@ -1345,9 +5707,15 @@ class DatabaseTableServer(Namespace):
     def on_get_constraint_columns(self, constraint_name):
         """For internal use only: will be called when 'get_constraint_columns' event will be emitted
         """
+        snapshot = self._schema.get_snapshot()
+        result_array = snapshot.get_constraint_columns(constraint_name) if snapshot is not None else None
+        if result_array is not None:
+            emit('constraint_columns_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
-        cursor.execute("SELECT column_name FROM SYS.all_cons_columns WHERE constraint_name='" + constraint_name + "'")
+        cursor.execute("SELECT column_name FROM SYS.all_cons_columns WHERE constraint_name=:constraint_name",
+                       constraint_name=constraint_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1403,10 +5771,10 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_indexes
                 WHERE
-                    table_name='%s'
+                    table_name=:table_name
                     AND index_type != 'LOB'
-                """ % table_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1449,9 +5817,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.user_ind_columns
                 WHERE
-                    index_name='%s'
-                """ % index_name
-        cursor.execute(query)
+                    index_name=:index_name
+                """
+        cursor.execute(query, index_name=index_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1470,9 +5838,9 @@ class DatabaseTableServer(Namespace):
                 FROM
                     SYS.all_indextypes
                 WHERE
-                    implementation_schema='%s'
-                """ % schema_name
-        cursor.execute(query)
+                    implementation_schema=:schema_name
+                """
+        cursor.execute(query, schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1498,9 +5866,9 @@ class DatabaseTableServer(Namespace):
                 SELECT
                     decode(iot_type, 'IOT', 'IOT', 'NORMAL') as table_type
                 FROM SYS.user_tables
-                WHERE table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                WHERE table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         table_type = ''
         for result in cursor:
             table_type = result[0]
@@ -1527,8 +5895,8 @@ class DatabaseTableServer(Namespace):
                     FROM
                         SYS.user_tables
                     WHERE
-                        table_name='%s'
-                    """ % table_name
+                        table_name=:table_name
+                    """
         else:
             query = """
                     SELECT
@@ -1551,10 +5919,10 @@ class DatabaseTableServer(Namespace):
                     FROM
                         SYS.user_indexes
                     WHERE
-                        table_name='%s'
+                        table_name=:table_name
                         AND index_type = 'IOT - TOP'
-                    """ % table_name
-        cursor.execute(query)
+                    """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append({'parallelDegree': result[0],
@@ -1607,9 +5975,9 @@ class DatabaseTableServer(Namespace):
                         ) AS external_tab
                     FROM SYS.user_tables a
                     WHERE
-                        a.table_name = '%s')
-                """ % table_name
-        cursor.execute(query)
+                        a.table_name = :table_name)
+                """
+        cursor.execute(query, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1620,14 +5988,15 @@ class DatabaseTableServer(Namespace):
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
-        cursor.execute("SELECT comments FROM SYS.user_tab_comments WHERE table_name='" + table_name + "'")
+        cursor.execute("SELECT comments FROM SYS.user_tab_comments WHERE table_name=:table_name", table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
         emit('table_comments_result', result_array, namespace=self._namespace_url)
 
 
-class DatabaseViewServer(Namespace):
+@metered_handlers
+class DatabaseViewServer(DatabaseNamespace):
     """Class to interact with the database view available under schema
         provided as parameter to the class
     """
@@ -1637,6 +6006,7 @@ class DatabaseViewServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseTableServer class
@@ -1684,10 +6054,10 @@ class DatabaseViewServer(Namespace):
                     AND a.column_name = b.column_name (+)
                     AND a.table_name = c.table_name (+)
                     AND a.column_name = c.column_name (+)
-                    AND a.table_name='%s'
+                    AND a.table_name=:view_name
                 ORDER BY a.column_id
-                """ % view_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1705,17 +6075,24 @@ class DatabaseViewServer(Namespace):
     def on_get_column_headers(self, view_name):
         """For internal use only: will be called when 'get_column_headers' event will be emitted
         """
+        snapshot = self._schema.get_snapshot(view_name)
+        if snapshot is not None:
+            result_array = [{'field': column['columnName'],
+                             'caption': column['columnName'],
+                             'size': '100px'} for column in snapshot.get_columns(view_name)]
+            emit('column_headers_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
                 SELECT a.column_name
                 FROM SYS.user_tab_columns a
                 WHERE
-                    a.table_name='%s'
+                    a.table_name=:view_name
                 ORDER BY
                     a.column_id
-                """ % view_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'field': result[0],
@@ -1723,42 +6100,41 @@ class DatabaseViewServer(Namespace):
                                  'size': '100px'})
         emit('column_headers_result', result_array, namespace=self._namespace_url)
 
-    def on_get_data(self, view_name):
+    def on_get_data(self, view_name, options=None):
         """For internal use only: will be called when 'get_data' event will be emitted
+
+            Args:
+                view_name (string): Name of the object to read the rows from
+                options (dict, optional): 'limit' as the page size and 'token' as
+                    received with the previous page, see fetch_data_page(), or
+                    'stream' to receive all rows as 'data_chunk' events instead
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
-                SELECT a.column_name
+                SELECT
+                    a.column_name,
+                    a.data_type,
+                    SYS_CONTEXT('USERENV', 'NLS_SORT')
                 FROM SYS.user_tab_columns a
                 WHERE
-                    a.table_name='%s'
+                    a.table_name=:view_name
                 ORDER BY
                     a.column_id
-                """ % view_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, view_name=view_name)
         column_headers = []
+        order_columns = []
         for result in cursor:
             column_headers.append(result[0])
-        header_string = 'ROWNUM'
-        for header in column_headers:
-            header_string += ', ' + header
-        query = """
-                SELECT %s
-                FROM %s
-                """ % (header_string, view_name)
-        cursor = db_conn.cursor()
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            row = {}
-            for i in range(0, column_headers.__len__() + 1):
-                if i == 0:
-                    row['recid'] = result[i]
-                else:
-                    row[column_headers[i - 1]] = str(result[i])
-            result_array.append(row)
-        emit('data_result', result_array, namespace=self._namespace_url)
+            if (result[1] or '').startswith(ORDERABLE_DATA_TYPES):
+                order_columns.append(get_sort_expression(quote_identifier(result[0]), result[1], result[2]))
+        if options is not None and options.get('stream'):
+            stream_data(self._socket_io, db_conn, view_name, column_headers, self._namespace_url, options)
+            return
+        result = fetch_data_page(db_conn, view_name, column_headers, options=options,
+                                 capabilities=self._db_connection.get_capabilities(), order_columns=order_columns)
+        emit('data_result', result, namespace=self._namespace_url)
 
     def on_get_grants(self, view_name):
         """For internal use only: will be called when 'get_grants' event will be emitted
@@ -1776,9 +6152,9 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_tab_privs
                 WHERE
-                    table_name='%s'
-                """ % view_name
-        cursor.execute(query)
+                    table_name=:view_name
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1807,9 +6183,9 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_triggers
                 WHERE
-                    table_name='%s'
-                """ % view_name
-        cursor.execute(query)
+                    table_name=:view_name
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1833,11 +6209,11 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_source
                 WHERE
-                    name='%s'
+                    name=:trigger_name
                     AND type='TRIGGER'
                 ORDER BY line
-                """ % trigger_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, trigger_name=trigger_name)
         result_string = ""
         for result in cursor:
             result_string += result[0]
@@ -1846,6 +6222,10 @@ class DatabaseViewServer(Namespace):
     def on_get_dependencies(self, view_name):
         """For internal use only: will be called when 'get_dependencies' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            emit('dependencies_result', graph.get_dependency_records(view_name, 'downstream'), namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -1859,9 +6239,9 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_dependencies
                 WHERE
-                    referenced_name='%s'
-                """ % view_name
-        cursor.execute(query)
+                    referenced_name=:view_name
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1876,6 +6256,10 @@ class DatabaseViewServer(Namespace):
     def on_get_dependencies_details(self, view_name):
         """For internal use only: will be called when 'get_dependencies_details' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            emit('dependencies_details_result', graph.get_dependency_records(view_name, 'upstream'), namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -1889,9 +6273,9 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_dependencies
                 WHERE
-                    name='%s'
-                """ % view_name
-        cursor.execute(query)
+                    name=:view_name
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1911,9 +6295,9 @@ class DatabaseViewServer(Namespace):
         # ########### Get DDL of view ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('VIEW', '%s')) FROM dual
-                """ % table_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('VIEW', :table_name)) FROM dual
+                """
+        cursor.execute(query, table_name=table_name)
         for result in cursor:
             sql = result[0]
         sql += ';\n\n'
@@ -1929,10 +6313,10 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_col_comments
                 WHERE
-                    table_name='%s'
+                    table_name=:table_name
                     AND comments IS NOT NULL
-                """ % table_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         for result in cursor:
             sql += '  ' + result[0] + '\n'
         # ########## Get comments on view if available ##########
@@ -1946,10 +6330,10 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_tab_comments
                 WHERE
-                    table_name='%s'
+                    table_name=:table_name
                     AND comments IS NOT NULL
-                """ % table_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, table_name=table_name)
         for result in cursor:
             sql += '  ' + result[0] + '\n'
         # ########## Get Triggers if available ##############
@@ -1960,9 +6344,9 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_triggers
                 WHERE
-                    table_name='%s'
-                """ % table_name
-        cursor.execute(query)
+                    table_name=:table_name
+                """
+        cursor.execute(query, table_name=table_name)
         for result in cursor:
             sql += result[0] + '\n'
         emit('sql_result', sql, namespace=self._namespace_url)
@@ -1981,9 +6365,9 @@ class DatabaseViewServer(Namespace):
                 FROM
                     SYS.user_errors
                 WHERE
-                    name='%s'
-                """ % view_name
-        cursor.execute(query)
+                    name=:view_name
+                """
+        cursor.execute(query, view_name=view_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -1994,7 +6378,8 @@ class DatabaseViewServer(Namespace):
         emit('errors_result', result_array, namespace=self._namespace_url)
 
 
-class DatabaseIndexServer(Namespace):
+@metered_handlers
+class DatabaseIndexServer(DatabaseNamespace):
     """Class to interact with the database index available under schema
         provided as parameter to the class
     """
@@ -2004,6 +6389,7 @@ class DatabaseIndexServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseIndexServer class
@@ -2041,9 +6427,9 @@ class DatabaseIndexServer(Namespace):
                 WHERE
                     a.index_name = b.index_name (+)
                     AND a.table_name = b.table_name (+)
-                    AND a.index_name='%s'
-                """ % index_name
-        cursor.execute(query)
+                    AND a.index_name=:index_name
+                """
+        cursor.execute(query, index_name=index_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2064,54 +6450,54 @@ class DatabaseIndexServer(Namespace):
                 SELECT ROWNUM, a.*
                 FROM
                 (
-                    SELECT 'INDEX_NAME', INDEX_NAME FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'INDEX_NAME', INDEX_NAME FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'TABLE_OWNER', TABLE_OWNER FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'TABLE_OWNER', TABLE_OWNER FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'TABLE_NAME', TABLE_NAME FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'TABLE_NAME', TABLE_NAME FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'PARTITION_NAME', PARTITION_NAME FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'PARTITION_NAME', PARTITION_NAME FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'PARTITION_POSITION', to_char(PARTITION_POSITION) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'PARTITION_POSITION', to_char(PARTITION_POSITION) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'SUBPARTITION_NAME', SUBPARTITION_NAME FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'SUBPARTITION_NAME', SUBPARTITION_NAME FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'SUBPARTITION_POSITION', to_char(SUBPARTITION_POSITION) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'SUBPARTITION_POSITION', to_char(SUBPARTITION_POSITION) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'OBJECT_TYPE', OBJECT_TYPE FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'OBJECT_TYPE', OBJECT_TYPE FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'BLEVEL', to_char(BLEVEL)  FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'BLEVEL', to_char(BLEVEL)  FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'LEAF_BLOCKS', to_char(LEAF_BLOCKS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'LEAF_BLOCKS', to_char(LEAF_BLOCKS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'DISTINCT_KEYS', to_char(DISTINCT_KEYS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'DISTINCT_KEYS', to_char(DISTINCT_KEYS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'AVG_LEAF_BLOCKS_PER_KEY', to_char(AVG_LEAF_BLOCKS_PER_KEY) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'AVG_LEAF_BLOCKS_PER_KEY', to_char(AVG_LEAF_BLOCKS_PER_KEY) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'AVG_DATA_BLOCKS_PER_KEY', to_char(AVG_DATA_BLOCKS_PER_KEY) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'AVG_DATA_BLOCKS_PER_KEY', to_char(AVG_DATA_BLOCKS_PER_KEY) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'CLUSTERING_FACTOR', to_char(CLUSTERING_FACTOR) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'CLUSTERING_FACTOR', to_char(CLUSTERING_FACTOR) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'NUM_ROWS', to_char(NUM_ROWS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'NUM_ROWS', to_char(NUM_ROWS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'AVG_CACHED_BLOCKS', to_char(AVG_CACHED_BLOCKS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'AVG_CACHED_BLOCKS', to_char(AVG_CACHED_BLOCKS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'AVG_CACHE_HIT_RATIO', to_char(AVG_CACHE_HIT_RATIO) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'AVG_CACHE_HIT_RATIO', to_char(AVG_CACHE_HIT_RATIO) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'SAMPLE_SIZE', to_char(SAMPLE_SIZE) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'SAMPLE_SIZE', to_char(SAMPLE_SIZE) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'LAST_ANALYZED', to_char(LAST_ANALYZED) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'LAST_ANALYZED', to_char(LAST_ANALYZED) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'GLOBAL_STATS', to_char(GLOBAL_STATS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'GLOBAL_STATS', to_char(GLOBAL_STATS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'USER_STATS', to_char(USER_STATS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'USER_STATS', to_char(USER_STATS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'STATTYPE_LOCKED', to_char(STATTYPE_LOCKED) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'STATTYPE_LOCKED', to_char(STATTYPE_LOCKED) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                     UNION
-                    SELECT 'STALE_STATS', to_char(STALE_STATS) FROM SYS.user_ind_statistics WHERE index_name='{0}'
+                    SELECT 'STALE_STATS', to_char(STALE_STATS) FROM SYS.user_ind_statistics WHERE index_name=:index_name
                 ) a
-                """.format(index_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, index_name=index_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2127,15 +6513,16 @@ class DatabaseIndexServer(Namespace):
         # ########### Get DDL of table ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('INDEX', '%s')) FROM dual
-                """ % index_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('INDEX', :index_name)) FROM dual
+                """
+        cursor.execute(query, index_name=index_name)
         for result in cursor:
             sql = result[0]
         emit('sql_result', sql, namespace=self._namespace_url)
 
 
-class DatabaseMaterializedViewServer(Namespace):
+@metered_handlers
+class DatabaseMaterializedViewServer(DatabaseNamespace):
     """Class to interact with the database mviews available under schema
         provided as parameter to the class
     """
@@ -2145,6 +6532,7 @@ class DatabaseMaterializedViewServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseTableServer class
@@ -2183,9 +6571,9 @@ class DatabaseMaterializedViewServer(Namespace):
                 WHERE
                     a.table_name = b.table_name (+)
                     AND a.column_name = b.column_name (+)
-                    AND a.table_name='%s'
-                """ % mview_name
-        cursor.execute(query)
+                    AND a.table_name=:mview_name
+                """
+        cursor.execute(query, mview_name=mview_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2200,17 +6588,24 @@ class DatabaseMaterializedViewServer(Namespace):
     def on_get_column_headers(self, mview_name):
         """For internal use only: will be called when 'get_column_headers' event will be emitted
         """
+        snapshot = self._schema.get_snapshot(mview_name)
+        if snapshot is not None:
+            result_array = [{'field': column['columnName'],
+                             'caption': column['columnName'],
+                             'size': '100px'} for column in snapshot.get_columns(mview_name)]
+            emit('column_headers_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
                 SELECT a.column_name
                 FROM SYS.user_tab_columns a
                 WHERE
-                    a.table_name='%s'
+                    a.table_name=:mview_name
                 ORDER BY
                     a.column_id
-                """ % mview_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, mview_name=mview_name)
         result_array = []
         for result in cursor:
             result_array.append({'field': result[0],
@@ -2218,8 +6613,14 @@ class DatabaseMaterializedViewServer(Namespace):
                                  'size': '100px'})
         emit('column_headers_result', result_array, namespace=self._namespace_url)
 
-    def on_get_data(self, mview_name):
+    def on_get_data(self, mview_name, options=None):
         """For internal use only: will be called when 'get_data' event will be emitted
+
+            Args:
+                mview_name (string): Name of the object to read the rows from
+                options (dict, optional): 'limit' as the page size and 'token' as
+                    received with the previous page, see fetch_data_page(), or
+                    'stream' to receive all rows as 'data_chunk' events instead
         """
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
@@ -2227,33 +6628,20 @@ class DatabaseMaterializedViewServer(Namespace):
                 SELECT a.column_name
                 FROM SYS.user_tab_columns a
                 WHERE
-                    a.table_name='%s'
+                    a.table_name=:mview_name
                 ORDER BY
                     a.column_id
-                """ % mview_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, mview_name=mview_name)
         column_headers = []
         for result in cursor:
             column_headers.append(result[0])
-        header_string = 'ROWNUM'
-        for header in column_headers:
-            header_string += ', ' + header
-        query = """
-                SELECT %s
-                FROM %s
-                """ % (header_string, mview_name)
-        cursor = db_conn.cursor()
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            row = {}
-            for i in range(0, column_headers.__len__() + 1):
-                if i == 0:
-                    row['recid'] = result[i]
-                else:
-                    row[column_headers[i - 1]] = str(result[i])
-            result_array.append(row)
-        emit('data_result', result_array, namespace=self._namespace_url)
+        if options is not None and options.get('stream'):
+            stream_data(self._socket_io, db_conn, mview_name, column_headers, self._namespace_url, options)
+            return
+        result = fetch_data_page(db_conn, mview_name, column_headers, ['ROWID'], options,
+                                 self._db_connection.get_capabilities())
+        emit('data_result', result, namespace=self._namespace_url)
 
     def on_get_grants(self, mview_name):
         """For internal use only: will be called when 'get_grants' event will be emitted
@@ -2271,9 +6659,9 @@ class DatabaseMaterializedViewServer(Namespace):
                 FROM
                     SYS.user_tab_privs
                 WHERE
-                    table_name='%s'
-                """ % mview_name
-        cursor.execute(query)
+                    table_name=:mview_name
+                """
+        cursor.execute(query, mview_name=mview_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2288,6 +6676,10 @@ class DatabaseMaterializedViewServer(Namespace):
     def on_get_dependencies(self, mview_name):
         """For internal use only: will be called when 'get_dependencies' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            emit('dependencies_result', graph.get_dependency_records(mview_name, 'downstream'), namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -2301,9 +6693,9 @@ class DatabaseMaterializedViewServer(Namespace):
                 FROM
                     SYS.user_dependencies
                 WHERE
-                    referenced_name='%s'
-                """ % mview_name
-        cursor.execute(query)
+                    referenced_name=:mview_name
+                """
+        cursor.execute(query, mview_name=mview_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2318,6 +6710,10 @@ class DatabaseMaterializedViewServer(Namespace):
     def on_get_dependencies_details(self, mview_name):
         """For internal use only: will be called when 'get_dependencies_details' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            emit('dependencies_details_result', graph.get_dependency_records(mview_name, 'upstream'), namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -2331,9 +6727,9 @@ class DatabaseMaterializedViewServer(Namespace):
                 FROM
                     SYS.user_dependencies
                 WHERE
-                    name='%s'
-                """ % mview_name
-        cursor.execute(query)
+                    name=:mview_name
+                """
+        cursor.execute(query, mview_name=mview_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2349,18 +6745,9 @@ class DatabaseMaterializedViewServer(Namespace):
         """For internal use only: will be called when 'get_indexes' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
+        capabilities = self._db_connection.get_capabilities()
         cursor = db_conn.cursor()
-        # ########## Get Oracle Version ################
-        version_str = ""
-        query = "SELECT version FROM PRODUCT_COMPONENT_VERSION WHERE product LIKE '%Oracle%'"
-        cursor.execute(query)
-        for result in cursor:
-            version_str = result[0]
-        version_array = version_str.split('.')
-        version = int(version_array[0])
-        # ######### Get Indexes based on version #####################
-        cursor = db_conn.cursor()
-        if version <= 10:
+        if capabilities is None or not capabilities.supports('listagg'):
             query = """
                 SELECT
                     ROWNUM,
@@ -2383,8 +6770,8 @@ class DatabaseMaterializedViewServer(Namespace):
                     GROUP BY index_name) b
                 WHERE
                     a.index_name = b.index_name
-                    AND a.table_name='%s'
-                """ % mview_name
+                    AND a.table_name=:mview_name
+                """
         else:
             query = """
                     SELECT
@@ -2411,9 +6798,9 @@ class DatabaseMaterializedViewServer(Namespace):
                         GROUP BY index_name) b
                     WHERE
                         a.index_name = b.index_name
-                        AND a.table_name='%s'
-                    """ % mview_name
-        cursor.execute(query)
+                        AND a.table_name=:mview_name
+                    """
+        cursor.execute(query, mview_name=mview_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2457,10 +6844,10 @@ class DatabaseMaterializedViewServer(Namespace):
                     AND a.table_name = b.table_name (+)
                     AND a.index_name = c.index_name (+)
                     AND a.table_name = c.table_name (+)
-                    AND a.table_name='%s'
-                    AND a.index_name='%s'
-                """ % (mview_name, index_name)
-        cursor.execute(query)
+                    AND a.table_name=:mview_name
+                    AND a.index_name=:index_name
+                """
+        cursor.execute(query, mview_name=mview_name, index_name=index_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2484,9 +6871,9 @@ class DatabaseMaterializedViewServer(Namespace):
         # ########### Get DDL of table ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('MATERIALIZED_VIEW', '%s')) FROM dual
-                """ % mview_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('MATERIALIZED_VIEW', :mview_name)) FROM dual
+                """
+        cursor.execute(query, mview_name=mview_name)
         for result in cursor:
             sql = result[0]
         sql += ';\n\n'
@@ -2502,10 +6889,10 @@ class DatabaseMaterializedViewServer(Namespace):
                 FROM
                     SYS.user_col_comments
                 WHERE
-                    table_name='%s'
+                    table_name=:mview_name
                     AND comments IS NOT NULL
-                """ % mview_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, mview_name=mview_name)
         for result in cursor:
             sql += '  ' + result[0] + '\n'
         # ########## Get comments on table if available ##########
@@ -2519,10 +6906,10 @@ class DatabaseMaterializedViewServer(Namespace):
                 FROM
                     SYS.user_mview_comments
                 WHERE
-                    mview_name='%s'
+                    mview_name=:mview_name
                     AND comments IS NOT NULL
-                """ % mview_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, mview_name=mview_name)
         for result in cursor:
             sql += '  ' + result[0] + '\n'
         # ########## Get indexes if available #################
@@ -2533,15 +6920,16 @@ class DatabaseMaterializedViewServer(Namespace):
                 FROM
                     SYS.user_indexes
                 WHERE
-                    table_name='%s'
-                """ % mview_name
-        cursor.execute(query)
+                    table_name=:mview_name
+                """
+        cursor.execute(query, mview_name=mview_name)
         for result in cursor:
             sql += result[0] + '\n'
         emit('sql_result', sql, namespace=self._namespace_url)
 
 
-class DatabasePLSQLServer(Namespace):
+@metered_handlers
+class DatabasePLSQLServer(DatabaseNamespace):
     """Class to interact with the database procedure, function or package available under schema
         provided as parameter to the class
     """
@@ -2551,6 +6939,7 @@ class DatabasePLSQLServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabasePLSQLServer class
@@ -2583,15 +6972,17 @@ class DatabasePLSQLServer(Namespace):
                     FROM
                         SYS.user_source
                     WHERE
-                        name='%s'
+                        name=:object_name
                         AND type in ('PACKAGE', 'TYPE')
                     ORDER BY line
-                    """ % object_name
+                    """
+            params = {'object_name': object_name}
         else:
             query = """
-                    SELECT to_char(dbms_metadata.get_ddl('%s', '%s')) FROM dual
-                    """ % (object_type, object_name)
-        cursor.execute(query)
+                    SELECT to_char(dbms_metadata.get_ddl(:object_type, :object_name)) FROM dual
+                    """
+            params = {'object_type': object_type, 'object_name': object_name}
+        cursor.execute(query, params)
         for result in cursor:
             sql = sql + result[0]
         if object_type == 'PACKAGE' or object_type == 'TYPE':
@@ -2612,9 +7003,9 @@ class DatabasePLSQLServer(Namespace):
                 FROM
                     SYS.user_errors
                 WHERE
-                    name='%s'
-                """ % object_name
-        cursor.execute(query)
+                    name=:object_name
+                """
+        cursor.execute(query, object_name=object_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2624,9 +7015,27 @@ class DatabasePLSQLServer(Namespace):
                                  })
         emit('errors_result', result_array, namespace=self._namespace_url)
 
-    def on_get_dependencies(self, object_name, object_type):
+    def on_get_dependencies(self, object_name, object_type, options=None):
         """For internal use only: will be called when 'get_dependencies' event will be emitted
-        """
+
+            Args:
+                object_name (string): Name of the object
+                object_type (string): Type of the object
+                options (dict, optional): 'maxDepth' as the number of levels of
+                    dependencies to return, all by default
+        """
+        max_depth = (options or {}).get('maxDepth')
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            result_array = []
+            for value in graph.closure(graph.get_object_ids(object_name, object_type), 'upstream', max_depth):
+                if value['owner'] in ('SYS', 'SYSTEM') or value['name'] == 'DUAL':
+                    continue
+                value['recid'] = result_array.__len__() + 1
+                value['typeLink'] = value['type'].replace(' ', '_')
+                result_array.append(value)
+            emit('dependencies_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -2649,9 +7058,10 @@ class DatabasePLSQLServer(Namespace):
                         FROM
                             public_dependency
                         START WITH
-                            object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name='%s' and object_type='%s')
+                            object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name=:object_name and object_type=:object_type)
                         CONNECT BY NOCYCLE
                             PRIOR referenced_object_id = object_id
+                            AND LEVEL <= NVL(:max_depth, LEVEL)
                     ) c
                 WHERE
                     b.object_id = c.referenced_object_id
@@ -2660,8 +7070,8 @@ class DatabasePLSQLServer(Namespace):
                         'SYSTEM'
                     )
                     AND b.object_name <> 'DUAL'
-                """ % (object_name, object_type)
-        cursor.execute(query)
+                """
+        cursor.execute(query, object_name=object_name, object_type=object_type, max_depth=max_depth)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2690,9 +7100,9 @@ class DatabasePLSQLServer(Namespace):
                 FROM
                     SYS.user_tab_privs
                 WHERE
-                    table_name='%s'
-                """ % object_name
-        cursor.execute(query)
+                    table_name=:object_name
+                """
+        cursor.execute(query, object_name=object_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2704,9 +7114,25 @@ class DatabasePLSQLServer(Namespace):
                                  })
         emit('grants_result', result_array, namespace=self._namespace_url)
 
-    def on_get_references(self, object_name, object_type):
+    def on_get_references(self, object_name, object_type, options=None):
         """For internal use only: will be called when 'get_references' event will be emitted
-        """
+
+            Args:
+                object_name (string): Name of the object
+                object_type (string): Type of the object
+                options (dict, optional): 'maxDepth' as the number of levels of
+                    referencing objects to return, all by default
+        """
+        max_depth = (options or {}).get('maxDepth')
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            result_array = []
+            for value in graph.closure(graph.get_object_ids(object_name, object_type), 'downstream', max_depth):
+                value['recid'] = result_array.__len__() + 1
+                value['typeLink'] = value['type'].replace(' ', '_').replace('PACKAGE_BODY', 'PACKAGE')
+                result_array.append(value)
+            emit('references_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -2729,12 +7155,13 @@ class DatabasePLSQLServer(Namespace):
                             public_dependency
                         CONNECT BY NOCYCLE
                             PRIOR object_id = referenced_object_id
-                        START WITH referenced_object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name='%s' and object_type='%s')
+                            AND LEVEL <= NVL(:max_depth, LEVEL)
+                        START WITH referenced_object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name=:object_name and object_type=:object_type)
                     ) hier
                 WHERE
                     hier.object_id = o.object_id
-                """ % (object_name, object_type)
-        cursor.execute(query)
+                """
+        cursor.execute(query, object_name=object_name, object_type=object_type, max_depth=max_depth)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2748,7 +7175,8 @@ class DatabasePLSQLServer(Namespace):
         emit('references_result', result_array, namespace=self._namespace_url)
 
 
-class DatabaseSequenceServer(Namespace):
+@metered_handlers
+class DatabaseSequenceServer(DatabaseNamespace):
     """Class to interact with the database sequence available under schema
         provided as parameter to the class
     """
@@ -2758,6 +7186,7 @@ class DatabaseSequenceServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseSequenceServer class
@@ -2782,27 +7211,27 @@ class DatabaseSequenceServer(Namespace):
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.* FROM
-                (SELECT 'CREATED', to_char(CREATED) FROM SYS.user_objects WHERE object_name='{0}'
+                (SELECT 'CREATED', to_char(CREATED) FROM SYS.user_objects WHERE object_name=:sequence_name
                 UNION
-                SELECT 'LAST_DDL_TIME', to_char(LAST_DDL_TIME) FROM SYS.user_objects WHERE object_name='{0}'
+                SELECT 'LAST_DDL_TIME', to_char(LAST_DDL_TIME) FROM SYS.user_objects WHERE object_name=:sequence_name
                 UNION
-                SELECT 'SEQUENCE_NAME', SEQUENCE_NAME FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'SEQUENCE_NAME', SEQUENCE_NAME FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'MIN_VALUE', to_char(MIN_VALUE) FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'MIN_VALUE', to_char(MIN_VALUE) FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'MAX_VALUE', to_char(MAX_VALUE) FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'MAX_VALUE', to_char(MAX_VALUE) FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'INCREMENT_BY', to_char(INCREMENT_BY) FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'INCREMENT_BY', to_char(INCREMENT_BY) FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'CYCLE_FLAG', CYCLE_FLAG FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'CYCLE_FLAG', CYCLE_FLAG FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'ORDER_FLAG', ORDER_FLAG FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'ORDER_FLAG', ORDER_FLAG FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'CACHE_SIZE', to_char(CACHE_SIZE) FROM SYS.user_sequences WHERE sequence_name='{0}'
+                SELECT 'CACHE_SIZE', to_char(CACHE_SIZE) FROM SYS.user_sequences WHERE sequence_name=:sequence_name
                 UNION
-                SELECT 'LAST_NUMBER', to_char(LAST_NUMBER) FROM SYS.user_sequences WHERE sequence_name='{0}') a
-                """.format(sequence_name)
-        cursor.execute(query)
+                SELECT 'LAST_NUMBER', to_char(LAST_NUMBER) FROM SYS.user_sequences WHERE sequence_name=:sequence_name) a
+                """
+        cursor.execute(query, sequence_name=sequence_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2813,6 +7242,20 @@ class DatabaseSequenceServer(Namespace):
     def on_get_dependencies(self, sequence_name):
         """For internal use only: will be called when 'get_dependencies' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            result_array = []
+            for value in graph.closure(graph.get_object_ids(sequence_name, 'SEQUENCE'), 'upstream'):
+                if value['owner'] in ('SYS', 'SYSTEM') or value['name'] == 'DUAL':
+                    continue
+                result_array.append({'recid': result_array.__len__() + 1,
+                                     'objectId': value['objectId'],
+                                     'objectType': value['type'],
+                                     'objectName': value['name'],
+                                     'status': value['status'],
+                                     'typeLink': value['type'].replace(' ', '_')})
+            emit('dependencies_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -2833,7 +7276,7 @@ class DatabaseSequenceServer(Namespace):
                         FROM
                             public_dependency
                         START WITH
-                            object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name='%s' AND object_type='SEQUENCE')
+                            object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name=:sequence_name AND object_type='SEQUENCE')
                         CONNECT BY
                             PRIOR referenced_object_id = object_id
                     ) c
@@ -2850,8 +7293,8 @@ class DatabaseSequenceServer(Namespace):
                     )
                     AND a.object_name <> 'DUAL'
                     AND b.object_name <> 'DUAL'
-                """ % sequence_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, sequence_name=sequence_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2865,6 +7308,18 @@ class DatabaseSequenceServer(Namespace):
     def on_get_dependencies_details(self, sequence_name):
         """For internal use only: will be called when 'get_dependencies' event will be emitted
         """
+        graph = self._schema.get_dependency_graph()
+        if graph is not None:
+            result_array = []
+            for value in graph.closure(graph.get_object_ids(sequence_name, 'SEQUENCE'), 'downstream'):
+                result_array.append({'recid': result_array.__len__() + 1,
+                                     'objectId': value['objectId'],
+                                     'objectType': value['type'],
+                                     'objectName': value['name'],
+                                     'status': value['status'],
+                                     'typeLink': value['type'].replace(' ', '_').replace('PACKAGE_BODY', 'PACKAGE')})
+            emit('dependencies_details_result', result_array, namespace=self._namespace_url)
+            return
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         query = """
@@ -2885,10 +7340,10 @@ class DatabaseSequenceServer(Namespace):
                             public_dependency
                         CONNECT BY
                             PRIOR object_id = referenced_object_id
-                        START WITH referenced_object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name='%s' AND object_type='SEQUENCE')
+                        START WITH referenced_object_id = (SELECT object_id FROM SYS.user_objects WHERE object_name=:sequence_name AND object_type='SEQUENCE')
                     )
-                """ % sequence_name
-        cursor.execute(query)
+                """
+        cursor.execute(query, sequence_name=sequence_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2907,15 +7362,16 @@ class DatabaseSequenceServer(Namespace):
         # ########### Get DDL of table ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('SEQUENCE', '%s')) FROM dual
-                """ % sequence_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('SEQUENCE', :sequence_name)) FROM dual
+                """
+        cursor.execute(query, sequence_name=sequence_name)
         for result in cursor:
             sql = result[0]
         emit('sql_result', sql, namespace=self._namespace_url)
 
 
-class DatabaseSynonymServer(Namespace):
+@metered_handlers
+class DatabaseSynonymServer(DatabaseNamespace):
     """Class to interact with the database synonym available under schema
         provided as parameter to the class
     """
@@ -2925,6 +7381,7 @@ class DatabaseSynonymServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseSynonymServer class
@@ -2949,21 +7406,21 @@ class DatabaseSynonymServer(Namespace):
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.* FROM
-                (SELECT 'CREATED', to_char(CREATED) FROM SYS.user_objects WHERE object_name='{0}' AND object_type='SYNONYM'
+                (SELECT 'CREATED', to_char(CREATED) FROM SYS.user_objects WHERE object_name=:synonym_name AND object_type='SYNONYM'
                 UNION
-                SELECT 'LAST_DDL_TIME', to_char(LAST_DDL_TIME) FROM SYS.user_objects WHERE object_name='{0}' AND object_type='SYNONYM'
+                SELECT 'LAST_DDL_TIME', to_char(LAST_DDL_TIME) FROM SYS.user_objects WHERE object_name=:synonym_name AND object_type='SYNONYM'
                 UNION
-                SELECT 'SYNONYM_NAME', SYNONYM_NAME FROM SYS.user_synonyms WHERE synonym_name='{0}'
+                SELECT 'SYNONYM_NAME', SYNONYM_NAME FROM SYS.user_synonyms WHERE synonym_name=:synonym_name
                 UNION
-                SELECT 'OBJECT_OWNER', table_owner AS OBJECT_OWNER FROM SYS.user_synonyms WHERE synonym_name='{0}'
+                SELECT 'OBJECT_OWNER', table_owner AS OBJECT_OWNER FROM SYS.user_synonyms WHERE synonym_name=:synonym_name
                 UNION
-                SELECT 'OBJECT_NAME', table_name AS OBJECT_NAME FROM SYS.user_synonyms WHERE synonym_name='{0}'
+                SELECT 'OBJECT_NAME', table_name AS OBJECT_NAME FROM SYS.user_synonyms WHERE synonym_name=:synonym_name
                 UNION
-                SELECT 'OBJECT_TYPE', OBJECT_TYPE FROM SYS.user_objects WHERE object_name=(SELECT table_name FROM SYS.user_synonyms WHERE synonym_name='{0}')
+                SELECT 'OBJECT_TYPE', OBJECT_TYPE FROM SYS.user_objects WHERE object_name=(SELECT table_name FROM SYS.user_synonyms WHERE synonym_name=:synonym_name)
                 UNION
-                SELECT 'DB_LINK', DB_LINK FROM SYS.user_synonyms WHERE synonym_name='{0}') a
-                """.format(synonym_name)
-        cursor.execute(query)
+                SELECT 'DB_LINK', DB_LINK FROM SYS.user_synonyms WHERE synonym_name=:synonym_name) a
+                """
+        cursor.execute(query, synonym_name=synonym_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -2979,15 +7436,16 @@ class DatabaseSynonymServer(Namespace):
         # ########### Get DDL of table ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('SYNONYM', '%s')) FROM dual
-                """ % synonym_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('SYNONYM', :synonym_name)) FROM dual
+                """
+        cursor.execute(query, synonym_name=synonym_name)
         for result in cursor:
             sql = result[0]
         emit('sql_result', sql, namespace=self._namespace_url)
 
 
-class DatabaseLinkServer(Namespace):
+@metered_handlers
+class DatabaseLinkServer(DatabaseNamespace):
     """Class to interact with the database link available under schema
         provided as parameter to the class
     """
@@ -2997,6 +7455,7 @@ class DatabaseLinkServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseLinkServer class
@@ -3021,15 +7480,15 @@ class DatabaseLinkServer(Namespace):
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.* FROM
-                (SELECT 'CREATED', to_char(CREATED) FROM SYS.all_db_links WHERE db_link='{0}'
+                (SELECT 'CREATED', to_char(CREATED) FROM SYS.all_db_links WHERE db_link=:link_name
                 UNION
-                SELECT 'DB_LINK', DB_LINK FROM SYS.all_db_links WHERE db_link='{0}'
+                SELECT 'DB_LINK', DB_LINK FROM SYS.all_db_links WHERE db_link=:link_name
                 UNION
-                SELECT 'USERNAME', USERNAME FROM SYS.all_db_links WHERE db_link='{0}'
+                SELECT 'USERNAME', USERNAME FROM SYS.all_db_links WHERE db_link=:link_name
                 UNION
-                SELECT 'HOST', HOST FROM SYS.all_db_links WHERE db_link='{0}') a
-                """.format(link_name)
-        cursor.execute(query)
+                SELECT 'HOST', HOST FROM SYS.all_db_links WHERE db_link=:link_name) a
+                """
+        cursor.execute(query, link_name=link_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -3045,15 +7504,16 @@ class DatabaseLinkServer(Namespace):
         # ########### Get DDL of table ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('DB_LINK', '%s')) FROM dual
-                """ % link_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('DB_LINK', :link_name)) FROM dual
+                """
+        cursor.execute(query, link_name=link_name)
         for result in cursor:
             sql = result[0]
         emit('sql_result', sql, namespace=self._namespace_url)
 
 
-class DatabaseDirectoryServer(Namespace):
+@metered_handlers
+class DatabaseDirectoryServer(DatabaseNamespace):
     """Class to interact with the database directory available under schema
         provided as parameter to the class
     """
@@ -3063,6 +7523,7 @@ class DatabaseDirectoryServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseDirectoryServer class
@@ -3087,17 +7548,17 @@ class DatabaseDirectoryServer(Namespace):
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.* FROM
-                (SELECT 'DIRECTORY_NAME', DIRECTORY_NAME FROM SYS.all_directories WHERE directory_name='{0}'
+                (SELECT 'DIRECTORY_NAME', DIRECTORY_NAME FROM SYS.all_directories WHERE directory_name=:directory_name
                 UNION
-                SELECT 'DIRECTORY_PATH', DIRECTORY_PATH FROM SYS.all_directories WHERE directory_name='{0}'
+                SELECT 'DIRECTORY_PATH', DIRECTORY_PATH FROM SYS.all_directories WHERE directory_name=:directory_name
                 UNION
                 SELECT 'Privilege list', priv_list
                     FROM (SELECT LISTAGG(privilege, ', ')
                                     WITHIN GROUP (ORDER BY privilege) priv_list
-                            FROM all_tab_privs WHERE table_name='{0}')
+                            FROM all_tab_privs WHERE table_name=:directory_name)
                 ) a
-                """.format(directory_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, directory_name=directory_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -3106,7 +7567,8 @@ class DatabaseDirectoryServer(Namespace):
         emit('details_result', result_array, namespace=self._namespace_url)
 
 
-class DatabaseQueueServer(Namespace):
+@metered_handlers
+class DatabaseQueueServer(DatabaseNamespace):
     """Class to interact with the database queue available under schema
         provided as parameter to the class
     """
@@ -3116,6 +7578,7 @@ class DatabaseQueueServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
+    _coalesce_events = True
 
     def __init__(self, socket_io, schema):
         """Default constructor for DatabaseQueueServer class
@@ -3140,33 +7603,33 @@ class DatabaseQueueServer(Namespace):
         cursor = db_conn.cursor()
         query = """
                 SELECT ROWNUM, a.* FROM
-                (SELECT 'NAME', NAME FROM SYS.user_queues WHERE name='{0}'
+                (SELECT 'NAME', NAME FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'QUEUE_TABLE', QUEUE_TABLE FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'QUEUE_TABLE', QUEUE_TABLE FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'QID', to_char(QID) FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'QID', to_char(QID) FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'QUEUE_TYPE', QUEUE_TYPE FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'QUEUE_TYPE', QUEUE_TYPE FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'MAX_RETRIES', to_char(MAX_RETRIES) FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'MAX_RETRIES', to_char(MAX_RETRIES) FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'RETRY_DELAY', to_char(RETRY_DELAY) FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'RETRY_DELAY', to_char(RETRY_DELAY) FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'ENQUEUE_ENABLED', ENQUEUE_ENABLED FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'ENQUEUE_ENABLED', ENQUEUE_ENABLED FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'DEQUEUE_ENABLED', DEQUEUE_ENABLED FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'DEQUEUE_ENABLED', DEQUEUE_ENABLED FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'RETENTION', to_char(RETENTION) FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'RETENTION', to_char(RETENTION) FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'USER_COMMENT', USER_COMMENT FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'USER_COMMENT', USER_COMMENT FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'NETWORK_NAME', NETWORK_NAME FROM SYS.user_queues WHERE name='{0}'
+                SELECT 'NETWORK_NAME', NETWORK_NAME FROM SYS.user_queues WHERE name=:queue_name
                 UNION
-                SELECT 'CREATED', to_char(CREATED) FROM SYS.user_objects WHERE object_name='{0}' AND object_type='QUEUE'
+                SELECT 'CREATED', to_char(CREATED) FROM SYS.user_objects WHERE object_name=:queue_name AND object_type='QUEUE'
                 UNION
-                SELECT 'LAST_DDL_TIME', to_char(LAST_DDL_TIME) FROM SYS.user_objects WHERE object_name='{0}' AND object_type='QUEUE') a
-                """.format(queue_name)
-        cursor.execute(query)
+                SELECT 'LAST_DDL_TIME', to_char(LAST_DDL_TIME) FROM SYS.user_objects WHERE object_name=:queue_name AND object_type='QUEUE') a
+                """
+        cursor.execute(query, queue_name=queue_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -3182,9 +7645,9 @@ class DatabaseQueueServer(Namespace):
         # ########### Get DDL of table ###############
         cursor = db_conn.cursor()
         query = """
-                SELECT to_char(dbms_metadata.get_ddl('AQ_QUEUE', '%s')) FROM dual
-                """ % queue_name
-        cursor.execute(query)
+                SELECT to_char(dbms_metadata.get_ddl('AQ_QUEUE', :queue_name)) FROM dual
+                """
+        cursor.execute(query, queue_name=queue_name)
         for result in cursor:
             sql = result[0]
         emit('sql_result', sql, namespace=self._namespace_url)
@@ -3233,9 +7696,9 @@ class DatabaseQueueServer(Namespace):
                 FROM
                     SYS.user_queue_schedules
                 WHERE
-                    qname='%s'
-                """ % queue_name
-        cursor.execute(query)
+                    qname=:queue_name
+                """
+        cursor.execute(query, queue_name=queue_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -3295,9 +7758,9 @@ class DatabaseQueueServer(Namespace):
                 FROM
                     SYS.user_queue_subscribers
                 WHERE
-                    queue_name='%s'
-                """ % queue_name
-        cursor.execute(query)
+                    queue_name=:queue_name
+                """
+        cursor.execute(query, queue_name=queue_name)
         result_array = []
         for result in cursor:
             result_array.append({'recid': result[0],
@@ -3314,7 +7777,8 @@ class DatabaseQueueServer(Namespace):
         emit('subscribers_result', result_array, namespace=self._namespace_url)
 
 
-class DatabaseSQLServer(Namespace):
+@metered_handlers
+class DatabaseSQLServer(DatabaseNamespace):
     """Class to interact with the database and execute the
         SQL provided using various methods
     """
@@ -3324,14 +7788,27 @@ class DatabaseSQLServer(Namespace):
     _schema = None
     _db_connection = None
     _namespace_url = None
-
-    def __init__(self, socket_io, schema):
+    _statistics_enabled = False
+    _progress_interval = None
+    _sql_monitor_enabled = False
+    _no_session_events = ('connect', 'disconnect', 'cancel_query')
+    _serialize_events = True
+
+    def __init__(self, socket_io, schema, statistics_enabled=False, progress_interval=2,
+                 sql_monitor_enabled=False):
         """Default constructor for DatabaseSQLServer class
 
 
             Args:
                 socket_io (SocketIO): An instance of the SocketIO class
                 schema (DatabaseSchema): An instance of DatabaseSchema Class
+                statistics_enabled (bool, optional): Emits the execution statistics of
+                    every statement unless its options say otherwise
+                progress_interval (int, optional): Seconds between two 'sql_progress'
+                    events of a running statement, the first one being sent once it
+                    has run that long. 0 disables them
+                sql_monitor_enabled (bool, optional): Reads the progress from SQL
+                    Monitor as well, only when the Tuning Pack is licensed
         """
         Namespace.__init__(self, '/oracle_db_sql')
         self._namespace_url = '/oracle_db_sql'
@@ -3339,80 +7816,293 @@ class DatabaseSQLServer(Namespace):
         self._schema = schema
         self._db_connection = self._schema.get_connection()
         self._schema_name = self._schema.get_schema_name()
+        self._statistics_enabled = statistics_enabled
+        self._progress_interval = progress_interval
+        self._sql_monitor_enabled = sql_monitor_enabled
         socket_io.on_namespace(self)
 
-    def on_execute_sql(self, sql):
-        """For internal use only: will be called when 'execute_sql' event will be emitted
+    def _get_pinned_connection(self):
+        """Returns the session holding the open transaction of the client, if any,
+            so that all its statements up to 'commit' or 'rollback' run in the
+            same transaction
+        """
+        return self._db_connection.get_transaction_connection()
+
+    def _has_open_transaction(self, db_conn):
+        """Returns True if a transaction is open on the given session
+
+            Args:
+                db_conn (cx_Oracle.Connection): The session to check
+        """
+        cursor = db_conn.cursor()
+        cursor.execute("SELECT dbms_transaction.local_transaction_id FROM dual")
+        result = cursor.fetchone()
+        return result is not None and result[0] is not None
+
+    def on_disconnect(self):
+        """For internal use only: will be called when the client disconnects.
+            Rolls back the transaction left open by the client once the statements
+            it sent before disconnecting are done
+        """
+        self._db_connection.unpin_after_events(self.namespace, rollback=True)
+
+    def _start_progress(self, db_conn):
+        """Tags the session about to run a statement with a new ACTION and starts
+            the background task sending the 'sql_progress' events of the statement
+            to the client until _stop_progress() is called. Returns what
+            _stop_progress() expects, None when progress events are disabled
+
+            Args:
+                db_conn (cx_Oracle.Connection): The session about to run the statement
+        """
+        if not self._progress_interval:
+            return None
+        client = self._db_connection.get_client()
+        sid = client.namespaces.get(self.namespace)
+        if sid is None:
+            return None
+        action = ProgressMonitor.get_action()
+        try:
+            db_conn.action = action
+        except (AttributeError, cx_Oracle.Error) as e:
+            print("Error: Cannot tag the session: " + str(e))
+            return None
+        done = threading.Event()
+        self._socket_io.start_background_task(self._send_progress, client, sid, action, done)
+        return db_conn, done
+
+    def _send_progress(self, client, sid, action, done):
+        """Background task reading the progress of a running statement once per
+            progress interval, with a session of its own, and sending it to the
+            client as 'sql_progress' events
+
+            Args:
+                client (ClientSession): The session of the client running the statement
+                sid (string): Session id of the client in the namespace
+                action (string): ACTION the session running the statement is tagged with
+                done (threading.Event): Set once the statement has run
+        """
+        while not done.wait(self._progress_interval):
+            outcome = self._db_connection.run_task(
+                client, lambda db_conn: ProgressMonitor.poll(db_conn, action, self._sql_monitor_enabled))
+            if 'error' in outcome:
+                print("Error while reading the progress of the statement: " + outcome['error'])
+                return
+            if outcome['result'] is not None and not done.is_set():
+                self._socket_io.emit('sql_progress', outcome['result'], namespace=self._namespace_url, room=sid)
+
+    def _stop_progress(self, progress):
+        """Stops the 'sql_progress' events started by _start_progress() and clears
+            the ACTION of the session, sent along with its next round trip
+
+            Args:
+                progress (tuple): As returned by _start_progress()
+        """
+        if progress is None:
+            return
+        db_conn, done = progress
+        done.set()
+        try:
+            db_conn.action = ''
+        except (AttributeError, cx_Oracle.Error):
+            pass
+
+    def _take_statistics(self, db_conn, options):
+        """Returns a snapshot of the statistics of the session when the statistics
+            of the statement are asked for, None otherwise or when the session
+            cannot read them
+
+            Args:
+                db_conn (cx_Oracle.Connection): The session running the statement
+                options (dict): Options of the statement, 'statistics' overriding the
+                    default given to the constructor
+        """
+        if not options.get('statistics', self._statistics_enabled):
+            return None
+        try:
+            return SessionStatistics.take(db_conn)
+        except cx_Oracle.DatabaseError as e:
+            print("Error while reading the session statistics: " + str(e))
+            return None
+
+    def _emit_statistics(self, db_conn, sql, statistics, timings, start_time):
+        """Emits the 'execute_statistics' event with what a statement cost the
+            database, from the snapshot taken before it ran, and the milliseconds
+            spent on each step by the server
+
+            Args:
+                db_conn (cx_Oracle.Connection): The session running the statement
+                sql (string): The statement
+                statistics (SessionStatistics): Snapshot taken before the statement
+                timings (dict): Milliseconds spent on each step, see get_timings()
+                start_time (float): Time the handler started
         """
+        database = None
+        try:
+            database = statistics.diff(SessionStatistics.take(db_conn))
+        except cx_Oracle.DatabaseError as e:
+            print("Error while reading the session statistics: " + str(e))
+        timings = dict(timings)
+        timings['totalTime'] = (time.time() - start_time) * 1000
+        emit('execute_statistics', {'sql': sql,
+                                    'database': database,
+                                    'server': timings}, namespace=self._namespace_url)
+
+    def on_execute_sql(self, sql, options=None):
+        """For internal use only: will be called when 'execute_sql' event will be emitted
+
+            Args:
+                sql (string): The statement to execute
+                options (dict, optional): 'callTimeout' as the milliseconds the
+                    statement may run and 'statistics' to receive an
+                    'execute_statistics' event once it has run
+        """
+        if options is None:
+            options = {}
+        start_time = time.time()
         db_conn = self._db_connection.get_connection()
         db_conn.autocommit = False
         cursor = db_conn.cursor()
         if sql.upper().startswith('SELECT'):
             sql = sql.rstrip(';')
+        error = None
+        statistics = self._take_statistics(db_conn, options)
+        timings = get_timings()
+        progress = self._start_progress(db_conn)
+        self._db_connection.begin_statement(options.get('callTimeout'))
         try:
+            step_time = time.time()
             cursor.execute(sql)
+            timings['executeTime'] = (time.time() - step_time) * 1000
+            if sql.upper().startswith(('CREATE', 'ALTER', 'DROP', 'RENAME')):
+                self._schema.invalidate_cache()
+            if self._db_connection.get_transaction_connection() is None and self._has_open_transaction(db_conn):
+                self._db_connection.pin()
             emit('execute_sql_success', 'ok', namespace=self._namespace_url)
+            if statistics is not None:
+                timings['rows'] = cursor.rowcount
+                self._emit_statistics(db_conn, sql, statistics, timings, start_time)
         except Exception as err:
+            error = err
             emit('execute_sql_error', str(err), namespace=self._namespace_url)
             print('Error while executing SQL: ' + sql)
             print(err)
+        finally:
+            self._stop_progress(progress)
+            self._db_connection.end_statement(error)
 
-    def on_execute_select(self, sql):
+    def on_execute_select(self, sql, options=None):
         """For internal use only: will be called when 'execute_select' event will be emitted
-        """
+
+            Args:
+                sql (string): The SELECT statement to execute
+                options (dict, optional): 'stream' to receive the rows as
+                    'execute_select_chunk' events of 'chunkSize' rows followed
+                    by an 'execute_select_done' event, see stream_cursor(),
+                    'callTimeout' as the milliseconds each round trip may last
+                    and 'statistics' to receive an 'execute_statistics' event
+                    once the rows are sent
+        """
+        if options is None:
+            options = {}
+        start_time = time.time()
         db_conn = self._db_connection.get_connection()
         cursor = db_conn.cursor()
         sql = sql.rstrip(';')
+        cursor.outputtypehandler = output_type_handler
+        if options.get('stream'):
+            cursor.arraysize = get_chunk_size(options.get('chunkSize'))
+        error = None
+        statistics = self._take_statistics(db_conn, options)
+        timings = get_timings()
+        progress = self._start_progress(db_conn)
+        self._db_connection.begin_statement(options.get('callTimeout'))
         try:
+            step_time = time.time()
             cursor.execute(sql)
-            column_headers = []
-            for col in cursor.description:
-                column_headers.append(col[0])
-            result_array = []
-            for result in cursor:
-                row = {}
-                for i in range(0, column_headers.__len__()):
-                    row[column_headers[i]] = str(result[i])
-                result_array.append(row)
-            emit('execute_select_success', result_array, namespace=self._namespace_url)
+            timings['executeTime'] = (time.time() - step_time) * 1000
+            if options.get('stream'):
+                stream_cursor(self._socket_io, cursor, 'execute_select', self._namespace_url,
+                              chunk_size=options.get('chunkSize'), timings=timings)
+            else:
+                column_headers = []
+                for col in cursor.description:
+                    column_headers.append(col[0])
+                cursor.rowfactory = get_record_factory(column_headers)
+                step_time = time.time()
+                rows = cursor.fetchall()
+                timings['fetchTime'] = (time.time() - step_time) * 1000
+                step_time = time.time()
+                result_array = build_records(rows, column_headers, types=get_cursor_types(cursor))
+                timings['convertTime'] = (time.time() - step_time) * 1000
+                step_time = time.time()
+                emit('execute_select_success', result_array, namespace=self._namespace_url)
+                timings['emitTime'] = (time.time() - step_time) * 1000
+                timings['rows'] = rows.__len__()
+            if statistics is not None:
+                self._emit_statistics(db_conn, sql, statistics, timings, start_time)
         except Exception as err:
+            error = err
             emit('execute_select_error', str(err), namespace=self._namespace_url)
             print('Error while executing SQL: ' + sql)
             print(err)
+        finally:
+            self._stop_progress(progress)
+            self._db_connection.end_statement(error)
+
+    def on_cancel_query(self):
+        """For internal use only: will be called when 'cancel_query' event will be emitted.
+            Interrupts the statements of the client still executing or fetching
+        """
+        cancelled = self._db_connection.cancel_statements()
+        emit('cancel_query_result', {'cancelled': cancelled}, namespace=self._namespace_url)
 
     def on_commit(self):
         """For internal use only: will be called when 'commit' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
-        db_conn.commit()
+        try:
+            db_conn.commit()
+        finally:
+            self._db_connection.unpin()
 
     def on_rollback(self):
         """For internal use only: will be called when 'rollback' event will be emitted
         """
         db_conn = self._db_connection.get_connection()
-        db_conn.rollback()
+        try:
+            db_conn.rollback()
+        finally:
+            self._db_connection.unpin()
 
 
-class DatabaseServer(Namespace):
+@metered_handlers
+class DatabaseServer(DatabaseNamespace):
     """Class to interact with the database
     """
 
     _socket_io = None
     _db_connection = None
     _namespace_url = None
+    _plans = None
+    _no_session_events = ('connect', 'disconnect', 'get_plan_cache_stats')
 
-    def __init__(self, socket_io, schema):
+    def __init__(self, socket_io, schema, plan_cache_ttl=300, plan_cache_max_entries=256):
         """Default constructor for DatabaseServer class
 
 
             Args:
                 socket_io (SocketIO): An instance of the SocketIO class
                 schema (DatabaseSchema): An instance of DatabaseSchema Class
+                plan_cache_ttl (int, optional): Seconds an explained plan is served
+                    from the cache
+                plan_cache_max_entries (int, optional): Maximum number of cached plans
         """
         Namespace.__init__(self, '/oracle_db')
         self._namespace_url = '/oracle_db'
         self._socket_io = socket_io
         self._db_connection = schema.get_connection()
+        self._plans = PlanService(ttl=plan_cache_ttl, max_entries=plan_cache_max_entries)
         socket_io.on_namespace(self)
 
     def on_get_schemas_list(self):
@@ -3439,8 +8129,8 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_tab_cols
                 WHERE
-                    owner = '%s'
-                    AND table_name = '%s'
+                    owner = :schema_name
+                    AND table_name = :table_name
                     AND data_type IN (
                         'VARCHAR',
                         'VARCHAR2',
@@ -3449,8 +8139,8 @@ class DatabaseServer(Namespace):
                         'NVARCHAR',
                         'NVARCHAR2'
                     )
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3467,11 +8157,11 @@ class DatabaseServer(Namespace):
                 SELECT constraint_name
                 FROM sys.all_constraints
                 WHERE
-                    owner = '%s' AND
-                    table_name = '%s' AND
+                    owner = :schema_name AND
+                    table_name = :table_name AND
                     status = 'DISABLED'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3488,11 +8178,11 @@ class DatabaseServer(Namespace):
                 SELECT constraint_name
                 FROM sys.all_constraints
                 WHERE
-                    owner = '%s' AND
-                    table_name = '%s' AND
+                    owner = :schema_name AND
+                    table_name = :table_name AND
                     status = 'ENABLED'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3509,10 +8199,10 @@ class DatabaseServer(Namespace):
                 SELECT constraint_name
                 FROM sys.all_constraints
                 WHERE
-                    owner = '%s' AND
-                    table_name = '%s'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                    owner = :schema_name AND
+                    table_name = :table_name
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3531,10 +8221,10 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_tab_columns
                 WHERE
-                    owner = '%s'
-                    AND table_name = '%s'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                    owner = :schema_name
+                    AND table_name = :table_name
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3551,9 +8241,9 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_tables
                 WHERE
-                    owner='%s'
-                """ % schema_name
-        cursor.execute(query)
+                    owner=:schema_name
+                """
+        cursor.execute(query, schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3572,10 +8262,10 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_indexes
                 WHERE
-                    owner = '%s'
-                    AND table_name = '%s'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                    owner = :schema_name
+                    AND table_name = :table_name
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3624,20 +8314,20 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_col_privs
                 WHERE
-                    table_schema = '%s'
-                    AND table_name = '%s'
-                    AND grantee = '%s'
+                    table_schema = :schema_name
+                    AND table_name = :table_name
+                    AND grantee = :grantee
                 UNION
                 SELECT
                     privilege
                 FROM
                     sys.all_tab_privs
                 WHERE
-                    table_schema = '%s'
-                    AND table_name = '%s'
-                    AND grantee = '%s'
-                """ % (schema_name, table_name, grantee, schema_name, table_name, grantee)
-        cursor.execute(query)
+                    table_schema = :schema_name
+                    AND table_name = :table_name
+                    AND grantee = :grantee
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name, grantee=grantee)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3665,9 +8355,9 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_sequences
                 WHERE
-                    sequence_owner = '%s'
-                """ % schema_name
-        cursor.execute(query)
+                    sequence_owner = :schema_name
+                """
+        cursor.execute(query, schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3686,11 +8376,11 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_triggers
                 WHERE
-                    table_owner = '%s'
-                    AND table_name = '%s'
+                    table_owner = :schema_name
+                    AND table_name = :table_name
                     AND status = 'ENABLED'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3709,11 +8399,11 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_triggers
                 WHERE
-                    table_owner = '%s'
-                    AND table_name = '%s'
+                    table_owner = :schema_name
+                    AND table_name = :table_name
                     AND status = 'DISABLED'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -3732,61 +8422,132 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_triggers
                 WHERE
-                    table_owner = '%s'
-                    AND table_name = '%s'
-                """ % (schema_name, table_name)
-        cursor.execute(query)
+                    table_owner = :schema_name
+                    AND table_name = :table_name
+                """
+        cursor.execute(query, schema_name=schema_name, table_name=table_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
         emit('table_triggers_result', result_array, namespace=self._namespace_url)
 
     def on_get_explain_plan(self, sql):
-        """For internal use only: will be called when 'get_explain_plan' event will be emitted
+        """For internal use only: will be called when 'get_explain_plan' event will be emitted.
+            The statement is always explained again, bypassing the plan cache, so that
+            the plan reflects the indexes and statistics changed since the last explain
         """
+        client = self._db_connection.get_client()
+        plan = self._plans.explain(self._db_connection.get_connection(), (client.pool_key, client.schema_name), sql,
+                                   refresh=True)
+        emit('explain_plan_result', plan['rows'], namespace=self._namespace_url)
+
+    def on_get_plan(self, sql, options=None):
+        """For internal use only: will be called when 'get_plan' event will be emitted.
+            Emits the plan of a statement with its SQL_ID, plan hash value and the
+            DBMS_XPLAN output
+
+            Args:
+                sql (string): The statement
+                options (dict, optional): 'mode' as 'explain' to explain the statement,
+                    the default, or 'actual' to run the query and get the actual rows
+                    of each step, 'refresh' to explain it even if cached and
+                    'callTimeout' as the milliseconds each round trip may last
+        """
+        if options is None:
+            options = {}
+        start_time = time.time()
         db_conn = self._db_connection.get_connection()
-        cursor = db_conn.cursor()
-        random_number = random.randint(10000000, 999999999)
-        sql = sql.rstrip(';')
-        query = """
-                EXPLAIN PLAN SET STATEMENT_ID = '%d' FOR %s
-                """ % (random_number, sql)
-        cursor.execute(query)
-        cursor = db_conn.cursor()
-        query = """
-                SELECT
-                    ROWNUM, 
-                    p.operation,
-                    p.options,
-                    p.object_name,
-                    p.object_type,
-                    p.id,
-                    p.parent_id,
-                    p.cost,
-                    p.cardinality,
-                    CAST(p.other_xml AS VARCHAR2(4000)),
-                    p.access_predicates
-                FROM plan_table p
-                WHERE p.statement_id = %d
-                AND p.plan_id = (SELECT max(plan_id) FROM plan_table WHERE statement_id=%d)
-                ORDER BY p.id
-                """ % (random_number, random_number)
-        cursor.execute(query)
-        result_array = []
-        for result in cursor:
-            result_array.append({'recid': result[0],
-                                 'operation': result[1],
-                                 'options': result[2],
-                                 'objectName': result[3],
-                                 'objectType': result[4],
-                                 'id': result[5],
-                                 'parentId': result[6],
-                                 'cost': result[7],
-                                 'cardinality': result[8],
-                                 'otherXml': result[9],
-                                 'accessPredicates': result[10]
-                                 })
-        emit('explain_plan_result', result_array, namespace=self._namespace_url)
+        client = self._db_connection.get_client()
+        error = None
+        self._db_connection.begin_statement(options.get('callTimeout'))
+        try:
+            if options.get('mode') == 'actual':
+                plan = self._plans.run(db_conn, (client.pool_key, client.schema_name), sql)
+            else:
+                plan = self._plans.explain(db_conn, (client.pool_key, client.schema_name), sql,
+                                           bool(options.get('refresh')))
+            plan['elapsedTime'] = int((time.time() - start_time) * 1000)
+            emit('plan_result', plan, namespace=self._namespace_url)
+        except Exception as err:
+            error = err
+            print('Error while reading the plan of: ' + sql)
+            print(err)
+            emit('plan_error', str(err), namespace=self._namespace_url)
+        finally:
+            self._db_connection.end_statement(error)
+
+    def on_get_plan_history(self, sql):
+        """For internal use only: will be called when 'get_plan_history' event will be emitted.
+            Emits the id, mode, plan hash value and time of the plans read for a statement
+
+            Args:
+                sql (string): The statement
+        """
+        client = self._db_connection.get_client()
+        history = self._plans.get_history((client.pool_key, client.schema_name), sql)
+        emit('plan_history_result', [{'planId': plan['planId'],
+                                      'mode': plan['mode'],
+                                      'sqlId': plan['sqlId'],
+                                      'planHashValue': plan['planHashValue'],
+                                      'explainedAt': plan['explainedAt']} for plan in history],
+             namespace=self._namespace_url)
+
+    def on_compare_plans(self, sql, options=None):
+        """For internal use only: will be called when 'compare_plans' event will be emitted.
+            Diffs two plans from the history of a statement, by default the last
+            two, and emits the steps added, removed or changed, the likely
+            regressions and the plan hash values of its cursors in v$sql
+
+            Args:
+                sql (string): The statement
+                options (dict, optional): 'leftPlanId' and 'rightPlanId' as the ids of
+                    the plans to compare, 'explain' to explain the statement again
+                    first, 'cardinalityRatio' and 'costRatio' as the thresholds of
+                    the regressions
+        """
+        if options is None:
+            options = {}
+        db_conn = self._db_connection.get_connection()
+        client = self._db_connection.get_client()
+        owner_key = (client.pool_key, client.schema_name)
+        try:
+            if options.get('explain'):
+                self._plans.explain(db_conn, owner_key, sql, True)
+            history = self._plans.get_history(owner_key, sql)
+            plans = dict((plan['planId'], plan) for plan in history)
+            if history.__len__() == 0:
+                raise ValueError('No plan was read for this statement yet')
+            right = plans.get(options.get('rightPlanId'), history[-1])
+            left = plans.get(options.get('leftPlanId'), history[-2] if history.__len__() > 1 else history[-1])
+            result = PlanService.compare(left, right,
+                                         float(options.get('cardinalityRatio') or 10),
+                                         float(options.get('costRatio') or 1.5))
+        except Exception as err:
+            print('Error while comparing the plans of: ' + sql)
+            print(err)
+            emit('compare_plans_error', str(err), namespace=self._namespace_url)
+            return
+        sql_id = PlanService.get_sql_id(sql.strip().rstrip(';'))
+        cursor_plans = self._plans.get_cursor_plans(db_conn, sql_id)
+        if cursor_plans is not None:
+            hashes = set(cursor['planHashValue'] for cursor in cursor_plans)
+            hashes.update(plan['planHashValue'] for plan in history if plan['planHashValue'] is not None)
+            if hashes.__len__() > 1:
+                result['regressions'].append({'type': 'planFlip',
+                                              'message': 'The statement ran or was explained with %d different plans'
+                                                         % hashes.__len__()})
+        result.update({'sqlId': sql_id,
+                       'left': {'planId': left['planId'], 'mode': left['mode'],
+                                'planHashValue': left['planHashValue'], 'explainedAt': left['explainedAt']},
+                       'right': {'planId': right['planId'], 'mode': right['mode'],
+                                 'planHashValue': right['planHashValue'], 'explainedAt': right['explainedAt']},
+                       'cursorPlans': cursor_plans})
+        emit('compare_plans_result', result, namespace=self._namespace_url)
+
+    def on_get_plan_cache_stats(self):
+        """For internal use only: will be called when 'get_plan_cache_stats' event will be emitted
+        """
+        emit('plan_cache_stats_result', self._plans.get_stats(), namespace=self._namespace_url)
 
     def on_get_views(self, schema_name):
         """For internal use only: will be called when 'get_views' event will be emitted
@@ -3799,9 +8560,9 @@ class DatabaseServer(Namespace):
                 FROM
                     sys.all_views
                 WHERE
-                    owner='%s'
-                """ % schema_name
-        cursor.execute(query)
+                    owner=:schema_name
+                """
+        cursor.execute(query, schema_name=schema_name)
         result_array = []
         for result in cursor:
             result_array.append(result[0])
@@ -1,17 +1,23 @@
-from flask import Flask, render_template
+from flask import Flask, Response, render_template
 from flask_socketio import SocketIO
 from oracle import DatabaseConnectionServer, DatabaseSchemaServer, DatabaseTableServer
 from oracle import DatabaseViewServer, DatabaseIndexServer, DatabaseMaterializedViewServer
 from oracle import DatabasePLSQLServer, DatabaseSequenceServer, DatabaseSynonymServer
 from oracle import DatabaseLinkServer, DatabaseDirectoryServer, DatabaseQueueServer
 from oracle import DatabaseSQLServer, DatabaseServer
+from oracle import HANDLER_METRICS, MeteredJSON
 from engineio.payload import Payload
 
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'secret!'
 Payload.max_decode_packets = 500
-socketio = SocketIO(app, async_mode=None)
+socketio = SocketIO(app, async_mode=app.config.get('SOCKETIO_ASYNC_MODE', 'threading'), json=MeteredJSON)
+
+
+@app.route('/metrics')
+def metrics():
+    return Response(HANDLER_METRICS.render(), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/edit-table')
@@ -370,8 +376,24 @@ def index():
 
 
 def start_app():
-    dc = DatabaseConnectionServer(socketio)
-    ds = DatabaseSchemaServer(socketio, dc)
+    dc = DatabaseConnectionServer(socketio,
+                                  pool_min=app.config.get('DB_POOL_MIN', 1),
+                                  pool_max=app.config.get('DB_POOL_MAX', 10),
+                                  pool_increment=app.config.get('DB_POOL_INCREMENT', 1),
+                                  pool_wait_timeout=app.config.get('DB_POOL_WAIT_TIMEOUT', 10000),
+                                  client_idle_timeout=app.config.get('DB_CLIENT_IDLE_TIMEOUT', 1800),
+                                  stmt_cache_size=app.config.get('DB_STMT_CACHE_SIZE', 50),
+                                  call_timeout=app.config.get('DB_CALL_TIMEOUT', 0),
+                                  handler_workers=app.config.get('DB_HANDLER_WORKERS', 8),
+                                  task_workers=app.config.get('DB_TASK_WORKERS', 4))
+    ds = DatabaseSchemaServer(socketio, dc,
+                              cache_ttl=app.config.get('DB_SCHEMA_CACHE_TTL', 300),
+                              cache_max_entries=app.config.get('DB_SCHEMA_CACHE_MAX_ENTRIES', 256),
+                              snapshot_enabled=app.config.get('DB_SCHEMA_SNAPSHOT', False),
+                              snapshot_interval=app.config.get('DB_SCHEMA_SNAPSHOT_INTERVAL', 5),
+                              dependency_graph_enabled=app.config.get('DB_DEPENDENCY_GRAPH', False),
+                              source_index_path=app.config.get('DB_SOURCE_INDEX_PATH'),
+                              snapshot_path=app.config.get('DB_SCHEMA_SNAPSHOT_PATH'))
     dt = DatabaseTableServer(socketio, ds)
     dv = DatabaseViewServer(socketio, ds)
     di = DatabaseIndexServer(socketio, ds)
@@ -382,8 +404,13 @@ def start_app():
     dblink = DatabaseLinkServer(socketio, ds)
     ddir = DatabaseDirectoryServer(socketio, ds)
     dq = DatabaseQueueServer(socketio, ds)
-    dsql = DatabaseSQLServer(socketio, ds)
-    db = DatabaseServer(socketio, ds)
+    dsql = DatabaseSQLServer(socketio, ds,
+                             statistics_enabled=app.config.get('DB_SQL_STATISTICS', False),
+                             progress_interval=app.config.get('DB_SQL_PROGRESS_INTERVAL', 2),
+                             sql_monitor_enabled=app.config.get('DB_SQL_MONITOR', False))
+    db = DatabaseServer(socketio, ds,
+                        plan_cache_ttl=app.config.get('DB_PLAN_CACHE_TTL', 300),
+                        plan_cache_max_entries=app.config.get('DB_PLAN_CACHE_MAX_ENTRIES', 256))
     socketio.run(app, debug=True)
 
 
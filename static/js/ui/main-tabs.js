@@ -33,6 +33,7 @@ var TableTabUI = Class.create({
   indexesGridClickedEventListeners: [],
   columnsReloadButtonClickedEventListeners: [],
   dataReloadButtonClickedEventListeners: [],
+  dataFetchMoreButtonClickedEventListeners: [],
   constraintsReloadButtonClickedEventListeners: [],
   grantsReloadButtonClickedEventListeners: [],
   statisticsReloadButtonClickedEventListeners: [],
@@ -69,6 +70,7 @@ var TableTabUI = Class.create({
 
     this.columnsReloadButtonClickedEventListeners = [];
     this.dataReloadButtonClickedEventListeners = [];
+    this.dataFetchMoreButtonClickedEventListeners = [];
     this.constraintsReloadButtonClickedEventListeners = [];
     this.grantsReloadButtonClickedEventListeners = [];
     this.statisticsReloadButtonClickedEventListeners = [];
@@ -202,6 +204,17 @@ var TableTabUI = Class.create({
                                       footer: true
                                     },
                               multiSearch: true,
+                              toolbar: {
+                                items: [
+                                  { type: 'button', id: that.id + '-table-data-grid-fetch-more-btn',
+                                    caption: 'Fetch More', icon: 'w2ui-icon-plus', hint: 'Fetch next rows'}
+                                ],
+                                onClick: function(event) {
+                                  if(event.target === that.id + '-table-data-grid-fetch-more-btn') {
+                                    that.fireDataFetchMoreButtonClickedEvent();
+                                  }
+                                }
+                              },
                               onReload: function(event) {
                                 that.fireDataReloadButtonClickedEvent();
                               }
@@ -829,6 +842,25 @@ var TableTabUI = Class.create({
       listener(that);
     });
   },
+  addDataFetchMoreButtonClickedEventListener: function(listener) {
+    if(listener !== null && listener !== undefined) {
+      this.dataFetchMoreButtonClickedEventListeners.push(listener);
+    }
+  },
+  removeDataFetchMoreButtonClickedEventListener: function(listener) {
+    if(listener !== null && listener !== undefined) {
+      var index = this.dataFetchMoreButtonClickedEventListeners.indexOf(listener);
+      if(index !== -1) {
+        this.dataFetchMoreButtonClickedEventListeners.splice(index, 1);
+      }
+    }
+  },
+  fireDataFetchMoreButtonClickedEvent: function() {
+    var that = this;
+    this.dataFetchMoreButtonClickedEventListeners.forEach(function(listener){
+      listener(that);
+    });
+  },
   addConstraintsReloadButtonClickedEventListener: function(listener) {
     if(listener !== null && listener !== undefined) {
       this.constraintsReloadButtonClickedEventListeners.push(listener);
@@ -988,6 +1020,7 @@ var ViewTabUI = Class.create({
   dependenciesGridClickedEventListeners: [],
   columnsReloadButtonClickedEventListeners: [],
   dataReloadButtonClickedEventListeners: [],
+  dataFetchMoreButtonClickedEventListeners: [],
   grantsReloadButtonClickedEventListeners: [],
   triggersReloadButtonClickedEventListeners: [],
   dependenciesReloadButtonClickedEventListeners: [],
@@ -1011,6 +1044,7 @@ var ViewTabUI = Class.create({
     this.dependenciesGridClickedEventListeners = [];
     this.columnsReloadButtonClickedEventListeners = [];
     this.dataReloadButtonClickedEventListeners = [];
+    this.dataFetchMoreButtonClickedEventListeners = [];
     this.grantsReloadButtonClickedEventListeners = [];
     this.triggersReloadButtonClickedEventListeners = [];
     this.dependenciesReloadButtonClickedEventListeners = [];
@@ -1114,6 +1148,17 @@ var ViewTabUI = Class.create({
                                       footer: true
                                     },
                               multiSearch: true,
+                              toolbar: {
+                                items: [
+                                  { type: 'button', id: that.id + '-view-data-grid-fetch-more-btn',
+                                    caption: 'Fetch More', icon: 'w2ui-icon-plus', hint: 'Fetch next rows'}
+                                ],
+                                onClick: function(event) {
+                                  if(event.target === that.id + '-view-data-grid-fetch-more-btn') {
+                                    that.fireDataFetchMoreButtonClickedEvent();
+                                  }
+                                }
+                              },
                               onReload: function(event) {
                                 that.fireDataReloadButtonClickedEvent();
                               }
@@ -1468,6 +1513,25 @@ var ViewTabUI = Class.create({
       listener(that);
     });
   },
+  addDataFetchMoreButtonClickedEventListener: function(listener) {
+    if(listener !== null && listener !== undefined) {
+      this.dataFetchMoreButtonClickedEventListeners.push(listener);
+    }
+  },
+  removeDataFetchMoreButtonClickedEventListener: function(listener) {
+    if(listener !== null && listener !== undefined) {
+      var index = this.dataFetchMoreButtonClickedEventListeners.indexOf(listener);
+      if(index !== -1) {
+        this.dataFetchMoreButtonClickedEventListeners.splice(index, 1);
+      }
+    }
+  },
+  fireDataFetchMoreButtonClickedEvent: function() {
+    var that = this;
+    this.dataFetchMoreButtonClickedEventListeners.forEach(function(listener){
+      listener(that);
+    });
+  },
   addGrantsReloadButtonClickedEventListener: function(listener) {
     if(listener !== null && listener !== undefined) {
       this.grantsReloadButtonClickedEventListeners.push(listener);
@@ -1822,6 +1886,7 @@ var MaterializedViewTabUI = Class.create({
   dependenciesGridClickedEventListeners: [],
   columnsReloadButtonClickedEventListeners: [],
   dataReloadButtonClickedEventListeners: [],
+  dataFetchMoreButtonClickedEventListeners: [],
   grantsReloadButtonClickedEventListeners: [],
   indexesReloadButtonClickedEventListeners: [],
   dependenciesReloadButtonClickedEventListeners: [],
@@ -1843,6 +1908,7 @@ var MaterializedViewTabUI = Class.create({
     this.dependenciesGridClickedEventListeners = [];
     this.columnsReloadButtonClickedEventListeners = [];
     this.dataReloadButtonClickedEventListeners = [];
+    this.dataFetchMoreButtonClickedEventListeners = [];
     this.grantsReloadButtonClickedEventListeners = [];
     this.indexesReloadButtonClickedEventListeners = [];
     this.dependenciesReloadButtonClickedEventListeners = [];
@@ -1940,6 +2006,17 @@ var MaterializedViewTabUI = Class.create({
                                       footer: true
                                     },
                               multiSearch: true,
+                              toolbar: {
+                                items: [
+                                  { type: 'button', id: that.id + '-mview-data-grid-fetch-more-btn',
+                                    caption: 'Fetch More', icon: 'w2ui-icon-plus', hint: 'Fetch next rows'}
+                                ],
+                                onClick: function(event) {
+                                  if(event.target === that.id + '-mview-data-grid-fetch-more-btn') {
+                                    that.fireDataFetchMoreButtonClickedEvent();
+                                  }
+                                }
+                              },
                               onReload: function(event) {
                                 that.fireDataReloadButtonClickedEvent();
                               }
@@ -2277,6 +2354,25 @@ var MaterializedViewTabUI = Class.create({
       listener(that);
     });
   },
+  addDataFetchMoreButtonClickedEventListener: function(listener) {
+    if(listener !== null && listener !== undefined) {
+      this.dataFetchMoreButtonClickedEventListeners.push(listener);
+    }
+  },
+  removeDataFetchMoreButtonClickedEventListener: function(listener) {
+    if(listener !== null && listener !== undefined) {
+      var index = this.dataFetchMoreButtonClickedEventListeners.indexOf(listener);
+      if(index !== -1) {
+        this.dataFetchMoreButtonClickedEventListeners.splice(index, 1);
+      }
+    }
+  },
+  fireDataFetchMoreButtonClickedEvent: function() {
+    var that = this;
+    this.dataFetchMoreButtonClickedEventListeners.forEach(function(listener){
+      listener(that);
+    });
+  },
   addGrantsReloadButtonClickedEventListener: function(listener) {
     if(listener !== null && listener !== undefined) {
       this.grantsReloadButtonClickedEventListeners.push(listener);
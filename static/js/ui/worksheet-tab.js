@@ -44,6 +44,12 @@ var WorksheetTabUI = Class.create({
 		this.sqlServer.addSelectErrorEventListener(function(result) {
 			that.onSelectError(result);
 		});
+		this.sqlServer.addSelectChunkEventListener(function(result) {
+			that.onSelectChunk(result);
+		});
+		this.sqlServer.addSelectDoneEventListener(function(result) {
+			that.onSelectDone(result);
+		});
 		this.sqlServer.addSQLSuccessEventListener(function(result) {
 			that.onSQLSuccess(result);
 		});
@@ -84,6 +90,8 @@ var WorksheetTabUI = Class.create({
 	                                                icon: 'run_icon', hint: 'Run SQL'},
 	                                              { type: 'button', id: this.id + '-plsql-sql-editor-toolbar-run-script-btn',
 	                                                icon: 'run_script_icon', hint: 'Run Script'},
+	                                              { type: 'button', id: this.id + '-plsql-sql-editor-toolbar-cancel-btn',
+	                                                icon: 'cancel_query_icon', hint: 'Cancel Query'},
 	                                              { type: 'button', id: this.id + '-plsql-sql-editor-toolbar-explain-btn',
 	                                                icon: 'explain_icon', hint: 'Explain Plan...'},
 	                                              { type: 'button', id: this.id + '-plsql-sql-editor-toolbar-autotrace-btn',
@@ -120,6 +128,8 @@ var WorksheetTabUI = Class.create({
 	                                                that.executeScript(null);
 	                                              } else if(target === that.id + '-plsql-sql-editor-toolbar-clear-btn') {
 	                                                that.sqlEditor.setValue('');
+	                                              } else if(target === that.id + '-plsql-sql-editor-toolbar-cancel-btn') {
+	                                                that.sqlServer.cancelQuery();
 	                                              } else if(target === that.id + '-plsql-sql-editor-toolbar-explain-btn') {
 	                                                that.executeExplainPlan();
 	                                              } else if(target === that.id + '-plsql-sql-editor-toolbar-commit-btn') {
@@ -326,7 +336,7 @@ var WorksheetTabUI = Class.create({
 		if(sql.toUpperCase().startsWith('SELECT') || sql.toUpperCase().startsWith('(SELECT')) {
 			this.commandSource = 'SELECT';
 			this.saveSQLToHistory(sql);
-			this.sqlServer.executeSelect(sql);
+			this.sqlServer.executeSelectStream(sql);
 		} else {
 			this.executeScript(sql);
 		}
@@ -405,6 +415,44 @@ var WorksheetTabUI = Class.create({
 			$j('#' + this.id + '-worksheet-result').append('0 row(s) selected.');
 		}
 	},
+	onSelectChunk: function(result) {
+		if(result.offset === 0) {
+			var columns = [];
+			result.columns.forEach(function(header) {
+				var column = { field: header, caption: header, size: '100px' };
+				columns.push(column);
+			});
+
+			if(this.resultGrid !== null) {
+				this.resultGrid.destroy();
+			}
+			$j('#' + this.id + '-worksheet-result').empty();
+
+			this.resultGrid = $j('#' + this.id + '-worksheet-result').w2grid({
+										name: this.id + '-worksheet-result',
+                                  		show: { header: false,
+                                          		toolbar: false,
+                                          		lineNumbers: true,
+                                          		footer: true
+                                        },
+                                        columns: columns
+			});
+			this.resultGrid.records = result.records;
+			this.resultGrid.refresh();
+		} else {
+			this.resultGrid.add(result.records);
+		}
+	},
+	onSelectDone: function(result) {
+		if(result.rowCount === 0) {
+			if(this.resultGrid !== null) {
+				this.resultGrid.destroy();
+				this.resultGrid = null;
+			}
+			$j('#' + this.id + '-worksheet-result').empty();
+			$j('#' + this.id + '-worksheet-result').append('0 row(s) selected.');
+		}
+	},
 	onSelectError: function(result) {
 		if(this.resultGrid !== null) {
 			this.resultGrid.destroy();
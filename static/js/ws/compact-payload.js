@@ -0,0 +1,55 @@
+/*********************************************************************************
+ *                        COMPACT PAYLOAD ADAPTER
+ *********************************************************************************/
+
+/**
+ * expandCompactPayload: Expands a payload sent in the compact format, i.e. field
+ *  names and types sent once followed by rows as arrays, back to the list of
+ *  records expected by w2ui. Lists sent under the 'records' key of an object are
+ *  expanded as well. Any other payload is returned unchanged
+ * @param {object} payload - Payload received with a websocket event
+ */
+function expandCompactPayload(payload) {
+  if(payload === null || payload === undefined || typeof payload !== 'object') {
+    return payload;
+  }
+  if(payload.compact === true) {
+    var fields = payload.fields;
+    return payload.rows.map(function(values) {
+      var record = {};
+      for(var i = 0; i < fields.length; i++) {
+        record[fields[i]] = values[i];
+      }
+      return record;
+    });
+  }
+  if(payload.records !== null && payload.records !== undefined && payload.records.compact === true) {
+    payload.records = expandCompactPayload(payload.records);
+  }
+  return payload;
+}
+
+/**
+ * io: Wraps the socket.io client so that every listener registered on a socket
+ *  receives its payloads already expanded by expandCompactPayload
+ */
+var io = (function(connect) {
+  var wrapped = function() {
+    var socket = connect.apply(this, arguments);
+    if(socket.compactPayloadAdapter !== true) {
+      var on = socket.on;
+      socket.on = function(event, listener) {
+        return on.call(this, event, function() {
+          var args = Array.prototype.slice.call(arguments).map(expandCompactPayload);
+          return listener.apply(this, args);
+        });
+      };
+      socket.compactPayloadAdapter = true;
+    }
+    return socket;
+  };
+  Object.keys(connect).forEach(function(key) {
+    wrapped[key] = connect[key];
+  });
+  return wrapped;
+})(io);
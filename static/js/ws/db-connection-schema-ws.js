@@ -110,7 +110,13 @@ var DatabaseConnection = Class.create({
       w2alert('Connection failed!<br>' + e.message);
     });
 
-    var props = {'connectionString': this.connectionString, 'username': this.username, 'password': this.password};
+    socket.on('session_expired', function(e) {
+      that.connected = false;
+      w2alert('Database session expired after a period of inactivity, please connect again.');
+    });
+
+    var props = {'connectionString': this.connectionString, 'username': this.username, 'password': this.password,
+                 'payloadFormat': 'compact'};
     socket.emit('db_connect', props);
   },
   addConnectedEventListener: function(listener) {
@@ -555,23 +561,46 @@ var DatabaseSchema = Class.create({
       that.fireDirectoriesAvailableEvent(result);
     });
 
+    // The whole tree is read with one event, each category is then handed
+    // over to the listener of its own '<category>_result' event
+    socket.on('schema_tree_result', function(result){
+      Object.keys(result.categories).forEach(function(category) {
+        socket.listeners(category + '_result').forEach(function(listener) {
+          listener.call(socket, result.categories[category]);
+        });
+      });
+    });
+
     socket.emit('set_schema', this.schemaName)
-    socket.emit('get_tables');
-    socket.emit('get_views');
-    socket.emit('get_indexes');
-    socket.emit('get_mviews');
-    socket.emit('get_procedures');
-    socket.emit('get_functions');
-    socket.emit('get_packages');
-    socket.emit('get_sequences');
-    socket.emit('get_synonyms');
-    // socket.emit('get_public_synonyms');
-    socket.emit('get_triggers');
-    socket.emit('get_types');
-    socket.emit('get_queues');
-    socket.emit('get_dblinks');
-    socket.emit('get_public_dblinks');
-    socket.emit('get_directories');
+    this._requestSchemaObjects(socket);
+  },
+  refreshSchemaObjects: function() {
+    var socket = io('/oracle_db_schema');
+    socket.emit('refresh_schema');
+    this._requestSchemaObjects(socket);
+  },
+  _requestSchemaObjects: function(socket) {
+    socket.emit('get_schema_tree');
+  },
+  searchObjects: function(text, listener) {
+    var socket = io('/oracle_db_schema');
+    socket.off('search_objects_result');
+    socket.on('search_objects_result', function(result){
+      if(result.text === text) {
+        listener(result.matches);
+      }
+    });
+    socket.emit('search_objects', text);
+  },
+  searchSource: function(text, listener, phrase) {
+    var socket = io('/oracle_db_schema');
+    socket.off('search_source_result');
+    socket.on('search_source_result', function(result){
+      if(result.text === text) {
+        listener(result.hits);
+      }
+    });
+    socket.emit('search_source', text, {'phrase': phrase === true});
   },
   getSchemaName: function() {
     return this.schemaName;
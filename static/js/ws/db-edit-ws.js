@@ -556,12 +556,20 @@ var DatabaseSQL = Class.create({
 	sqlErrorEventListeners: [],
 	selectSuccessEventListeners: [],
 	selectErrorEventListeners: [],
+	selectChunkEventListeners: [],
+	selectDoneEventListeners: [],
+	statisticsEventListeners: [],
+	progressEventListeners: [],
 	initialize: function() {
 		this.socket = io('/oracle_db_sql');
 		this.sqlSuccessListeners = [];
 		this.sqlErrorListeners = [];
 		this.selectSuccessListeners = [];
 		this.selectErrorListeners = [];
+		this.selectChunkEventListeners = [];
+		this.selectDoneEventListeners = [];
+		this.statisticsEventListeners = [];
+		this.progressEventListeners = [];
 		var that = this;
 	    this.socket.on('execute_sql_error', function(result){
 	      that.fireSQLErrorEvent(result);
@@ -575,6 +583,18 @@ var DatabaseSQL = Class.create({
 	    this.socket.on('execute_select_success', function(result){
 	      that.fireSelectSuccessEvent(result);
 	    });
+	    this.socket.on('execute_select_chunk', function(result){
+	      that.fireSelectChunkEvent(result);
+	    });
+	    this.socket.on('execute_select_done', function(result){
+	      that.fireSelectDoneEvent(result);
+	    });
+	    this.socket.on('execute_statistics', function(result){
+	      that.fireStatisticsEvent(result);
+	    });
+	    this.socket.on('sql_progress', function(result){
+	      that.fireProgressEvent(result);
+	    });
 	},
 	addSQLSuccessEventListener: function(listener) {
 		if(listener !== null && listener !== undefined) {
@@ -640,12 +660,85 @@ var DatabaseSQL = Class.create({
 			listener(err);
 		});
 	},
+	addSelectChunkEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			this.selectChunkEventListeners.push(listener);
+		}
+	},
+	removeSelectChunkEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			var index = this.selectChunkEventListeners.indexOf(listener);
+			this.selectChunkEventListeners.splice(index, 1);
+		}
+	},
+	fireSelectChunkEvent: function(result) {
+		this.selectChunkEventListeners.forEach(function(listener) {
+			listener(result);
+		});
+	},
+	addSelectDoneEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			this.selectDoneEventListeners.push(listener);
+		}
+	},
+	removeSelectDoneEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			var index = this.selectDoneEventListeners.indexOf(listener);
+			this.selectDoneEventListeners.splice(index, 1);
+		}
+	},
+	fireSelectDoneEvent: function(result) {
+		this.selectDoneEventListeners.forEach(function(listener) {
+			listener(result);
+		});
+	},
+	addStatisticsEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			this.statisticsEventListeners.push(listener);
+		}
+	},
+	removeStatisticsEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			var index = this.statisticsEventListeners.indexOf(listener);
+			this.statisticsEventListeners.splice(index, 1);
+		}
+	},
+	fireStatisticsEvent: function(result) {
+		this.statisticsEventListeners.forEach(function(listener) {
+			listener(result);
+		});
+	},
+	addProgressEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			this.progressEventListeners.push(listener);
+		}
+	},
+	removeProgressEventListener: function(listener) {
+		if(listener !== null && listener !== undefined) {
+			var index = this.progressEventListeners.indexOf(listener);
+			this.progressEventListeners.splice(index, 1);
+		}
+	},
+	fireProgressEvent: function(result) {
+		this.progressEventListeners.forEach(function(listener) {
+			listener(result);
+		});
+	},
 	execute_sql: function(sql) {
 	    this.socket.emit('execute_sql', sql);
 	},
 	executeSelect: function(sql) {
 	    this.socket.emit('execute_select', sql);
 	},
+	executeSelectStream: function(sql, chunkSize) {
+	    this.socket.emit('execute_select', sql, {stream: true, chunkSize: chunkSize});
+	},
+	executeSelectWithStatistics: function(sql) {
+	    this.socket.emit('execute_select', sql, {statistics: true});
+	},
+	cancelQuery: function() {
+		this.socket.emit('cancel_query');
+	},
 	commit: function() {
 		this.socket.emit('commit');
 	},
@@ -658,6 +751,10 @@ var DatabaseSQL = Class.create({
 		    this.socket.off('execute_sql_success');
 		    this.socket.off('execute_select_error');
 		    this.socket.off('execute_select_success');
+		    this.socket.off('execute_select_chunk');
+		    this.socket.off('execute_select_done');
+		    this.socket.off('execute_statistics');
+		    this.socket.off('sql_progress');
 			this.socket.disconnect(true);
 			this.socket.destroy();
 			this.socket = null;
@@ -12,6 +12,7 @@ var DatabaseTable = Class.create({
   tableName: null,
   socket: null,
   tabId: null,
+  nextDataToken: null,
   columnsAvailableEventListeners: [],
   columnHeadersAvailableEventListeners: [],
   dataAvailableEventListeners: [],
@@ -33,6 +34,7 @@ var DatabaseTable = Class.create({
   initialize: function(tableName, tabId) {
     this.tableName = tableName;
     this.tabId = tabId;
+    this.nextDataToken = null;
     this.socket = io('/oracle_db_table');
     this.columnsAvailableEventListeners = [];
     this.columnHeadersAvailableEventListeners = [];
@@ -266,6 +268,7 @@ var DatabaseTable = Class.create({
   },
   fireDataAvailableEvent: function(result) {
     var that = this;
+    this.nextDataToken = result.nextToken;
     this.dataAvailableEventListeners.forEach(function(listener){
       listener(result, that.tabId);
     });
@@ -377,6 +380,14 @@ var DatabaseTable = Class.create({
     });
     this.socket.emit('get_column_headers', this.tableName);
   },
+  hasMoreData: function() {
+    return this.nextDataToken !== null && this.nextDataToken !== undefined;
+  },
+  getMoreData: function() {
+    if(this.hasMoreData()) {
+      this.socket.emit('get_data', this.tableName, {token: this.nextDataToken});
+    }
+  },
   getConstraints: function() {
     var that = this;
     this.socket.on('constraints_result', function(result){
@@ -458,10 +469,49 @@ var DatabaseTable = Class.create({
   },
   getSQL: function() {
     var that = this;
+    var sqlChunks = [];
     this.socket.on('sql_result', function(result){
       that.fireSQLAvailableEvent(result);
     });
+    this.socket.on('sql_chunk', function(result){
+      if(result.offset === 0) {
+        sqlChunks = [];
+      }
+      sqlChunks.push(result.text);
+    });
+    this.socket.on('sql_done', function(result){
+      that.fireSQLAvailableEvent(sqlChunks.join(''));
+      sqlChunks = [];
+    });
     this.socket.emit('get_sql', this.tableName);
+  },
+  getTableBundle: function(sections) {
+    var that = this;
+    var listeners = {
+      'columns': function(result) { that.fireColumnsAvailableEvent(result); },
+      'constraints': function(result) { that.fireConstraintsAvailableEvent(result); },
+      'grants': function(result) { that.fireGrantsAvailableEvent(result); },
+      'statistics': function(result) { that.fireStatisticsAvailableEvent(result); },
+      'triggers': function(result) { that.fireTriggersAvailableEvent(result); },
+      'dependencies': function(result) { that.fireDependenciesAvailableEvent(result); },
+      'indexes': function(result) { that.fireIndexesAvailableEvent(result); },
+      'sql': function(result) { that.fireSQLAvailableEvent(result); }
+    };
+    this.socket.on('table_bundle_result', function(result){
+      for(var name in result.sections) {
+        var section = result.sections[name];
+        if(section.error !== undefined) {
+          console.log('Cannot read ' + name + ' of ' + result.tableName + ': ' + section.error);
+        } else if(listeners[name] !== undefined) {
+          listeners[name](section.result);
+        }
+      }
+    });
+    var options = {};
+    if(sections !== null && sections !== undefined) {
+      options['sections'] = sections;
+    }
+    this.socket.emit('get_table_bundle', this.tableName, options);
   }
 });
 
@@ -475,6 +525,7 @@ var DatabaseView = Class.create({
   viewName: null,
   socket: null,
   tabId: null,
+  nextDataToken: null,
   columnsAvailableEventListeners: [],
   columnHeadersAvailableEventListeners: [],
   dataAvailableEventListeners: [],
@@ -489,6 +540,7 @@ var DatabaseView = Class.create({
   initialize: function(viewName, tabId) {
     this.viewName = viewName;
     this.tabId = tabId;
+    this.nextDataToken = null;
     this.socket = io('/oracle_db_view');
     this.columnsAvailableEventListeners = [];
     this.columnHeadersAvailableEventListeners = [];
@@ -638,6 +690,7 @@ var DatabaseView = Class.create({
   },
   fireDataAvailableEvent: function(result) {
     var that = this;
+    this.nextDataToken = result.nextToken;
     this.dataAvailableEventListeners.forEach(function(listener){
       listener(result, that.tabId);
     });
@@ -707,6 +760,14 @@ var DatabaseView = Class.create({
     });
     this.socket.emit('get_column_headers', this.viewName);
   },
+  hasMoreData: function() {
+    return this.nextDataToken !== null && this.nextDataToken !== undefined;
+  },
+  getMoreData: function() {
+    if(this.hasMoreData()) {
+      this.socket.emit('get_data', this.viewName, {token: this.nextDataToken});
+    }
+  },
   getGrants: function() {
     var that = this;
     this.socket.on('grants_result', function(result){
@@ -863,6 +924,7 @@ var DatabaseMaterializedView = Class.create({
   mviewName: null,
   socket: null,
   tabId: null,
+  nextDataToken: null,
   columnsAvailableEventListeners: [],
   columnHeadersAvailableEventListeners: [],
   dataAvailableEventListeners: [],
@@ -876,6 +938,7 @@ var DatabaseMaterializedView = Class.create({
   initialize: function(mviewName, tabId) {
     this.mviewName = mviewName;
     this.tabId = tabId;
+    this.nextDataToken = null;
     this.socket = io('/oracle_db_mview');
     this.columnsAvailableEventListeners = [];
     this.columnHeadersAvailableEventListeners = [];
@@ -1013,6 +1076,7 @@ var DatabaseMaterializedView = Class.create({
   },
   fireDataAvailableEvent: function(result) {
     var that = this;
+    this.nextDataToken = result.nextToken;
     this.dataAvailableEventListeners.forEach(function(listener){
       listener(result, that.tabId);
     });
@@ -1076,6 +1140,14 @@ var DatabaseMaterializedView = Class.create({
     });
     this.socket.emit('get_column_headers', this.mviewName);
   },
+  hasMoreData: function() {
+    return this.nextDataToken !== null && this.nextDataToken !== undefined;
+  },
+  getMoreData: function() {
+    if(this.hasMoreData()) {
+      this.socket.emit('get_data', this.mviewName, {token: this.nextDataToken});
+    }
+  },
   getGrants: function() {
     var that = this;
     this.socket.on('grants_result', function(result){
@@ -424,6 +424,39 @@ var Database = Class.create({
 	getExplainPlan: function(sql) {
 		this.socket.emit('get_explain_plan', sql);
 	},
+	getPlan: function(sql, options, listener, errorListener) {
+		this.socket.off('plan_result');
+		this.socket.off('plan_error');
+		this.socket.on('plan_result', function(result){
+			listener(result);
+		});
+		if(errorListener !== null && errorListener !== undefined) {
+			this.socket.on('plan_error', function(error){
+				errorListener(error);
+			});
+		}
+		this.socket.emit('get_plan', sql, options || {});
+	},
+	getPlanHistory: function(sql, listener) {
+		this.socket.off('plan_history_result');
+		this.socket.on('plan_history_result', function(result){
+			listener(result);
+		});
+		this.socket.emit('get_plan_history', sql);
+	},
+	comparePlans: function(sql, options, listener, errorListener) {
+		this.socket.off('compare_plans_result');
+		this.socket.off('compare_plans_error');
+		this.socket.on('compare_plans_result', function(result){
+			listener(result);
+		});
+		if(errorListener !== null && errorListener !== undefined) {
+			this.socket.on('compare_plans_error', function(error){
+				errorListener(error);
+			});
+		}
+		this.socket.emit('compare_plans', sql, options || {});
+	},
 	getViews: function(schemaName) {
 		this.socket.emit('get_views', schemaName);
 	},
@@ -445,6 +478,11 @@ var Database = Class.create({
 		    this.socket.off('enabled_table_triggers_result');
 		    this.socket.off('table_triggers_result');
 		    this.socket.off('explain_plan_result');
+		    this.socket.off('plan_result');
+		    this.socket.off('plan_error');
+		    this.socket.off('plan_history_result');
+		    this.socket.off('compare_plans_result');
+		    this.socket.off('compare_plans_error');
 		    this.socket.off('views_result');
 			this.socket.disconnect();
 			this.socket.destroy();
@@ -0,0 +1,230 @@
+"""
+Unit tests of PlanService.compare(), diffing execution plans built by hand,
+run without a database
+
+Usage:
+    python -m pytest tests/test_plan_compare.py
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from oracle import PlanService
+
+
+def build_plan(steps, plan_hash_value=None):
+    """Returns a plan as returned by PlanService.explain()
+
+        Args:
+            steps (list): (id, parentId, operation, options, objectName, cost, cardinality)
+                of each step, in execution plan order
+            plan_hash_value (int, optional): Plan hash value of the plan
+    """
+    rows = []
+    for step_id, parent_id, operation, options, object_name, cost, cardinality in steps:
+        rows.append({'recid': step_id + 1,
+                     'id': step_id,
+                     'parentId': parent_id,
+                     'operation': operation,
+                     'options': options,
+                     'objectName': object_name,
+                     'objectType': None,
+                     'cost': cost,
+                     'cardinality': cardinality})
+    return {'mode': 'explain', 'planHashValue': plan_hash_value, 'rows': rows}
+
+
+INDEXED_PLAN = [(0, None, 'SELECT STATEMENT', None, None, 3, 1),
+                (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, 1),
+                (2, 1, 'INDEX', 'UNIQUE SCAN', 'PK_EMP', 1, 1)]
+
+FULL_SCAN_PLAN = [(0, None, 'SELECT STATEMENT', None, None, 40, 1),
+                  (1, 0, 'TABLE ACCESS', 'FULL', 'EMP', 40, 1)]
+
+
+def get_types(result):
+    """Returns the types of the regressions found by PlanService.compare()
+
+        Args:
+            result (dict): The result of PlanService.compare()
+    """
+    return [regression['type'] for regression in result['regressions']]
+
+
+class PlanCompareTest(unittest.TestCase):
+
+    def test_get_plan_nodes_depths(self):
+        nodes = PlanService.get_plan_nodes(build_plan(INDEXED_PLAN))
+        self.assertEqual([node['depth'] for node in nodes], [0, 1, 2])
+
+    def test_same_plan(self):
+        result = PlanService.compare(build_plan(INDEXED_PLAN, 1234), build_plan(INDEXED_PLAN, 1234))
+        self.assertEqual([node['status'] for node in result['nodes']], ['same', 'same', 'same'])
+        self.assertEqual(result['regressions'], [])
+        self.assertTrue(result['samePlan'])
+
+    def test_same_plan_needs_a_plan_hash_value(self):
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(INDEXED_PLAN))
+        self.assertFalse(result['samePlan'])
+
+    def test_changed_step(self):
+        steps = list(INDEXED_PLAN)
+        steps[2] = (2, 1, 'INDEX', 'UNIQUE SCAN', 'PK_EMP', 2, 1)
+        result = PlanService.compare(build_plan(INDEXED_PLAN, 1), build_plan(steps, 1))
+        self.assertEqual([node['status'] for node in result['nodes']], ['same', 'same', 'changed'])
+        self.assertEqual(result['nodes'][2]['changes'], {'cost': [1, 2]})
+
+    def test_added_steps_are_aligned(self):
+        left = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                (1, 0, 'HASH JOIN', None, None, 5, 10),
+                (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                (3, 1, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        right = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                 (1, 0, 'HASH JOIN', None, None, 5, 10),
+                 (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                 (3, 1, 'TABLE ACCESS', 'FULL', 'BONUS', 2, 4),
+                 (4, 1, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        result = PlanService.compare(build_plan(left), build_plan(right))
+        statuses = [(node['status'], (node['right'] or node['left'])['objectName']) for node in result['nodes']]
+        self.assertEqual(statuses, [('same', None), ('same', None), ('same', 'DEPT'), ('added', 'BONUS'),
+                                    ('same', 'EMP')])
+        self.assertIsNone(result['nodes'][3]['left'])
+        self.assertEqual((result['nodes'][4]['left']['id'], result['nodes'][4]['right']['id']), (3, 4))
+
+    def test_removed_steps_are_aligned(self):
+        left = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                (1, 0, 'HASH JOIN', None, None, 5, 10),
+                (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                (3, 1, 'TABLE ACCESS', 'FULL', 'BONUS', 2, 4),
+                (4, 1, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        right = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                 (1, 0, 'HASH JOIN', None, None, 5, 10),
+                 (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                 (3, 1, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        result = PlanService.compare(build_plan(left), build_plan(right))
+        statuses = [(node['status'], (node['right'] or node['left'])['objectName']) for node in result['nodes']]
+        self.assertEqual(statuses, [('same', None), ('same', None), ('same', 'DEPT'), ('removed', 'BONUS'),
+                                    ('same', 'EMP')])
+        self.assertIsNone(result['nodes'][3]['right'])
+
+    def test_removed_parent_moves_its_child(self):
+        left = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                (1, 0, 'SORT', 'ORDER BY', None, 5, 10),
+                (2, 1, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        right = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                 (1, 0, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        result = PlanService.compare(build_plan(left), build_plan(right))
+        statuses = [(node['status'], (node['right'] or node['left'])['operation']) for node in result['nodes']]
+        self.assertEqual(statuses, [('same', 'SELECT STATEMENT'), ('removed', 'SORT'), ('changed', 'TABLE ACCESS')])
+        self.assertEqual(result['nodes'][2]['changes'], {'depth': [2, 1]})
+
+    def test_added_parent_moves_its_child(self):
+        left = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                (1, 0, 'HASH JOIN', None, None, 5, 10),
+                (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                (3, 1, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        right = [(0, None, 'SELECT STATEMENT', None, None, 5, 10),
+                 (1, 0, 'HASH JOIN', None, None, 5, 10),
+                 (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                 (3, 1, 'VIEW', None, 'VW_EMP', 2, 10),
+                 (4, 3, 'TABLE ACCESS', 'FULL', 'EMP', 2, 10)]
+        result = PlanService.compare(build_plan(left), build_plan(right))
+        statuses = [(node['status'], (node['right'] or node['left'])['objectName']) for node in result['nodes']]
+        self.assertEqual(statuses, [('same', None), ('same', None), ('same', 'DEPT'), ('added', 'VW_EMP'),
+                                    ('changed', 'EMP')])
+        self.assertEqual(result['nodes'][4]['changes'], {'depth': [2, 3]})
+
+    def test_changed_access_path_is_paired(self):
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(FULL_SCAN_PLAN))
+        statuses = [(node['status'], (node['right'] or node['left'])['objectName']) for node in result['nodes']]
+        self.assertEqual(statuses, [('changed', None), ('changed', 'EMP'), ('removed', 'PK_EMP')])
+        self.assertEqual(result['nodes'][1]['changes'], {'options': ['BY INDEX ROWID', 'FULL'], 'cost': [3, 40]})
+
+    def test_changed_object_is_paired(self):
+        steps = list(INDEXED_PLAN)
+        steps[2] = (2, 1, 'INDEX', 'RANGE SCAN', 'IX_EMP_NAME', 1, 1)
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(steps))
+        self.assertEqual([node['status'] for node in result['nodes']], ['same', 'same', 'changed'])
+        self.assertEqual(result['nodes'][2]['changes'], {'options': ['UNIQUE SCAN', 'RANGE SCAN'],
+                                                         'objectName': ['PK_EMP', 'IX_EMP_NAME']})
+
+    def test_full_scan_instead_of_index(self):
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(FULL_SCAN_PLAN))
+        self.assertIn('fullScan', get_types(result))
+        full_scan = [regression for regression in result['regressions'] if regression['type'] == 'fullScan'][0]
+        self.assertEqual(full_scan['objectName'], 'EMP')
+
+    def test_full_scan_already_in_the_older_plan(self):
+        left = INDEXED_PLAN + [(3, 0, 'TABLE ACCESS', 'FULL', 'EMP', 40, 1)]
+        result = PlanService.compare(build_plan(left), build_plan(FULL_SCAN_PLAN))
+        self.assertNotIn('fullScan', get_types(result))
+
+    def test_index_instead_of_full_scan_is_no_regression(self):
+        result = PlanService.compare(build_plan(FULL_SCAN_PLAN), build_plan(INDEXED_PLAN))
+        self.assertNotIn('fullScan', get_types(result))
+        self.assertNotIn('costIncrease', get_types(result))
+
+    def test_cartesian_join(self):
+        left = [(0, None, 'SELECT STATEMENT', None, None, 6, 10),
+                (1, 0, 'HASH JOIN', None, None, 6, 10),
+                (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                (3, 1, 'TABLE ACCESS', 'FULL', 'EMP', 3, 14)]
+        right = [(0, None, 'SELECT STATEMENT', None, None, 8, 56),
+                 (1, 0, 'MERGE JOIN', 'CARTESIAN', None, 8, 56),
+                 (2, 1, 'TABLE ACCESS', 'FULL', 'DEPT', 2, 4),
+                 (3, 1, 'BUFFER', 'SORT', None, 6, 14),
+                 (4, 3, 'TABLE ACCESS', 'FULL', 'EMP', 3, 14)]
+        self.assertIn('cartesianJoin', get_types(PlanService.compare(build_plan(left), build_plan(right))))
+        self.assertNotIn('cartesianJoin', get_types(PlanService.compare(build_plan(right), build_plan(right))))
+
+    def test_cardinality_jump(self):
+        steps = list(INDEXED_PLAN)
+        steps[1] = (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, 10)
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(steps))
+        jumps = [regression for regression in result['regressions'] if regression['type'] == 'cardinalityJump']
+        self.assertEqual([(jump['leftId'], jump['rightId']) for jump in jumps], [(1, 1)])
+
+    def test_cardinality_under_the_ratio(self):
+        steps = list(INDEXED_PLAN)
+        steps[1] = (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, 9)
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(steps))
+        self.assertNotIn('cardinalityJump', get_types(result))
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(steps), cardinality_ratio=5)
+        self.assertIn('cardinalityJump', get_types(result))
+
+    def test_cardinality_from_zero(self):
+        left = list(INDEXED_PLAN)
+        left[1] = (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, 0)
+        right = list(INDEXED_PLAN)
+        right[1] = (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, 5)
+        self.assertNotIn('cardinalityJump', get_types(PlanService.compare(build_plan(left), build_plan(right))))
+        right[1] = (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, 10)
+        self.assertIn('cardinalityJump', get_types(PlanService.compare(build_plan(left), build_plan(right))))
+
+    def test_cardinality_none(self):
+        right = list(INDEXED_PLAN)
+        right[1] = (1, 0, 'TABLE ACCESS', 'BY INDEX ROWID', 'EMP', 3, None)
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(right))
+        self.assertNotIn('cardinalityJump', get_types(result))
+        self.assertEqual(result['nodes'][1]['changes'], {'cardinality': [1, None]})
+
+    def test_cost_increase(self):
+        result = PlanService.compare(build_plan(INDEXED_PLAN), build_plan(FULL_SCAN_PLAN))
+        self.assertIn('costIncrease', get_types(result))
+        self.assertNotIn('costIncrease', get_types(PlanService.compare(build_plan(INDEXED_PLAN),
+                                                                       build_plan(FULL_SCAN_PLAN),
+                                                                       cost_ratio=20)))
+
+    def test_cost_none_and_empty_plans(self):
+        left = [(0, None, 'SELECT STATEMENT', None, None, None, 1)]
+        result = PlanService.compare(build_plan(left), build_plan(FULL_SCAN_PLAN))
+        self.assertNotIn('costIncrease', get_types(result))
+        result = PlanService.compare(build_plan([]), build_plan(FULL_SCAN_PLAN))
+        self.assertEqual([node['status'] for node in result['nodes']], ['added', 'added'])
+        self.assertEqual(result['regressions'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
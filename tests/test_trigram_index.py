@@ -0,0 +1,106 @@
+"""
+Unit tests of the TrigramIndex answering the object finder, run without a
+database
+
+Usage:
+    python -m pytest tests/test_trigram_index.py
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from oracle import TrigramIndex
+
+
+def get_names(matches):
+    """Returns the names of the matches returned by TrigramIndex.search()
+
+        Args:
+            matches (list): The matches
+    """
+    return [match['name'] for match in matches]
+
+
+class TrigramIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.update_category('tables', ['EMPLOYEES', 'EMP', 'DEPARTMENTS', 'JOB_HISTORY', 'TEMP_EMPLOYEES'])
+        self.index.update_category('views', ['EMP_DETAILS_VIEW', 'DEPT_VIEW'])
+
+    def test_get_trigrams(self):
+        self.assertEqual(TrigramIndex.get_trigrams('emp'), {'  E', ' EM', 'EMP', 'MP '})
+        self.assertEqual(TrigramIndex.get_trigrams('emp', pad=False), {'EMP'})
+
+    def test_prefix_matches_first(self):
+        matches = self.index.search('emp')
+        self.assertEqual(get_names(matches[0:3]), ['EMP', 'EMPLOYEES', 'EMP_DETAILS_VIEW'])
+        self.assertEqual([match['score'] for match in matches[0:3]], [3.0, 3.0, 3.0])
+
+    def test_substring_matches_after_prefix(self):
+        matches = self.index.search('employees')
+        self.assertEqual(get_names(matches[0:2]), ['EMPLOYEES', 'TEMP_EMPLOYEES'])
+        self.assertEqual(matches[1]['score'], 2.0)
+
+    def test_fuzzy_matches_ranked_by_shared_trigrams(self):
+        matches = self.index.search('departmnts')
+        self.assertEqual(matches[0]['name'], 'DEPARTMENTS')
+        self.assertTrue(0 < matches[0]['score'] < 2.0)
+        self.assertEqual(matches, sorted(matches, key=lambda match: -match['score']))
+
+    def test_fuzzy_matches_sharing_half_of_the_trigrams(self):
+        text = 'DPRTMENTS'
+        trigrams = TrigramIndex.get_trigrams('  ' + text, pad=False)
+        shared = trigrams & TrigramIndex.get_trigrams('DEPARTMENTS')
+        self.assertTrue(trigrams.__len__() // 2 <= shared.__len__() < trigrams.__len__() - trigrams.__len__() // 4)
+        self.assertEqual(self.index.search(text)[0]['name'], 'DEPARTMENTS')
+
+    def test_search_is_case_insensitive_and_trimmed(self):
+        self.assertEqual(self.index.search('  Job_hist '), self.index.search('JOB_HIST'))
+
+    def test_empty_text(self):
+        self.assertEqual(self.index.search('   '), [])
+
+    def test_limit(self):
+        self.assertEqual(self.index.search('e', limit=2).__len__(), 2)
+
+    def test_categories(self):
+        matches = self.index.search('emp', categories=['views'])
+        self.assertEqual(get_names(matches), ['EMP_DETAILS_VIEW'])
+        self.assertTrue(self.index.has_category('views'))
+        self.assertFalse(self.index.has_category('indexes'))
+
+    def test_update_category_adds_and_removes(self):
+        self.index.update_category('tables', ['EMPLOYEES', 'EMP', 'DEPARTMENTS', 'JOB_HISTORY', 'LOCATIONS'])
+        self.assertEqual(get_names(self.index.search('locat')), ['LOCATIONS'])
+        self.assertNotIn('TEMP_EMPLOYEES', get_names(self.index.search('temp_emp')))
+        self.assertNotIn('TEMP_EMPLOYEES', [name for name, category in self.index._sorted])
+        self.assertEqual(self.index.get_stats()['names'], 7)
+
+    def test_update_category_keeps_other_categories(self):
+        self.index.update_category('tables', [])
+        self.assertEqual(get_names(self.index.search('dept_v')), ['DEPT_VIEW'])
+        self.assertEqual(self.index.search('job_history'), [])
+
+    def test_update_category_drops_unused_trigrams(self):
+        self.index.update_category('tables', ['ZZZ_TABLE'])
+        trigrams = self.index.get_stats()['trigrams']
+        self.index.update_category('tables', [])
+        self.assertLess(self.index.get_stats()['trigrams'], trigrams)
+        self.assertNotIn('ZZZ', self.index._postings)
+
+    def test_update_category_same_names_after_bulk_and_incremental_updates(self):
+        names = ['TABLE_%05d' % i for i in range(0, 1500)]
+        bulk = TrigramIndex()
+        bulk.update_category('tables', names)
+        incremental = TrigramIndex()
+        for i in range(0, names.__len__(), 100):
+            incremental.update_category('tables', names[0:i + 100])
+        self.assertEqual(bulk._sorted, incremental._sorted)
+        self.assertEqual(get_names(bulk.search('table_0149')), get_names(incremental.search('table_0149')))
+
+
+if __name__ == '__main__':
+    unittest.main()